@@ -0,0 +1,17 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+"""
+Performance benchmarks for py-gfm.
+
+These are not part of the test suite. Run a benchmark as a module from the
+repository root, for instance::
+
+   python -m benchmarks.bench_autolink
+
+``benchmarks.suite`` runs every extension on every kind of document of
+``benchmarks.corpus``, and stores the results as JSON::
+
+   python -m benchmarks.suite --output results.json
+"""
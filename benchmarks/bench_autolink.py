@@ -0,0 +1,45 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+"""
+Pathological-input benchmark for the autolink engines.
+
+A URL prefix followed by a long run of trailing punctuation makes Gruber's
+regex backtrack exponentially, while the scanner stays linear::
+
+   python -m benchmarks.bench_autolink
+"""
+
+import timeit
+
+import markdown
+
+from gfm import AutolinkExtension
+
+# The regex engine roughly quadruples its running time for each size step,
+# so it is only run on the smallest inputs.
+REGEX_SIZES = (12, 14, 16, 18, 20, 22)
+SCANNER_SIZES = REGEX_SIZES + (1000, 10000, 100000)
+
+
+def pathological(size):
+    return "see http://" + "," * size + " now"
+
+
+def bench(engine, size, number=1):
+    md = markdown.Markdown(extensions=[AutolinkExtension(engine=engine)])
+    text = pathological(size)
+    return min(timeit.repeat(lambda: md.convert(text), number=number, repeat=3))
+
+
+def main():
+    print("%-8s %8s %12s" % ("engine", "size", "seconds"))
+    for size in REGEX_SIZES:
+        print("%-8s %8d %12.6f" % ("regex", size, bench("regex", size)))
+    for size in SCANNER_SIZES:
+        print("%-8s %8d %12.6f" % ("scanner", size, bench("scanner", size)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+"""
+Throughput of :func:`mdx_gfm.render_many` on the sample corpus, compared to
+calling ``markdown.markdown`` once per document, for growing numbers of
+worker processes::
+
+   python -m benchmarks.bench_batch [documents]
+
+Scaling with workers is bounded by the number of cores of the machine.
+"""
+
+import os
+import sys
+import time
+
+import markdown
+
+import mdx_gfm
+from benchmarks.bench_prefilter import sample_corpus
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main():
+    documents = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    corpus = sample_corpus(documents)
+    print("%d documents, %d cores" % (documents, os.cpu_count()))
+
+    seconds = timed(
+        lambda: [markdown.markdown(text, extensions=["mdx_gfm"]) for text in corpus]
+    )
+    print("%-22s %8.0f documents/s" % ("markdown.markdown", documents / seconds))
+
+    for workers in (1, 2, 4, 8):
+        seconds = timed(lambda: list(mdx_gfm.render_many(corpus, workers=workers)))
+        print(
+            "%-22s %8.0f documents/s"
+            % ("render_many(workers=%d)" % workers, documents / seconds)
+        )
+
+
+if __name__ == "__main__":
+    main()
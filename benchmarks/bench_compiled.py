@@ -0,0 +1,53 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+"""
+Cost of building a configured Markdown instance, from scratch and from a
+compiled profile::
+
+   python -m benchmarks.bench_compiled
+"""
+
+import timeit
+
+import markdown
+
+import mdx_gfm
+import mdx_partial_gfm
+
+PROFILES = {
+    "mdx_gfm": mdx_gfm,
+    "mdx_partial_gfm": mdx_partial_gfm,
+}
+
+
+def bench(function, number=200):
+    return min(timeit.repeat(function, number=number, repeat=5)) / number
+
+
+def main():
+    print(
+        "%-16s %12s %12s %12s %8s"
+        % ("profile", "compile us", "scratch us", "compiled us", "speedup")
+    )
+    for name, module in PROFILES.items():
+        extension_class = module.makeExtension().__class__
+        scratch = bench(lambda: markdown.Markdown(extensions=[extension_class()]))
+        compile_time = bench(module.CompiledProfile, number=20)
+        profile = module.CompiledProfile()
+        compiled = bench(profile.build)
+        print(
+            "%-16s %12.1f %12.1f %12.1f %7.1fx"
+            % (
+                name,
+                compile_time * 1e6,
+                scratch * 1e6,
+                compiled * 1e6,
+                scratch / compiled,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+"""
+Time spent finding the task items of a document with
+:func:`gfm.tasklist.extract_tasks`, and by rendering it with the task list
+extension and parsing the checkboxes out of the HTML::
+
+   python -m benchmarks.bench_extract
+"""
+
+import html.parser
+import timeit
+
+import markdown
+
+from benchmarks import corpus
+from gfm import TaskListExtension
+from gfm.tasklist import extract_tasks
+
+SIZES = (10, 100, 1000)
+
+
+class _CheckboxParser(html.parser.HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.checked = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "input" and ("type", "checkbox") in attrs:
+            self.checked.append(any(name == "checked" for name, _ in attrs))
+
+
+def render_tasks(md, text):
+    """
+    Returns whether each task item of ``text`` is checked, by rendering it
+    with ``md``.
+    """
+    parser = _CheckboxParser()
+    parser.feed(md.reset().convert(text))
+    parser.close()
+    return parser.checked
+
+
+def bench(kind, size, repeat=5):
+    md = markdown.Markdown(extensions=["fenced_code", TaskListExtension()])
+    text = corpus.generate(kind, 1, size)[0]
+    tasks = extract_tasks(text)
+    if [task.checked for task in tasks] != render_tasks(md, text):
+        raise AssertionError(
+            "%s %d: extract_tasks differs from a render" % (kind, size)
+        )
+    extract = min(timeit.repeat(lambda: extract_tasks(text), number=1, repeat=repeat))
+    render = min(timeit.repeat(lambda: render_tasks(md, text), number=1, repeat=repeat))
+    return len(text), len(tasks), extract, render
+
+
+def main():
+    print(
+        "%-8s %8s %10s %8s %12s %12s %8s"
+        % ("corpus", "size", "chars", "tasks", "extract ms", "render ms", "speedup")
+    )
+    for kind in ("sparse", "tasks"):
+        for size in SIZES:
+            chars, tasks, extract, render = bench(kind, size)
+            print(
+                "%-8s %8d %10d %8d %12.3f %12.3f %7.1fx"
+                % (
+                    kind,
+                    size,
+                    chars,
+                    tasks,
+                    extract * 1e3,
+                    render * 1e3,
+                    render / extract,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
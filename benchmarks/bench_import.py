@@ -0,0 +1,100 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+"""
+Import time of the gfm packages, as reported by ``python -X importtime`` in
+a fresh interpreter::
+
+   python -m benchmarks.bench_import
+
+prints the best cumulative import time of each package, the part of it spent
+importing Python-Markdown, and which of the modules that gfm only imports
+when they are needed (Pygments, asyncio, the tables extension...) were
+imported anyway.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+MODULES = ("gfm", "mdx_partial_gfm", "mdx_gfm")
+
+#: Modules that importing the gfm packages should not import.
+LAZY_MODULES = (
+    "asyncio",
+    "concurrent.futures.process",
+    "markdown.extensions.codehilite",
+    "markdown.extensions.fenced_code",
+    "markdown.extensions.tables",
+    "pygments",
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def importtime(module):
+    """
+    Returns the cumulative import time, in seconds, of each module imported
+    by ``import module`` in a fresh interpreter.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + module],
+        cwd=ROOT,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        try:
+            times[name.strip()] = int(cumulative) / 1e6
+        except ValueError:
+            # The header line.
+            continue
+    return times
+
+
+def bench(module, repeat=5):
+    """
+    Returns the best cumulative import time of ``module`` and of
+    Python-Markdown in it over ``repeat`` runs, and the modules of
+    :data:`LAZY_MODULES` it imported.
+    """
+    runs = [importtime(module) for _ in range(repeat)]
+    return {
+        "seconds": min(times[module] for times in runs),
+        "markdown_seconds": min(times.get("markdown", 0.0) for times in runs),
+        "eager": [name for name in LAZY_MODULES if name in runs[0]],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n\n")[0])
+    parser.add_argument("--modules", nargs="+", default=MODULES)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print("%-16s %10s %12s  %s" % ("module", "ms", "markdown ms", "eager imports"))
+    eager = False
+    for module in args.modules:
+        result = bench(module, args.repeat)
+        eager = eager or bool(result["eager"])
+        print(
+            "%-16s %10.1f %12.1f  %s"
+            % (
+                module,
+                result["seconds"] * 1e3,
+                result["markdown_seconds"] * 1e3,
+                ", ".join(result["eager"]) or "-",
+            )
+        )
+    sys.exit(1 if eager else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+"""
+Link-dense paragraph benchmark for the gfm inline extensions.
+
+Compares the legacy ``Pattern`` based implementations, which copy the rest of
+the paragraph after every match, with the ``InlineProcessor`` based ones,
+which match in place. Python-Markdown itself still rebuilds the paragraph
+string after each match, so neither is perfectly flat on huge paragraphs, but
+the time per match grows noticeably slower for the latter. The ``fused``
+implementation does the work of all three in a single pass::
+
+   python -m benchmarks.bench_inline
+"""
+
+import timeit
+
+import markdown
+import markdown.inlinepatterns
+
+from gfm import autolink, automail, strikethrough
+from gfm import AutolinkExtension, AutomailExtension, StrikethroughExtension
+from gfm import FusedInlineExtension
+
+SIZES = (100, 400, 1600, 6400)
+
+PARAGRAPHS = {
+    "urls": lambda n: " ".join("http://example.org/%d" % i for i in range(n)),
+    "emails": lambda n: " ".join("user%d@example.org" % i for i in range(n)),
+    "strikes": lambda n: " ".join("~~word%d~~" % i for i in range(n)),
+    "prose": lambda n: "\n\n".join("Some *plain* words, %d." % i for i in range(n)),
+}
+
+
+class LegacyInlineExtension(markdown.Extension):
+    def extendMarkdown(self, md):
+        md.inlinePatterns.register(
+            autolink.AutolinkPattern(autolink.URL_RE, md), "gfm-autolink", 100
+        )
+        md.inlinePatterns.register(
+            automail.AutomailPattern(automail.MAIL_RE, md), "gfm-automail", 100
+        )
+        md.inlinePatterns.register(
+            markdown.inlinepatterns.SimpleTagPattern(strikethrough.STRIKE_RE, "del"),
+            "gfm-strikethrough",
+            100,
+        )
+
+
+EXTENSIONS = {
+    "legacy": lambda: [LegacyInlineExtension()],
+    "inline": lambda: [
+        AutolinkExtension(),
+        AutomailExtension(),
+        StrikethroughExtension(),
+    ],
+    "fused": lambda: [FusedInlineExtension()],
+}
+
+
+def bench(extensions, text):
+    md = markdown.Markdown(extensions=extensions)
+    return min(timeit.repeat(lambda: md.convert(text), number=1, repeat=3))
+
+
+def main():
+    print("%-8s %-8s %6s %10s %12s" % ("kind", "impl", "n", "seconds", "us/item"))
+    for kind, paragraph in PARAGRAPHS.items():
+        for size in SIZES:
+            text = paragraph(size)
+            for name, extensions in EXTENSIONS.items():
+                seconds = bench(extensions(), text)
+                print(
+                    "%-8s %-8s %6d %10.4f %12.2f"
+                    % (kind, name, size, seconds, seconds / size * 1e6)
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+"""
+Time and peak memory spent by the task list processor on deeply nested and on
+wide task lists, with a ``list_attrs`` callback::
+
+   python -m benchmarks.bench_list_attrs
+"""
+
+import copy
+import timeit
+import tracemalloc
+
+import markdown
+
+from gfm import TaskListExtension
+
+SIZES = (10, 100, 1000)
+
+
+def deep(size, depth=20):
+    """``size`` task lists nested ``depth`` levels deep, two items per level."""
+    blocks = []
+    for _ in range(size):
+        lines = []
+        for level in range(depth):
+            lines.append("    " * level + "- [ ] item %d" % level)
+            lines.append("    " * level + "- [x] item %d" % level)
+        blocks.append("\n".join(lines))
+    return "\n\ntext\n\n".join(blocks)
+
+
+def wide(size):
+    """``size`` lists of 20 items, each with a nested list of 5 items."""
+    blocks = []
+    for i in range(size):
+        lines = []
+        for j in range(20):
+            lines.append("- [ ] item %d.%d" % (i, j))
+            lines.extend("    - [x] sub %d" % k for k in range(5))
+        blocks.append("\n".join(lines))
+    return "\n\ntext\n\n".join(blocks)
+
+
+KINDS = {"deep": deep, "wide": wide}
+
+
+def list_attrs(list, depth):
+    return {"class": "depth-%d" % depth}
+
+
+def bench(kind, size, repeat=5):
+    md = markdown.Markdown(extensions=[TaskListExtension(list_attrs=list_attrs)])
+    processor = md.treeprocessors["gfm-tasklist"]
+    text = KINDS[kind](size)
+    lines = text.split("\n")
+    for preprocessor in md.preprocessors:
+        lines = preprocessor.run(lines)
+    root = md.parser.parseDocument(lines).getroot()
+    trees = [copy.deepcopy(root) for _ in range(repeat + 1)]
+    seconds = min(
+        timeit.repeat(lambda: processor.run(trees.pop()), number=1, repeat=repeat)
+    )
+    tracemalloc.start()
+    processor.run(trees.pop())
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return sum(1 for _ in root.iter("li")), seconds, peak
+
+
+def main():
+    print("%-6s %8s %10s %12s %12s" % ("corpus", "size", "items", "ms", "peak KiB"))
+    for kind in KINDS:
+        for size in SIZES:
+            items, seconds, peak = bench(kind, size)
+            print(
+                "%-6s %8d %10d %12.3f %12.1f"
+                % (kind, size, items, seconds * 1e3, peak / 1024)
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+"""
+Reports how often the literal prefilter of each gfm inline processor let it
+skip the regex entirely on a sample corpus, and how long rendering took::
+
+   python -m benchmarks.bench_prefilter
+"""
+
+import random
+import timeit
+
+import markdown
+
+from mdx_gfm import GithubFlavoredMarkdownExtension
+
+PATTERNS = ("gfm-autolink", "gfm-automail", "gfm-strikethrough", "gfm-inline")
+
+WORDS = (
+    "the quick brown fox jumps over the lazy dog and then some more "
+    "words follow as usual in issue comments"
+).split()
+
+SPECIAL = (
+    "http://example.org/page",
+    "www.example.org",
+    "someone@example.org",
+    "~~struck~~",
+    "*emphasis*",
+    "`code`",
+)
+
+
+def sample_corpus(documents=200, seed=0):
+    """
+    Returns a list of documents that look like issue comments: mostly plain
+    prose, with a URL, email address or strike-through here and there.
+    """
+    rnd = random.Random(seed)
+    corpus = []
+    for _ in range(documents):
+        paragraphs = []
+        for _ in range(rnd.randint(1, 6)):
+            words = [rnd.choice(WORDS) for _ in range(rnd.randint(5, 40))]
+            if rnd.random() < 0.3:
+                words.insert(rnd.randrange(len(words)), rnd.choice(SPECIAL))
+            paragraphs.append(" ".join(words) + ".")
+        if rnd.random() < 0.3:
+            paragraphs.append("\n".join("- [ ] " + rnd.choice(WORDS) for _ in "abc"))
+        corpus.append("\n\n".join(paragraphs))
+    return corpus
+
+
+def run(corpus, **config):
+    md = markdown.Markdown(extensions=[GithubFlavoredMarkdownExtension(**config)])
+
+    def render():
+        for text in corpus:
+            md.reset()
+            md.convert(text)
+
+    seconds = timeit.timeit(render, number=1)
+    counters = {}
+    for name in PATTERNS:
+        if name in md.inlinePatterns:
+            pattern = md.inlinePatterns[name]
+            counters[name] = (pattern.prefilter_checked, pattern.prefilter_skipped)
+    return seconds, counters
+
+
+def main():
+    corpus = sample_corpus()
+    for config in ({}, {"fused_inline": True}):
+        seconds, counters = run(corpus, **config)
+        print("config: %r, %.3f seconds" % (config, seconds))
+        for name, (checked, skipped) in counters.items():
+            print(
+                "  %-18s %6d scans %6d skipped (%5.1f%%)"
+                % (name, checked, skipped, 100.0 * skipped / max(checked, 1))
+            )
+
+
+if __name__ == "__main__":
+    main()
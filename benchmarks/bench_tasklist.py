@@ -0,0 +1,108 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+"""
+Time spent by the task list processor on documents with few lists, where
+most of the tree cannot contain a task list, and on documents with thousands
+of task items, with the default markers, with several localized ones, and
+with costly attribute callbacks, memoized or not::
+
+   python -m benchmarks.bench_tasklist
+"""
+
+import copy
+import timeit
+
+import markdown
+
+from benchmarks import corpus
+from gfm import TaskListExtension
+from gfm.tasklist import MemoizedAttrs
+
+SIZES = (10, 100, 1000)
+
+
+def _theme_class(*names):
+    # Stands for a callback that looks up a CSS theme or a translation.
+    return " ".join(
+        "%s-%s" % (name, "-".join(sorted(str(i * len(name)) for i in range(40))))
+        for name in names
+    )[:40]
+
+
+def list_attrs(list, depth):
+    return {"class": _theme_class(list.tag, str(depth))}
+
+
+def item_attrs(parent, element, checkbox):
+    return {"class": _theme_class(parent.tag, str("checked" in checkbox.attrib))}
+
+
+def checkbox_attrs(parent, element):
+    return {"title": _theme_class(parent.tag)}
+
+
+CALLBACKS = {
+    "list_attrs": list_attrs,
+    "item_attrs": item_attrs,
+    "checkbox_attrs": checkbox_attrs,
+}
+
+KEYS = {
+    "list_attrs": lambda list, depth: (list.tag, depth),
+    "item_attrs": lambda parent, element, checkbox: (
+        parent.tag,
+        "checked" in checkbox.attrib,
+    ),
+    "checkbox_attrs": lambda parent, element: parent.tag,
+}
+
+#: Extension configurations by name.
+CONFIGS = {
+    "default": {},
+    "markers": {"checked": ["[x]", "[v]", "[✓]"], "unchecked": ["[ ]", "[-]", "[✗]"]},
+    "callbacks": CALLBACKS,
+    "memoized": {
+        name: MemoizedAttrs(callback, KEYS[name])
+        for name, callback in CALLBACKS.items()
+    },
+}
+
+
+def bench(kind, size, config, repeat=5):
+    md = markdown.Markdown(extensions=[TaskListExtension(**config)])
+    processor = md.treeprocessors["gfm-tasklist"]
+    text = corpus.generate(kind, 1, size)[0]
+    if "checked" in config:
+        text = text.replace("[X]", "[✓]")
+    lines = text.split("\n")
+    for preprocessor in md.preprocessors:
+        lines = preprocessor.run(lines)
+    root = md.parser.parseDocument(lines).getroot()
+    trees = [copy.deepcopy(root) for _ in range(repeat)]
+    seconds = min(
+        timeit.repeat(lambda: processor.run(trees.pop()), number=1, repeat=repeat)
+    )
+    return len(text), sum(1 for _ in root.iter()), seconds
+
+
+def main():
+    print(
+        "%-8s %-10s %8s %10s %10s %12s"
+        % ("corpus", "config", "size", "chars", "elements", "ms")
+    )
+    for kind in ("sparse", "tasks"):
+        for name, config in CONFIGS.items():
+            if kind == "sparse" and config:
+                continue
+            for size in SIZES:
+                chars, elements, seconds = bench(kind, size, config)
+                print(
+                    "%-8s %-10s %8d %10d %10d %12.3f"
+                    % (kind, name, size, chars, elements, seconds * 1e3)
+                )
+
+
+if __name__ == "__main__":
+    main()
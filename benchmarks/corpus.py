@@ -0,0 +1,166 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+"""
+Seeded generator of synthetic GFM documents, one kind of document for each
+feature that has been slow at some point::
+
+   python -m benchmarks.corpus tables 1 20
+
+prints a tables document of size 20, generated with seed 1. The same kind,
+size and seed always give the same document.
+"""
+
+import random
+import sys
+
+WORDS = (
+    "the quick brown fox jumps over the lazy dog and then some more "
+    "words follow as usual in issue comments release notes"
+).split()
+
+LANGUAGES = ("python", "javascript", "c", "sh", "text", "")
+
+
+def _words(rnd, low=5, high=20):
+    return " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(low, high)))
+
+
+def _url(rnd):
+    return rnd.choice(
+        (
+            "http://example.org/%s/%d",
+            "https://www.example.com/%s?page=%d",
+            "www.example.net/%s-%d",
+        )
+    ) % (rnd.choice(WORDS), rnd.randrange(1000))
+
+
+def _email(rnd):
+    return "%s.%s%d@example.org" % (
+        rnd.choice(WORDS),
+        rnd.choice(WORDS),
+        rnd.randrange(100),
+    )
+
+
+def links(rnd, size):
+    """Prose with a bare URL every few words."""
+    paragraphs = []
+    for _ in range(size):
+        words = _words(rnd, 20, 60).split()
+        for _ in range(len(words) // 4):
+            words.insert(rnd.randrange(len(words)), _url(rnd))
+        paragraphs.append(" ".join(words) + ".")
+    return "\n\n".join(paragraphs)
+
+
+def emails(rnd, size):
+    """Lists of email addresses, as in mailing list archives."""
+    sections = []
+    for _ in range(size):
+        lines = ["%s: %s" % (_words(rnd, 1, 3), _email(rnd)) for _ in range(10)]
+        sections.append("Contacts %s:\n\n" % _words(rnd, 1, 2))
+        sections.append("\n".join("- " + line for line in lines))
+    return "\n\n".join(sections)
+
+
+def tasks(rnd, size, depth=6):
+    """Task lists nested ``depth`` levels deep."""
+    lines = []
+    for _ in range(size):
+        for level in range(depth):
+            for _ in range(rnd.randint(1, 3)):
+                box = rnd.choice(("[ ]", "[x]", "[X]"))
+                lines.append("    " * level + "- %s %s" % (box, _words(rnd, 2, 8)))
+    return "\n".join(lines)
+
+
+def tables(rnd, size, columns=8):
+    """A single table of ``size`` * 20 rows."""
+    lines = [
+        "| " + " | ".join("column %d" % i for i in range(columns)) + " |",
+        "|"
+        + "|".join(rnd.choice(("---", ":--", "--:", ":-:")) for _ in range(columns))
+        + "|",
+    ]
+    for _ in range(size * 20):
+        cells = (
+            rnd.choice((_words(rnd, 1, 3), "`code`", "*em*", _url(rnd)))
+            for _ in range(columns)
+        )
+        lines.append("| " + " | ".join(cells) + " |")
+    return "\n".join(lines)
+
+
+def fences(rnd, size):
+    """Many fenced code blocks, with a sentence between them."""
+    blocks = []
+    for i in range(size * 5):
+        code = "\n".join(
+            "%s = %s(%d)  # %s" % (rnd.choice(WORDS), rnd.choice(WORDS), i, _words(rnd))
+            for _ in range(rnd.randint(2, 12))
+        )
+        blocks.append(_words(rnd) + ".")
+        blocks.append("```%s\n%s\n```" % (rnd.choice(LANGUAGES), code))
+    return "\n\n".join(blocks)
+
+
+def strikes(rnd, size):
+    """Prose where most words are struck through."""
+    paragraphs = []
+    for _ in range(size):
+        words = [
+            "~~%s~~" % word if rnd.random() < 0.6 else word
+            for word in _words(rnd, 20, 60).split()
+        ]
+        paragraphs.append(" ".join(words) + ".")
+    return "\n\n".join(paragraphs)
+
+
+def sparse(rnd, size):
+    """Long documents with a single short task list."""
+    blocks = []
+    for i in range(size * 4):
+        blocks.append("## %s" % _words(rnd, 2, 5))
+        blocks.append(_words(rnd, 30, 80) + ".")
+        if i % 4 == 0:
+            blocks.append(tables(rnd, 1, 4))
+        elif i % 4 == 2:
+            blocks.append("```\n%s\n```" % _words(rnd))
+        blocks.append("> " + _words(rnd) + ".")
+    blocks.insert(len(blocks) // 2, "- [ ] %s\n- [x] %s" % (_words(rnd), _words(rnd)))
+    return "\n\n".join(blocks)
+
+
+#: Document generators by kind.
+KINDS = {
+    "links": links,
+    "emails": emails,
+    "tasks": tasks,
+    "tables": tables,
+    "fences": fences,
+    "strikes": strikes,
+    "sparse": sparse,
+}
+
+
+def generate(kind, documents=20, size=10, seed=0):
+    """
+    Returns ``documents`` documents of ``kind``, each of the given ``size``,
+    which is roughly the number of paragraphs, sections or blocks.
+    """
+    rnd = random.Random("%s-%d" % (kind, seed))
+    return [KINDS[kind](rnd, size) for _ in range(documents)]
+
+
+def main():
+    kind = sys.argv[1] if len(sys.argv) > 1 else "links"
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    size = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+    print(generate(kind, 1, size, seed)[0])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+"""
+Throughput of each gfm extension on its own, and of the ``mdx_gfm`` and
+``mdx_partial_gfm`` bundles, on each kind of document of
+:mod:`benchmarks.corpus`::
+
+   python -m benchmarks.suite --output results.json
+   python -m benchmarks.suite --compare results.json
+
+reports documents per second, megabytes of source per second and the peak
+memory allocated while rendering the corpus, and stores the results as JSON
+so that runs can be compared over time. ``--compare`` prints the ratio of the
+throughput of this run to the one of a previous run.
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import time
+import tracemalloc
+
+import markdown
+
+import gfm
+import mdx_gfm
+import mdx_partial_gfm
+from benchmarks import corpus
+
+#: Extension factories by name.
+EXTENSIONS = {
+    "autolink": gfm.AutolinkExtension,
+    "automail": gfm.AutomailExtension,
+    "fused_inline": gfm.FusedInlineExtension,
+    "semi_sane_lists": gfm.SemiSaneListExtension,
+    "standalone_fenced_code": gfm.StandaloneFencedCodeExtension,
+    "strikethrough": gfm.StrikethroughExtension,
+    "tasklist": gfm.TaskListExtension,
+    "mdx_gfm": mdx_gfm.GithubFlavoredMarkdownExtension,
+    "mdx_partial_gfm": mdx_partial_gfm.PartialGithubFlavoredMarkdownExtension,
+}
+
+
+def _render_all(md, documents):
+    for text in documents:
+        md.reset()
+        md.convert(text)
+
+
+def bench(extension, documents, repeat=3):
+    """
+    Returns the results of rendering ``documents`` with ``extension``: the
+    best time of ``repeat`` runs, and the peak memory of an extra run.
+    """
+    md = markdown.Markdown(extensions=[EXTENSIONS[extension]()])
+    # Warm up lazy imports and caches.
+    _render_all(md, documents[:1])
+    seconds = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _render_all(md, documents)
+        seconds = min(seconds, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        _render_all(md, documents)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    size = sum(len(text.encode("utf-8")) for text in documents)
+    return {
+        "documents": len(documents),
+        "bytes": size,
+        "seconds": seconds,
+        "docs_per_sec": len(documents) / seconds,
+        "mb_per_sec": size / seconds / 1e6,
+        "peak_mb": peak / 1e6,
+    }
+
+
+def environment():
+    try:
+        import pygments
+
+        pygments_version = pygments.__version__
+    except ImportError:
+        pygments_version = None
+    return {
+        "date": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "markdown": markdown.__version__,
+        "pygments": pygments_version,
+    }
+
+
+def run(kinds, extensions, documents, size, seed, repeat, report=None):
+    """
+    Runs every extension on every kind of document, and returns the results
+    along with the parameters of the run and its environment. ``report`` is
+    called with each result as soon as it is known.
+    """
+    results = []
+    for kind in kinds:
+        corpus_documents = corpus.generate(kind, documents, size, seed)
+        for extension in extensions:
+            result = {"corpus": kind, "extension": extension}
+            result.update(bench(extension, corpus_documents, repeat))
+            results.append(result)
+            if report is not None:
+                report(result)
+    return {
+        "environment": environment(),
+        "parameters": {
+            "documents": documents,
+            "size": size,
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n\n")[0])
+    parser.add_argument(
+        "--kinds", nargs="+", choices=corpus.KINDS, default=corpus.KINDS
+    )
+    parser.add_argument(
+        "--extensions", nargs="+", choices=EXTENSIONS, default=EXTENSIONS
+    )
+    parser.add_argument("--documents", type=int, default=20)
+    parser.add_argument("--size", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="a JSON file of results to compare with")
+    args = parser.parse_args()
+
+    previous = {}
+    if args.compare:
+        with open(args.compare) as f:
+            for result in json.load(f)["results"]:
+                previous[result["corpus"], result["extension"]] = result
+
+    print(
+        "%-8s %-24s %10s %8s %9s %8s"
+        % ("corpus", "extension", "docs/s", "MB/s", "peak MB", "vs prev")
+    )
+
+    def report(result):
+        before = previous.get((result["corpus"], result["extension"]))
+        ratio = (
+            "%7.2fx" % (result["docs_per_sec"] / before["docs_per_sec"])
+            if before
+            else ""
+        )
+        print(
+            "%-8s %-24s %10.1f %8.3f %9.2f %8s"
+            % (
+                result["corpus"],
+                result["extension"],
+                result["docs_per_sec"],
+                result["mb_per_sec"],
+                result["peak_mb"],
+                ratio,
+            )
+        )
+
+    results = run(
+        list(args.kinds),
+        list(args.extensions),
+        args.documents,
+        args.size,
+        args.seed,
+        args.repeat,
+        report,
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
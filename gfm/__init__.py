@@ -7,25 +7,63 @@
 ======================================================
 """
 
-from gfm import autolink
-from gfm import automail
-from gfm import standalone_fenced_code
-from gfm import semi_sane_lists
-from gfm import strikethrough
-from gfm import tasklist
-
-AutolinkExtension = autolink.AutolinkExtension
-AutomailExtension = automail.AutomailExtension
-StandaloneFencedCodeExtension = standalone_fenced_code.StandaloneFencedCodeExtension
-SemiSaneListExtension = semi_sane_lists.SemiSaneListExtension
-StrikethroughExtension = strikethrough.StrikethroughExtension
-TaskListExtension = tasklist.TaskListExtension
+import importlib
+
+# The extension classes, by the submodule defining them. Submodules are
+# imported on first access, so that importing gfm does not import the
+# Python-Markdown extensions and Pygments they need.
+_EXTENSIONS = {
+    "AutolinkExtension": "autolink",
+    "AutomailExtension": "automail",
+    "FusedInlineExtension": "fused_inline",
+    "LazyFencedCodeExtension": "lazy_fenced_code",
+    "ProfilingExtension": "profiling",
+    "SemiSaneListExtension": "semi_sane_lists",
+    "StandaloneFencedCodeExtension": "standalone_fenced_code",
+    "StrikethroughExtension": "strikethrough",
+    "TaskListExtension": "tasklist",
+}
+
+_SUBMODULES = (
+    "autolink",
+    "automail",
+    "fenced_block",
+    "fused_inline",
+    "highlight",
+    "lazy_fenced_code",
+    "lru",
+    "prefilter",
+    "profiling",
+    "semi_sane_lists",
+    "standalone_fenced_code",
+    "strikethrough",
+    "task_scanner",
+    "tasklist",
+)
 
 __all__ = [
     "AutolinkExtension",
     "AutomailExtension",
+    "FusedInlineExtension",
+    "LazyFencedCodeExtension",
+    "ProfilingExtension",
     "SemiSaneListExtension",
     "StandaloneFencedCodeExtension",
     "StrikethroughExtension",
     "TaskListExtension",
 ]
+
+
+def __getattr__(name):
+    if name in _EXTENSIONS:
+        value = getattr(importlib.import_module("gfm." + _EXTENSIONS[name]), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module("gfm." + name)
+    else:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXTENSIONS) | set(_SUBMODULES))
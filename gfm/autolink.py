@@ -19,6 +19,23 @@ regex were slightly modified to bring it in line with GitHub's parsing:
 * GitHub only accepts URLs with protocols or ``www.``, whereas Gruber's regex
   accepts things like ``foo.com/bar``.
 
+Because of its nested quantifiers, this regex can backtrack exponentially on
+some inputs (long runs of punctuation after ``http://``, for instance). By
+default, the extension therefore uses a scanner that finds the same URLs in
+linear time: candidates are located on ``://`` or ``www.`` and extended to the
+right by an explicit parenthesis-balancing state machine. The original regex
+can still be selected with the ``engine`` option.
+
+Available configuration options
+-------------------------------
+
+========== ====== =============== ===========
+Name       Type   Default         Description
+========== ====== =============== ===========
+``engine`` string ``"scanner"``   ``"scanner"`` for the linear-time scanner,
+                                  ``"regex"`` for Gruber's regex (:data:`URL_RE`).
+========== ====== =============== ===========
+
 Typical usage
 -------------
 
@@ -43,6 +60,8 @@ import re
 import markdown
 import xml.etree.ElementTree as etree
 
+from gfm import prefilter
+
 URL_RE = (
     r"\b((?:(?i:ftp|https?)://|(?i:www)\d{0,3}[.])(?:[^\s()<>]+|"
     r"\(([^\s()<>]+|(\([^\s()<>]+\)))*\))+(?:\(([^\s()<>]+|(\([^\s()"
@@ -50,20 +69,133 @@ URL_RE = (
 )
 PROTOCOL_RE = re.compile(r"^(?i:ftp|https?)://")
 
+# Start of a URL candidate, i.e. the prefix of URL_RE. The rest of the URL is
+# found by scan_url().
+URL_START_RE = r"\b(?:(?i:ftp|https?)://|(?i:www)\d{0,3}[.])"
+
+# Characters that may not end a URL, as per the last character class of URL_RE.
+_TRAILING_PUNCTUATION = frozenset("`!()[]{};:'\".,<>?«»“”‘’")
+
+
+def may_contain_url(text):
+    """
+    Returns ``False`` if ``text`` cannot contain a URL, that is if it has
+    neither ``://`` nor ``www`` in any case.
+    """
+    return "://" in text or "www" in text.lower()
+
+
+def _is_url_char(c):
+    return not (c in "()<>" or c.isspace())
+
 
-# We can't re-use the built-in AutolinkPattern because we need to add protocols
-# to links without them.
+def _scan_group(text, i):
+    """
+    Returns the index just past the balanced parenthesized group starting at
+    ``text[i] == "("``, or -1 if there is none. Like URL_RE, only two levels
+    of nesting are allowed and inner groups cannot be empty.
+    """
+    n = len(text)
+    i += 1
+    while i < n:
+        c = text[i]
+        if c == ")":
+            return i + 1
+        if c == "(":
+            j = i + 1
+            while j < n and _is_url_char(text[j]):
+                j += 1
+            if j == i + 1 or j == n or text[j] != ")":
+                return -1
+            i = j + 1
+        elif _is_url_char(c):
+            i += 1
+        else:
+            return -1
+    return -1
+
+
+def scan_url(text, start):
+    """
+    Returns the end index of the URL whose body (the part after the protocol
+    or ``www.`` prefix) starts at index ``start`` of ``text``, or ``None`` if
+    there is no valid URL there.
+
+    This accepts exactly what the body of :data:`URL_RE` accepts, but runs in
+    time linear in the length of the URL: the body is a run of characters and
+    balanced parenthesized groups, and the URL ends at the last group or
+    non-punctuation character of that run, with at least one character
+    before it.
+    """
+    n = len(text)
+    end = None
+    i = start
+    while i < n:
+        c = text[i]
+        if c == "(":
+            j = _scan_group(text, i)
+            if j < 0:
+                break
+            if i > start:
+                end = j
+            i = j
+        elif _is_url_char(c):
+            if i > start and c not in _TRAILING_PUNCTUATION:
+                end = i + 1
+            i += 1
+        else:
+            break
+    return end
+
+
+def _make_link(pattern, url):
+    el = etree.Element("a")
+
+    href = url
+    if not PROTOCOL_RE.match(href):
+        href = "http://%s" % href
+    el.set("href", pattern.unescape(href))
+
+    el.text = markdown.util.AtomicString(url)
+    return el
+
+
+# We can't re-use the built-in AutolinkInlineProcessor because we need to add
+# protocols to links without them.
+class AutolinkInlineProcessor(prefilter.PrefilteredInlineProcessor):
+    def may_match(self, text):
+        return may_contain_url(text)
+
+    def handleMatch(self, m, data):
+        return _make_link(self, m.group(1)), m.start(0), m.end(0)
+
+
+# Legacy pattern, kept for backward compatibility. It is no longer registered
+# by AutolinkExtension since Pattern copies the remaining text after every
+# match, which is quadratic in the number of links.
 class AutolinkPattern(markdown.inlinepatterns.Pattern):
     def handleMatch(self, m):
-        el = etree.Element("a")
+        return _make_link(self, m.group(2))
+
 
-        href = m.group(2)
-        if not PROTOCOL_RE.match(href):
-            href = "http://%s" % href
-        el.set("href", self.unescape(href))
+class AutolinkScannerProcessor(prefilter.PrefilteredInlineProcessor):
+    """
+    Finds URL candidates with :data:`URL_START_RE` and extends them with
+    :func:`scan_url`, which gives the same links as :data:`URL_RE` in linear
+    time.
+    """
+
+    def __init__(self, md=None):
+        super().__init__(URL_START_RE, md)
 
-        el.text = markdown.util.AtomicString(m.group(2))
-        return el
+    def may_match(self, text):
+        return may_contain_url(text)
+
+    def handleMatch(self, m, data):
+        end = scan_url(data, m.end())
+        if end is None:
+            return None, None, None
+        return _make_link(self, data[m.start() : end]), m.start(), end
 
 
 class AutolinkExtension(markdown.Extension):
@@ -71,5 +203,22 @@ class AutolinkExtension(markdown.Extension):
     An extension that turns URLs into links.
     """
 
+    def __init__(self, **kwargs):
+        self.config = {
+            "engine": [
+                "scanner",
+                "URL matching engine: 'scanner' (linear time) or 'regex' "
+                "(Gruber's regex) - Default: scanner",
+            ],
+        }
+        super().__init__(**kwargs)
+
     def extendMarkdown(self, md):
-        md.inlinePatterns.register(AutolinkPattern(URL_RE, md), "gfm-autolink", 100)
+        engine = self.getConfig("engine")
+        if engine == "scanner":
+            pattern = AutolinkScannerProcessor(md)
+        elif engine == "regex":
+            pattern = AutolinkInlineProcessor(URL_RE, md)
+        else:
+            raise ValueError("Unknown autolink engine: %r" % engine)
+        md.inlinePatterns.register(pattern, "gfm-autolink", 100)
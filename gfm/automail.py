@@ -30,17 +30,33 @@ import markdown
 import markdown.inlinepatterns
 import xml.etree.ElementTree as etree
 
+from gfm import prefilter
+
 MAIL_RE = r"\b([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]+)\b"
 
 
-# We can't re-use the built-in AutomailPattern because we need to add mailto:.
-# We also don't care about HTML-encoding the email.
+def _make_link(pattern, email):
+    el = etree.Element("a")
+    el.set("href", pattern.unescape("mailto:" + email))
+    el.text = markdown.util.AtomicString(email)
+    return el
+
+
+# We can't re-use the built-in AutomailInlineProcessor because we need to add
+# mailto:. We also don't care about HTML-encoding the email.
+class AutomailInlineProcessor(prefilter.PrefilteredInlineProcessor):
+    def may_match(self, text):
+        return "@" in text
+
+    def handleMatch(self, m, data):
+        return _make_link(self, m.group(1)), m.start(0), m.end(0)
+
+
+# Legacy pattern, kept for backward compatibility. It is no longer registered
+# by AutomailExtension.
 class AutomailPattern(markdown.inlinepatterns.Pattern):
     def handleMatch(self, m):
-        el = etree.Element("a")
-        el.set("href", self.unescape("mailto:" + m.group(2)))
-        el.text = markdown.util.AtomicString(m.group(2))
-        return el
+        return _make_link(self, m.group(2))
 
 
 class AutomailExtension(markdown.Extension):
@@ -49,4 +65,6 @@ class AutomailExtension(markdown.Extension):
     """
 
     def extendMarkdown(self, md):
-        md.inlinePatterns.register(AutomailPattern(MAIL_RE, md), "gfm-automail", 100)
+        md.inlinePatterns.register(
+            AutomailInlineProcessor(MAIL_RE, md), "gfm-automail", 100
+        )
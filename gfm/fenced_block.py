@@ -0,0 +1,155 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+"""
+The preprocessor of :class:`gfm.LazyFencedCodeExtension` and
+:class:`gfm.StandaloneFencedCodeExtension`. It is kept apart from the former
+because Python-Markdown's fenced_code and codehilite extensions, which it
+builds on, import Pygments.
+"""
+
+from markdown.extensions.attr_list import AttrListExtension
+from markdown.extensions.codehilite import CodeHiliteExtension, parse_hl_lines
+from markdown.extensions.fenced_code import FencedBlockPreprocessor
+from markdown.serializers import _escape_attrib_html
+
+from gfm import highlight
+
+
+class StandaloneFencedBlockPreprocessor(FencedBlockPreprocessor):
+    """
+    A :class:`~markdown.extensions.fenced_code.FencedBlockPreprocessor` that
+    highlights code blocks through :meth:`highlight`.
+
+    The first block with ``{attributes}`` and everything after it are left to
+    the base class, as is everything when Pygments is disabled.
+    """
+
+    #: Whether to look up highlighted blocks in
+    #: :data:`gfm.highlight.shared_cache`.
+    highlight_cache = False
+    #: Languages whose lexers were preloaded, see :func:`gfm.highlight.preload`.
+    preload_languages = ()
+    #: Whether to highlight the blocks of a document concurrently.
+    parallel_highlight = False
+    #: The minimum total length of the code of a document's blocks for them
+    #: to be highlighted concurrently.
+    parallel_threshold = 20000
+    #: Whether to emit plain blocks and highlighting jobs instead of
+    #: highlighting blocks.
+    deferred_highlight = False
+
+    def _check_for_deps(self):
+        if not self.checked_for_deps:
+            for ext in self.md.registeredExtensions:
+                if isinstance(ext, CodeHiliteExtension):
+                    self.codehilite_conf = ext.getConfigs()
+                if isinstance(ext, AttrListExtension):
+                    self.use_attr_list = True
+            self.checked_for_deps = True
+
+    def run(self, lines):
+        self._check_for_deps()
+        self.md.highlight_jobs = []
+        self._deferred_ids = {}
+        if not (self.codehilite_conf and self.codehilite_conf["use_pygments"]):
+            return super().run(lines)
+
+        text = "\n".join(lines)
+        matches = []
+        blocks = []
+        rest = None
+        index = 0
+        while True:
+            m = self.FENCED_BLOCK_RE.search(text, index)
+            if not m:
+                break
+            if m.group("attrs"):
+                rest = m.start()
+                break
+            config = self.codehilite_conf.copy()
+            if m.group("hl_lines"):
+                config["hl_lines"] = parse_hl_lines(m.group("hl_lines"))
+            matches.append(m)
+            blocks.append((m.group("code"), m.group("lang") or None, config))
+            index = m.end()
+
+        parts = []
+        start = 0
+        for m, code in zip(matches, self.highlight_blocks(blocks)):
+            placeholder = self.md.htmlStash.store(code)
+            parts.append("%s\n%s\n" % (text[start : m.start()], placeholder))
+            start = m.end()
+        if rest is None:
+            parts.append(text[start:])
+        else:
+            parts.append(text[start:rest])
+            parts.append("\n".join(super().run(text[rest:].split("\n"))))
+        return "".join(parts).split("\n")
+
+    def highlight_blocks(self, blocks):
+        """
+        Returns the highlighted HTML for each ``(code, lang, config)`` block
+        of a document, in order.
+
+        Blocks are deferred with :meth:`defer` if :attr:`deferred_highlight`
+        is set. Otherwise, they are highlighted with
+        :func:`gfm.highlight.hilite_parallel` if :attr:`parallel_highlight` is
+        set and there is enough code, and with :meth:`highlight` if not.
+        """
+        if self.deferred_highlight:
+            return [self.defer(*block) for block in blocks]
+        if (
+            self.parallel_highlight
+            and len(blocks) > 1
+            and sum(len(code) for code, _, _ in blocks) >= self.parallel_threshold
+        ):
+            return highlight.hilite_parallel(blocks, self.highlight_cache)
+        return [self.highlight(*block) for block in blocks]
+
+    def highlight(self, code, lang, config):
+        """
+        Returns the highlighted HTML for ``code`` in language ``lang``, with
+        the :class:`~markdown.extensions.codehilite.CodeHilite` options in
+        ``config``.
+        """
+        if self.highlight_cache:
+            return highlight.shared_cache.highlight(code, lang, config)
+        return highlight.hilite(code, lang, config)
+
+    def defer(self, code, lang, config):
+        """
+        Returns a plain ``<pre>`` element for ``code``, with an id that only
+        depends on the block and its position among identical blocks, and
+        adds a :class:`gfm.highlight.HighlightJob` for it to the
+        ``highlight_jobs`` list of the Markdown instance. Blocks found in
+        the highlight cache, or whose options cannot be serialized, are
+        returned highlighted instead.
+        """
+        if self.highlight_cache:
+            html = highlight.shared_cache.get(code, lang, config)
+            if html is not None:
+                return html
+
+        try:
+            digest = highlight.block_digest(code, lang, config)
+        except TypeError:
+            # Without a stable id, the block is highlighted right away.
+            return self.highlight(code, lang, config)
+        id = "gfm-code-" + digest[:12]
+        count = self._deferred_ids.get(id, 0)
+        self._deferred_ids[id] = count + 1
+        if count:
+            id = "%s-%d" % (id, count)
+        self.md.highlight_jobs.append(highlight.HighlightJob(id, code, lang, config))
+        lang_attr = ""
+        if lang:
+            # As the base class writes blocks when Pygments is disabled.
+            prefix = self.config.get("lang_prefix", "language-")
+            lang_attr = ' class="%s%s"' % (prefix, _escape_attrib_html(lang))
+        return '<pre id="%s"><code%s>%s</code></pre>' % (
+            id,
+            lang_attr,
+            self._escape(code),
+        )
@@ -0,0 +1,228 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+"""
+:mod:`gfm.fused_inline` -- Single-pass autolink, automail and strike-through
+============================================================================
+
+The :mod:`gfm.fused_inline` module provides an extension that does the work
+of :mod:`gfm.autolink`, :mod:`gfm.automail` and :mod:`gfm.strikethrough` in a
+single inline pass.
+
+Python-Markdown runs every inline pattern over every text node, so the three
+separate extensions scan each paragraph three times. This extension uses a
+single precompiled alternation instead, dispatches on the group that matched,
+and skips text nodes that contain none of ``://``, ``www``, ``@`` or ``~~``
+without running any regex at all.
+
+The output is byte-identical to using the three extensions together. In
+particular, links still take precedence over email addresses, and
+strike-through delimiters inside links or email addresses are ignored.
+
+This extension is used by :class:`mdx_partial_gfm.PartialGithubFlavoredMarkdownExtension`
+and :class:`mdx_gfm.GithubFlavoredMarkdownExtension` when their
+``fused_inline`` option is set.
+
+.. NOTE::
+   Links and email addresses inside strike-through text are stashed the way
+   Python-Markdown's inline treeprocessor stashes nodes, so that inline
+   patterns that run later still see the text around them as one string.
+   This relies on details of the treeprocessor that are only checked with
+   Python-Markdown 3.3 to 3.11: with other versions, :data:`SUPPORTED` is
+   ``False`` and the extension registers the three separate extensions
+   instead, which give the same output.
+
+Typical usage
+-------------
+
+.. testcode::
+
+   import markdown
+   from gfm import FusedInlineExtension
+
+   print(markdown.markdown("~~mail foo@example.org~~ or see www.example.org",
+                           extensions=[FusedInlineExtension()]))
+
+.. testoutput::
+
+   <p><del>mail <a href="mailto:foo@example.org">foo@example.org</a></del> or see <a href="http://www.example.org">www.example.org</a></p>
+
+"""
+
+import re
+
+import markdown
+import xml.etree.ElementTree as etree
+
+from gfm import autolink
+from gfm import automail
+from gfm import prefilter
+from gfm import strikethrough
+
+#: Whether the fused pass is used with the installed Python-Markdown.
+SUPPORTED = (3, 3) <= markdown.__version_info__ < (3, 12)
+
+FUSED_RE = r"(?P<autolink>%s)|(?P<automail>%s)|(?P<strikethrough>~~)" % (
+    autolink.URL_START_RE,
+    automail.MAIL_RE,
+)
+
+# Length of the longest prefix matched by URL_START_RE ("https://", "www123.").
+_MAX_URL_START = 8
+
+
+class FusedInlineProcessor(prefilter.PrefilteredInlineProcessor):
+    """
+    Finds URLs, email addresses and strike-through text in a single pass, with
+    the same results as running :class:`gfm.autolink.AutolinkScannerProcessor`,
+    :class:`gfm.automail.AutomailInlineProcessor` and
+    :class:`gfm.strikethrough.StrikethroughInlineProcessor` one after another.
+    """
+
+    def __init__(self, md=None):
+        super().__init__(FUSED_RE, md)
+        self.url_start_re = re.compile(autolink.URL_START_RE)
+        self.mail_re = re.compile(automail.MAIL_RE)
+        # MAIL_RE for text that follows a placeholder, i.e. a non-word
+        # character: the leading \b only needs a word character.
+        self.mail_after_token_re = re.compile(r"(?=\w)" + automail.MAIL_RE[2:])
+
+    def may_match(self, text):
+        return "~~" in text or "@" in text or autolink.may_contain_url(text)
+
+    def handleMatch(self, m, data):
+        if m.group("autolink") is not None:
+            end = autolink.scan_url(data, m.end())
+            if end is None:
+                return None, None, None
+            return self._token_element(data, (m.start(), end, True)), m.start(), end
+
+        if m.group("automail") is not None:
+            return self._address(data, m.start(), m.end())
+
+        return self._strikethrough(data, m.start())
+
+    def _find_link(self, data, pos, endpos):
+        # Leftmost URL starting in [pos, endpos), as (start, end). The search
+        # goes a bit past endpos so that a URL prefix starting just before it
+        # is not cut.
+        for m in self.url_start_re.finditer(data, pos, endpos + _MAX_URL_START):
+            if m.start() >= endpos:
+                break
+            end = autolink.scan_url(data, m.end())
+            if end is not None:
+                return m.start(), end
+        return None
+
+    def _find_mail(self, data, pos, endpos, after_token):
+        # Links cannot start right after a link or email address, since
+        # those end before a non-word character, but email addresses can,
+        # e.g. with "-" in "a@b.co-c@d.co".
+        if after_token and pos < endpos:
+            mail = self.mail_after_token_re.match(data, pos, endpos)
+            if mail:
+                return mail
+            pos += 1
+        return self.mail_re.search(data, pos, endpos)
+
+    def _next_token(self, data, pos, endpos, link, after_token=False):
+        """
+        Returns the next link or email address starting in ``[pos, endpos)``
+        as ``(start, end, is_link)``, as found by the autolink pass followed
+        by the automail pass, and the next link to pass to the following
+        call.
+
+        ``link`` is the next link in that range if it is already known,
+        ``None`` if there is none, or ``False`` if it is unknown.
+        ``after_token`` tells whether ``pos`` is the end of a previous link
+        or email address, which the separate passes would have replaced by
+        a placeholder.
+        """
+        if link is False:
+            link = self._find_link(data, pos, endpos)
+        mail = self._find_mail(data, pos, link[0] if link else endpos, after_token)
+        if mail:
+            return (mail.start(), mail.end(), False), link
+        if link:
+            return (link[0], link[1], True), False
+        return None, None
+
+    def _address(self, data, start, end):
+        # An email address only wins if no link starts inside it. Otherwise
+        # the link wins, and only what precedes it can still be an address.
+        token = (start, end, False)
+        link = self._find_link(data, start, end)
+        if link is not None:
+            token, _ = self._next_token(data, start, link[0], link)
+        return self._token_element(data, token), token[0], token[1]
+
+    def _strikethrough(self, data, start):
+        # Links and email addresses are matched before strike-through, so
+        # their text is opaque: the closing "~~" is the first one after at
+        # least one character that is not part of a link or email address.
+        # Email addresses cannot contain "~", so only links can hide it.
+        tokens = []
+        pos = start + 2
+        closing = data.find("~~", start + 3)
+        link = False
+        while closing >= 0:
+            token, link = self._next_token(data, pos, closing, link, bool(tokens))
+            if token is None:
+                el = etree.Element("del")
+                el.text = self._stash_tokens(data, start + 2, closing, tokens)
+                return el, start, closing + 2
+            tokens.append(token)
+            pos = token[1]
+            if closing < pos:
+                closing = data.find("~~", pos)
+                link = False
+
+        # Without a closing "~~", the next match is the first link or email
+        # address after the opening one, if any.
+        if not tokens:
+            token, _ = self._next_token(data, pos, len(data), False)
+            if token is None:
+                return None, None, None
+            tokens.append(token)
+        token = tokens[0]
+        return self._token_element(data, token), token[0], token[1]
+
+    def _token_element(self, data, token):
+        start, end, is_link = token
+        if is_link:
+            return autolink._make_link(self, data[start:end])
+        return automail._make_link(self, data[start:end])
+
+    def _stash_tokens(self, data, start, end, tokens):
+        # Replaces the links and email addresses inside a strike-through by
+        # inline placeholders, as the separate passes would have. Returning
+        # them as children of the <del> element would keep patterns such as
+        # emphasis from spanning them. See SUPPORTED.
+        stash = self.md.treeprocessors["inline"].stashed_nodes
+        parts = []
+        for token in tokens:
+            parts.append(data[start : token[0]])
+            id = "%04d" % len(stash)
+            stash[id] = self._token_element(data, token)
+            parts.append(markdown.util.INLINE_PLACEHOLDER % id)
+            start = token[1]
+        parts.append(data[start:end])
+        return "".join(parts)
+
+
+class FusedInlineExtension(markdown.Extension):
+    """
+    An extension that turns URLs and email addresses into links and adds
+    support for strike-through text, in a single inline pass if
+    :data:`SUPPORTED` is true, and with the three separate extensions
+    otherwise.
+    """
+
+    def extendMarkdown(self, md):
+        if not SUPPORTED:
+            autolink.AutolinkExtension().extendMarkdown(md)
+            automail.AutomailExtension().extendMarkdown(md)
+            strikethrough.StrikethroughExtension().extendMarkdown(md)
+            return
+        md.inlinePatterns.register(FusedInlineProcessor(md), "gfm-inline", 100)
@@ -0,0 +1,405 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+"""
+:mod:`gfm.highlight` -- Code highlighting for fenced code blocks
+================================================================
+
+The :mod:`gfm.highlight` module highlights the fenced code blocks of
+:class:`gfm.StandaloneFencedCodeExtension` with Pygments_, the way
+:class:`markdown.extensions.codehilite.CodeHilite` does.
+
+Highlight cache
+---------------
+
+The same snippets (install commands, configuration samples) tend to recur
+across documents, and highlighting them is by far the most expensive step of
+rendering. With its ``highlight_cache`` option set,
+:class:`gfm.StandaloneFencedCodeExtension` looks up highlighted blocks in
+:data:`shared_cache` before running Pygments. Entries are keyed by the
+language, the code, all highlighting options (``pygments_style``,
+``noclasses``, ``linenums``, ``css_class``...) and the Pygments and
+Python-Markdown versions. Blocks whose options cannot be serialized, such as
+a ``pygments_formatter`` class, are highlighted without the cache.
+
+The shared cache is bounded in memory. To bound it differently or persist it
+to disk, replace it::
+
+   from gfm import highlight
+
+   highlight.shared_cache = highlight.HighlightCache(
+       max_bytes=64 * 1024 * 1024, directory="/var/cache/gfm-highlight"
+   )
+
+Lexers and formatters
+---------------------
+
+Looking up a Pygments lexer by language name and building an HTML formatter
+are costly compared to highlighting a small block, and looking up an unknown
+language scans every installed Pygments plugin. :func:`hilite` therefore
+keeps the lexers and formatters it uses, including the lack of a lexer for
+unknown languages, per language and set of options, for the whole process.
+:func:`preload` looks up a list of languages ahead of time; the
+``preload_languages`` option of :class:`gfm.StandaloneFencedCodeExtension`
+calls it when the extension is added to a Markdown instance.
+
+Parallel highlighting
+---------------------
+
+Documents with many large code blocks are bound by Pygments, which runs on a
+single core. With its ``parallel_highlight`` option set,
+:class:`gfm.StandaloneFencedCodeExtension` collects the blocks of a document
+first and highlights them with :func:`hilite_parallel`, which spreads them
+over a process pool, :data:`executor`. The output is the same. Documents
+with less than ``parallel_threshold`` characters of code (20000 by default)
+are still highlighted serially, as dispatching their blocks would cost more
+than it saves.
+
+Deferred highlighting
+---------------------
+
+For interactive previews, the HTML can be returned before any code is
+highlighted. With its ``deferred_highlight`` option set,
+:class:`gfm.StandaloneFencedCodeExtension` emits plain
+``<pre id="..."><code class="language-...">`` blocks and lists a
+:class:`HighlightJob` for each of them in the ``highlight_jobs`` attribute of
+the Markdown instance. Ids only depend on the code block, its language and
+its options, and on the number of identical blocks before it in the
+document, so they do not change when other parts of the document do.
+
+:func:`run_jobs`, :func:`run_jobs_parallel` and :func:`run_jobs_async` then
+highlight the jobs and return a dict mapping ids to the HTML to replace each
+``<pre>`` element with::
+
+   md = markdown.Markdown(
+       extensions=[gfm.StandaloneFencedCodeExtension(deferred_highlight=True)]
+   )
+   html = md.convert(source)
+   send(html)
+   for id, highlighted in highlight.run_jobs(md.highlight_jobs).items():
+       send_patch(id, highlighted)
+
+.. _Pygments: https://pypi.org/project/Pygments/
+"""
+
+import atexit
+import collections
+import functools
+import hashlib
+import json
+import threading
+
+import markdown
+
+from gfm import lru
+
+#: Languages preloaded by :func:`preload` by default.
+COMMON_LANGUAGES = (
+    "bash",
+    "c",
+    "cpp",
+    "css",
+    "diff",
+    "go",
+    "html",
+    "java",
+    "javascript",
+    "json",
+    "python",
+    "ruby",
+    "rust",
+    "sql",
+    "text",
+    "yaml",
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _pygments():
+    # Returns the pygments module, or None if it is not installed. It is
+    # imported on first use, as it takes longer to import than gfm.
+    try:
+        import pygments
+        import pygments.formatters
+        import pygments.lexers
+    except ImportError:
+        return None
+    return pygments
+
+
+def _pygments_version():
+    pygments = _pygments()
+    return pygments and pygments.__version__
+
+
+def _freeze(options):
+    return tuple(
+        sorted(
+            (key, tuple(value) if isinstance(value, list) else value)
+            for key, value in options.items()
+        )
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _lexer(lang, options):
+    # Unknown languages are cached as None: looking them up scans all
+    # plugins, which is slower than finding a known one.
+    try:
+        return _pygments().lexers.get_lexer_by_name(lang, **dict(options))
+    except ValueError:
+        return None
+
+
+@functools.lru_cache(maxsize=64)
+def _formatter(options):
+    return _pygments().formatters.get_formatter_by_name("html", **dict(options))
+
+
+def hilite(code, lang, config):
+    """
+    Returns the HTML for ``code`` in language ``lang`` (``None`` if unknown),
+    highlighted with the :class:`~markdown.extensions.codehilite.CodeHilite`
+    options in ``config``.
+
+    Pygments lexers and formatters are looked up once per language and set of
+    options, and shared by the whole process.
+    """
+    from markdown.extensions.codehilite import CodeHilite
+
+    pygments = _pygments()
+    config = dict(config)
+    style = config.pop("pygments_style", "default")
+    highliter = CodeHilite(code, lang=lang, style=style, **config)
+    if not (
+        pygments
+        and highliter.use_pygments
+        and getattr(highliter, "pygments_formatter", "html") == "html"
+    ):
+        return highliter.hilite(shebang=False)
+
+    try:
+        options = _freeze(highliter.options)
+        hash(options)
+    except TypeError:
+        return highliter.hilite(shebang=False)
+    src = highliter.src.strip("\n")
+    lexer = _lexer(lang, options) if lang else None
+    if lexer is None:
+        if highliter.guess_lang:
+            try:
+                lexer = pygments.lexers.guess_lexer(src, **highliter.options)
+            except ValueError:
+                lexer = _lexer("text", options)
+        else:
+            lexer = _lexer("text", options)
+    return pygments.highlight(src, lexer, _formatter(options))
+
+
+def preload(languages=COMMON_LANGUAGES, config=None):
+    """
+    Looks up the lexers of ``languages`` and the formatter for the
+    :class:`~markdown.extensions.codehilite.CodeHilite` options in ``config``,
+    so that the first documents using them do not pay for it.
+    """
+    from markdown.extensions.codehilite import CodeHilite
+
+    if _pygments() is None:
+        return
+    config = dict(config or {})
+    style = config.pop("pygments_style", "default")
+    options = _freeze(CodeHilite("", style=style, **config).options)
+    _formatter(options)
+    for lang in languages:
+        _lexer(lang, options)
+
+
+def block_digest(code, lang, config):
+    """
+    Returns a hex digest of a code block, its language and its
+    :class:`~markdown.extensions.codehilite.CodeHilite` options.
+
+    :raises TypeError: if the options cannot be serialized as JSON.
+    """
+    description = [lang, sorted(config.items()), code]
+    return hashlib.sha256(json.dumps(description).encode("utf-8")).hexdigest()
+
+
+class HighlightCache:
+    """
+    A cache of highlighted code blocks.
+
+    :param max_entries: the maximum number of blocks kept in memory.
+    :param max_bytes: the maximum total size, in bytes of UTF-8, of the blocks
+                      kept in memory.
+    :param directory: a directory for the on-disk tier, or ``None``.
+    """
+
+    def __init__(self, max_entries=4096, max_bytes=16 * 1024 * 1024, directory=None):
+        self.store = lru.BoundedCache(max_entries, max_bytes, directory)
+
+    def key(self, code, lang, config):
+        """
+        Returns the cache key of a code block. Options are taken as given,
+        not as resolved by CodeHilite, whose defaults depend on the version
+        of Python-Markdown, so the version is part of the key.
+
+        :raises TypeError: if ``config`` cannot be serialized.
+        """
+        digest = hashlib.sha256(block_digest(code, lang, config).encode("ascii"))
+        digest.update(str(_pygments_version()).encode("ascii"))
+        digest.update(markdown.__version__.encode("ascii"))
+        return digest.hexdigest()
+
+    def get(self, code, lang, config):
+        """
+        Returns the highlighted HTML for a code block, or ``None`` if it is
+        not cached or cannot be.
+        """
+        try:
+            key = self.key(code, lang, config)
+        except TypeError:
+            return None
+        return self.store.get(key)
+
+    def put(self, code, lang, config, html):
+        """
+        Stores the highlighted HTML for a code block, unless it cannot be
+        cached.
+        """
+        try:
+            key = self.key(code, lang, config)
+        except TypeError:
+            return
+        self.store.put(key, html)
+
+    def highlight(self, code, lang, config):
+        """
+        Returns the same as :func:`hilite`, from the cache if possible.
+        """
+        try:
+            key = self.key(code, lang, config)
+        except TypeError:
+            return hilite(code, lang, config)
+        html = self.store.get(key)
+        if html is None:
+            html = hilite(code, lang, config)
+            self.store.put(key, html)
+        return html
+
+    def clear(self):
+        """
+        Empties the in-memory tier. The on-disk tier is left untouched.
+        """
+        self.store.clear()
+
+    def stats(self):
+        """
+        Returns the statistics of the underlying store, see
+        :meth:`gfm.lru.BoundedCache.stats`.
+        """
+        return self.store.stats()
+
+
+#: The :class:`HighlightCache` used when ``highlight_cache`` is set.
+shared_cache = HighlightCache()
+
+
+#: The :class:`concurrent.futures.Executor` used by :func:`hilite_parallel`.
+#: A :class:`~concurrent.futures.ProcessPoolExecutor` is created on first use
+#: if it is ``None``.
+executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global executor
+    with _executor_lock:
+        if executor is None:
+            import concurrent.futures
+
+            executor = concurrent.futures.ProcessPoolExecutor()
+            atexit.register(executor.shutdown)
+        return executor
+
+
+def hilite_parallel(blocks, cache=False):
+    """
+    Returns the same as ``[hilite(*block) for block in blocks]``, highlighting
+    the ``(code, lang, config)`` blocks concurrently in :data:`executor`.
+
+    If ``cache`` is set, blocks are looked up in :data:`shared_cache` first,
+    and only the others are sent to the executor.
+    """
+    results = [None] * len(blocks)
+    if cache:
+        cache = shared_cache
+        for i, block in enumerate(blocks):
+            results[i] = cache.get(*block)
+    pending = [i for i, html in enumerate(results) if html is None]
+    if not pending:
+        return results
+
+    codes, langs, configs = zip(*(blocks[i] for i in pending))
+    for i, html in zip(pending, _get_executor().map(hilite, codes, langs, configs)):
+        results[i] = html
+        if cache:
+            cache.put(*blocks[i], html)
+    return results
+
+
+#: A code block to highlight, with the id of the ``<pre>`` element standing
+#: for it in the output of a deferred render.
+HighlightJob = collections.namedtuple("HighlightJob", "id code lang config")
+
+
+def run_jobs(jobs, cache=False):
+    """
+    Highlights ``jobs`` one after another, and returns a dict mapping their
+    ids to their highlighted HTML. If ``cache`` is set, blocks are looked up
+    in :data:`shared_cache` first.
+    """
+    if cache:
+        highlighter = shared_cache.highlight
+    else:
+        highlighter = hilite
+    return {job.id: highlighter(job.code, job.lang, job.config) for job in jobs}
+
+
+def run_jobs_parallel(jobs, cache=False):
+    """
+    Same as :func:`run_jobs`, but highlights ``jobs`` concurrently with
+    :func:`hilite_parallel`.
+    """
+    blocks = [(job.code, job.lang, job.config) for job in jobs]
+    return {job.id: html for job, html in zip(jobs, hilite_parallel(blocks, cache))}
+
+
+async def run_jobs_async(jobs, cache=False, executor=None):
+    """
+    Same as :func:`run_jobs`, but highlights ``jobs`` concurrently in
+    ``executor``, or the default executor of the running event loop.
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    results = {}
+    if cache:
+        cache = shared_cache
+        for job in jobs:
+            html = cache.get(job.code, job.lang, job.config)
+            if html is not None:
+                results[job.id] = html
+    pending = [job for job in jobs if job.id not in results]
+    highlighted = await asyncio.gather(
+        *(
+            loop.run_in_executor(executor, hilite, job.code, job.lang, job.config)
+            for job in pending
+        )
+    )
+    for job, html in zip(pending, highlighted):
+        results[job.id] = html
+        if cache:
+            cache.put(job.code, job.lang, job.config, html)
+    return {job.id: results[job.id] for job in jobs}
@@ -0,0 +1,157 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+"""
+:mod:`gfm.lazy_fenced_code` -- Fenced code blocks, imported on first fence
+==========================================================================
+
+The :class:`LazyFencedCodeExtension` renders fenced code blocks as
+:class:`gfm.StandaloneFencedCodeExtension` does, with the same options. The
+latter derives from Python-Markdown's ``FencedCodeExtension``, so importing
+it imports the fenced_code and codehilite extensions, and Pygments through
+them. This one only imports them once a document has a fence, which is what
+the GFM extensions use.
+"""
+
+import re
+
+import markdown
+from markdown.preprocessors import Preprocessor
+
+from gfm import highlight
+
+# Options of the extension that are not CodeHilite options.
+_PROCESSOR_OPTIONS = (
+    "highlight_cache",
+    "preload_languages",
+    "parallel_highlight",
+    "parallel_threshold",
+    "deferred_highlight",
+)
+
+# A line that may open a fenced code block.
+_FENCE_RE = re.compile(r"(?:~{3,}|`{3,})")
+
+
+class _LazyFencedBlockPreprocessor(Preprocessor):
+    # Stands for a StandaloneFencedBlockPreprocessor until a document has a
+    # fence: the fenced_code and codehilite extensions of Python-Markdown,
+    # and Pygments through them, take longer to import than the rest of gfm.
+
+    def __init__(self, md, config, options, codehilite_conf):
+        super().__init__(md)
+        self.config = config
+        self.options = options
+        self.codehilite_conf = codehilite_conf
+        self.processor = None
+
+    def run(self, lines):
+        if self.processor is None:
+            match = _FENCE_RE.match
+            if not any(match(line) for line in lines):
+                self.md.highlight_jobs = []
+                return lines
+            from gfm import fenced_block
+
+            self.processor = fenced_block.StandaloneFencedBlockPreprocessor(
+                self.md, self.config
+            )
+            for option, value in self.options.items():
+                setattr(self.processor, option, value)
+            self.processor.codehilite_conf = self.codehilite_conf
+        return self.processor.run(lines)
+
+
+class LazyFencedCodeExtension(markdown.Extension):
+    """
+    An extension that adds fenced code blocks, highlighted with CodeHilite
+    and Pygments, without importing them before a document has a fence.
+    See :class:`gfm.StandaloneFencedCodeExtension` for the options.
+    """
+
+    def __init__(self, **kwargs):
+        self.config = _config()
+        super().__init__(**kwargs)
+
+    def extendMarkdown(self, md):
+        """Add FencedBlockPreprocessor to the Markdown instance."""
+        extend(self, md)
+
+
+def _config():
+    # The options of the extensions, as a new markdown.Extension.config.
+    return {
+        "linenums": [False, "Use lines numbers. True=yes, False=no, None=auto"],
+        "guess_lang": [False, "Automatic language detection - Default: True"],
+        "css_class": [
+            "highlight",
+            "Set class name for wrapper <div> - " "Default: codehilite",
+        ],
+        "pygments_style": [
+            "default",
+            "Pygments HTML Formatter Style " "(Colorscheme) - Default: default",
+        ],
+        "noclasses": [
+            False,
+            "Use inline styles instead of CSS classes - " "Default false",
+        ],
+        "use_pygments": [
+            True,
+            "Use Pygments to Highlight code blocks. "
+            "Disable if using a JavaScript library. "
+            "Default: True",
+        ],
+        "highlight_cache": [
+            False,
+            "Look up highlighted code blocks in gfm.highlight.shared_cache "
+            "- Default: False",
+        ],
+        "preload_languages": [
+            [],
+            "Languages whose Pygments lexers are looked up ahead of time, "
+            "e.g. gfm.highlight.COMMON_LANGUAGES - Default: []",
+        ],
+        "parallel_highlight": [
+            False,
+            "Highlight the code blocks of a document concurrently in "
+            "gfm.highlight.executor - Default: False",
+        ],
+        "parallel_threshold": [
+            20000,
+            "Minimum total length of the code of a document's blocks "
+            "for them to be highlighted concurrently - Default: 20000",
+        ],
+        "deferred_highlight": [
+            False,
+            "Emit plain code blocks with ids, and add jobs to highlight "
+            "them to md.highlight_jobs - Default: False",
+        ],
+    }
+
+
+def extend(ext, md):
+    """
+    Registers the preprocessor of the fenced code extension ``ext`` on
+    ``md``, with the options of ``ext``.
+    """
+    md.registerExtension(ext)
+    md.highlight_jobs = []
+    # Markdown 3.3 introduced a breaking change.
+    if markdown.__version_info__ >= (3, 3):
+        config = ext.getConfigs()
+        options = {option: config.pop(option) for option in _PROCESSOR_OPTIONS}
+        processor = _LazyFencedBlockPreprocessor(md, ext.config, options, config)
+        if config["use_pygments"] and options["preload_languages"]:
+            highlight.preload(options["preload_languages"], config)
+    else:
+        from markdown.extensions.fenced_code import FencedBlockPreprocessor
+
+        processor = FencedBlockPreprocessor(md)
+        processor.checked_for_codehilite = True
+        processor.codehilite_conf = {
+            key: value
+            for key, value in ext.config.items()
+            if key not in _PROCESSOR_OPTIONS
+        }
+    md.preprocessors.register(processor, "fenced_code_block", 25)
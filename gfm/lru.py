@@ -0,0 +1,139 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+"""
+:mod:`gfm.lru` -- Bounded string cache
+======================================
+
+The :mod:`gfm.lru` module provides :class:`BoundedCache`, the store behind
+:class:`gfm.highlight.HighlightCache` and
+:class:`mdx_partial_gfm.cache.RenderCache`. It maps hex digests to strings,
+keeps the least recently used entries within an entry count and a total
+size, and optionally persists every entry to a directory.
+"""
+
+import collections
+import os
+import tempfile
+import threading
+
+
+class BoundedCache:
+    """
+    A thread-safe least-recently-used cache of strings.
+
+    :param max_entries: the maximum number of entries kept in memory.
+    :param max_bytes: the maximum total size, in bytes of UTF-8, of the
+                      entries kept in memory.
+    :param directory: a directory for the on-disk tier, or ``None``.
+                      Keys are used as file names and must be hex digests.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=32 * 1024 * 1024, directory=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self._entries = collections.OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Returns the value for ``key``, or ``None`` if it is not cached. A
+        value found on disk is brought back into memory.
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+        value = self._read(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.disk_hits += 1
+                self._store(key, value)
+        return value
+
+    def put(self, key, value):
+        """
+        Stores ``value`` for ``key``, evicting the least recently used
+        entries as needed. Values larger than :attr:`max_bytes` are only
+        stored on disk.
+        """
+        with self._lock:
+            self._store(key, value)
+        self._write(key, value)
+
+    def _store(self, key, value):
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= len(old.encode("utf-8"))
+        self._entries[key] = value
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted.encode("utf-8"))
+            self.evictions += 1
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def _read(self, key):
+        if self.directory is None:
+            return None
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write(self, key, value):
+        if self.directory is None:
+            return
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file first so that readers never see a
+        # partial entry.
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(value)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def clear(self):
+        """
+        Empties the in-memory tier. The on-disk tier is left untouched.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """
+        Returns the hit, miss and eviction counters, and the number and
+        total size of in-memory entries, as a dict.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
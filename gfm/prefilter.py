@@ -0,0 +1,73 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+"""
+:mod:`gfm.prefilter` -- Literal fast path for inline processors
+===============================================================
+
+Most text nodes contain no URL, email address or strike-through at all, yet
+Python-Markdown runs every inline pattern's regex over each of them. The
+:class:`PrefilteredInlineProcessor` base class lets a processor first look
+for the literal substrings its regex cannot match without (``"@"`` for email
+addresses, for instance), and skip the regex entirely when they are absent.
+
+Every processor counts how many times its regex was to scan a text from its
+start, and how many of those scans the prefilter skipped, in its
+:attr:`~PrefilteredInlineProcessor.prefilter_checked` and
+:attr:`~PrefilteredInlineProcessor.prefilter_skipped` attributes::
+
+   md = markdown.Markdown(extensions=["mdx_gfm"])
+   md.convert(source)
+   autolink = md.inlinePatterns["gfm-autolink"]
+   print(autolink.prefilter_skipped, "/", autolink.prefilter_checked)
+
+These are scans rather than text nodes: Python-Markdown before 3.11 scans a
+text node again from its start after each match, once the match is replaced
+by a placeholder, while later versions resume past the placeholder.
+"""
+
+import markdown
+
+
+class _PrefilteredRegExp:
+    """
+    Stands for the compiled regex of a :class:`PrefilteredInlineProcessor`,
+    so that ``finditer`` does not even start when the prefilter fails.
+    """
+
+    def __init__(self, processor):
+        self.processor = processor
+
+    def finditer(self, string, pos=0):
+        processor = self.processor
+        # Scans that resume past a match only cover what the previous one
+        # left, so neither the prefilter nor the counters apply.
+        if pos == 0:
+            processor.prefilter_checked += 1
+            if not processor.may_match(string):
+                processor.prefilter_skipped += 1
+                return iter(())
+        return processor.compiled_re.finditer(string, pos)
+
+
+class PrefilteredInlineProcessor(markdown.inlinepatterns.InlineProcessor):
+    """
+    Base class for inline processors with a cheap prefilter. Subclasses
+    override :meth:`may_match`.
+    """
+
+    #: Number of scans of a text from its start the prefilter was run on.
+    prefilter_checked = 0
+    #: Number of those scans the prefilter skipped without running the regex.
+    prefilter_skipped = 0
+
+    def may_match(self, text):
+        """
+        Returns ``False`` if the regex cannot match anywhere in ``text``.
+        This should only look for literal substrings.
+        """
+        return True
+
+    def getCompiledRegExp(self):
+        return _PrefilteredRegExp(self)
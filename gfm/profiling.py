@@ -0,0 +1,282 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+"""
+:mod:`gfm.profiling` -- Per-stage timings
+=========================================
+
+The :class:`ProfilingExtension` records the wall time spent in, and the
+number of calls to, every stage of the rendering of each document: every
+preprocessor, block processor, inline pattern, treeprocessor and
+postprocessor registered on the Markdown instance, whichever extension
+registered it, and the serializer.
+
+Stages are named after their registry and their name in it, such as
+``preprocessors.fenced_code_block``, ``blockprocessors.table``,
+``inlinepatterns.gfm-autolink``, ``treeprocessors.gfm-tasklist`` or
+``serializer``. Their time does not include the time spent in the stages
+they call: ``treeprocessors.inline`` only counts walking the tree, and the
+inline patterns count the time spent searching for their regex and handling
+their matches. Block processors count the calls to their ``run`` method, and
+inline patterns the calls to their ``handleMatch`` method, that is the
+matches of their regex, including those ``handleMatch`` rejects.
+
+The :class:`Profile` of the last document is available as ``md.profile``, and
+is passed to the ``callback`` option, for example to forward it to a metrics
+system. Python-Markdown returns blank documents without running any stage,
+so ``md.profile`` is ``None`` after them, and the callback is not called. Processors are instrumented when the first document is rendered, so
+that the ones added by extensions loaded later are included too.
+
+The GFM extensions enable it with their ``profile`` and ``profile_callback``
+options.
+
+Typical usage
+-------------
+
+.. testcode::
+
+   import markdown
+   from gfm import ProfilingExtension
+
+   md = markdown.Markdown(extensions=["mdx_gfm", ProfilingExtension()])
+   md.convert("Some ~~good~~ text with http://foo.com in it.")
+   print(md.profile.stages["inlinepatterns.gfm-autolink"].calls)
+   print(sorted(md.profile.as_dict()))
+
+.. testoutput::
+
+   1
+   ['stages', 'total']
+
+"""
+
+import functools
+import time
+
+import markdown
+from markdown.postprocessors import Postprocessor
+from markdown.preprocessors import Preprocessor
+
+
+def _to_list(obj):
+    if callable(obj):
+        return [obj]
+    return list(obj)
+
+
+class Stage:
+    """
+    The calls to one stage of the rendering of a document.
+    """
+
+    __slots__ = ("calls", "time")
+
+    def __init__(self):
+        #: The number of calls.
+        self.calls = 0
+        #: The wall time spent in the stage itself, in seconds.
+        self.time = 0.0
+
+    def __repr__(self):
+        return "Stage(calls=%d, time=%f)" % (self.calls, self.time)
+
+
+class Profile:
+    """
+    The timings of the rendering of one document.
+    """
+
+    def __init__(self, names=()):
+        #: :class:`Stage` by stage name.
+        self.stages = {name: Stage() for name in names}
+        #: The wall time of the whole rendering, in seconds.
+        self.total = 0.0
+
+    def as_dict(self):
+        """
+        Returns the timings as a dict of plain values, ready to be serialized.
+        """
+        return {
+            "total": self.total,
+            "stages": {
+                name: {"calls": stage.calls, "time": stage.time}
+                for name, stage in self.stages.items()
+            },
+        }
+
+
+class _TimedRegExp:
+    # Stands for the compiled regex of an inline pattern, and times its
+    # searches, which Python-Markdown runs outside of the pattern's methods.
+
+    def __init__(self, regexp, profiler, name):
+        self.regexp = regexp
+        self.profiler = profiler
+        self.name = name
+
+    def finditer(self, string, pos=0):
+        call = self.profiler.call
+        iterator = call(self.name, 0, self.regexp.finditer, string, pos)
+        while True:
+            match = call(self.name, 0, next, iterator, None)
+            if match is None:
+                return
+            yield match
+
+    def match(self, string, *args):
+        return self.profiler.call(self.name, 0, self.regexp.match, string, *args)
+
+    def __getattr__(self, name):
+        return getattr(self.regexp, name)
+
+
+class _Profiler:
+    def __init__(self, md, callbacks):
+        self.md = md
+        self.callbacks = callbacks
+        self.names = None
+        self.profile = None
+        self.stack = []
+        self.start_time = None
+
+    def call(self, name, count, function, *args, **kwargs):
+        profile = self.profile
+        if profile is None:
+            return function(*args, **kwargs)
+        stack = self.stack
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            stage = profile.stages[name]
+            stage.time += elapsed - stack.pop()
+            stage.calls += count
+            if stack:
+                stack[-1] += elapsed
+
+    def wrap(self, name, function, count=1):
+        # Methods replaced on an instance are also called when the method
+        # calls itself, as RawHtmlPostprocessor.run does before Markdown 3.8:
+        # only the outermost call is a call of the stage.
+        depth = 0
+
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            nonlocal depth
+            if depth:
+                return function(*args, **kwargs)
+            depth += 1
+            try:
+                return self.call(name, count, function, *args, **kwargs)
+            finally:
+                depth -= 1
+
+        return timed
+
+    def instrument(self):
+        md = self.md
+        names = []
+        registries = [
+            ("preprocessors", md.preprocessors, ("run",)),
+            ("blockprocessors", md.parser.blockprocessors, ("test", "run")),
+            ("treeprocessors", md.treeprocessors, ("run",)),
+            ("postprocessors", md.postprocessors, ("run",)),
+        ]
+        for kind, registry, methods in registries:
+            for name, item in list(registry._data.items()):
+                if isinstance(item, (_StartPreprocessor, _FinishPostprocessor)):
+                    continue
+                name = kind + "." + name
+                names.append(name)
+                for method in methods:
+                    count = 0 if method == "test" else 1
+                    setattr(item, method, self.wrap(name, getattr(item, method), count))
+        for name, pattern in list(md.inlinePatterns._data.items()):
+            name = "inlinepatterns." + name
+            names.append(name)
+            # Matches that handleMatch rejects are counted as calls too.
+            pattern.handleMatch = self.wrap(name, pattern.handleMatch)
+            pattern.getCompiledRegExp = functools.partial(
+                lambda original, name: _TimedRegExp(original(), self, name),
+                pattern.getCompiledRegExp,
+                name,
+            )
+        names.append("serializer")
+        md.serializer = self.wrap("serializer", md.serializer)
+        self.names = names
+
+    def start(self):
+        if self.names is None:
+            self.instrument()
+        self.profile = Profile(self.names)
+        self.stack = []
+        self.start_time = time.perf_counter()
+
+    def finish(self):
+        profile = self.profile
+        if profile is None:
+            return
+        profile.total = time.perf_counter() - self.start_time
+        self.profile = None
+        self.md.profile = profile
+        for callback in self.callbacks:
+            callback(profile)
+
+    def convert(self, source):
+        # Stands for md.convert, so that the profile of the previous document
+        # is gone even if no stage runs.
+        md = self.md
+        md.profile = None
+        return type(md).convert(md, source)
+
+
+class _StartPreprocessor(Preprocessor):
+    def __init__(self, md, profiler):
+        super().__init__(md)
+        self.profiler = profiler
+
+    def run(self, lines):
+        self.profiler.start()
+        return lines
+
+
+class _FinishPostprocessor(Postprocessor):
+    def __init__(self, md, profiler):
+        super().__init__(md)
+        self.profiler = profiler
+
+    def run(self, text):
+        self.profiler.finish()
+        return text
+
+
+class ProfilingExtension(markdown.Extension):
+    """
+    An extension that records the time spent in each stage of the rendering
+    of each document in ``md.profile``.
+    """
+
+    def __init__(self, **kwargs):
+        self.config = {
+            "callback": [
+                [],
+                "A callable, or list of callables, called with the Profile of "
+                "each document - Default: []",
+            ],
+        }
+        super().__init__(**kwargs)
+
+    def extendMarkdown(self, md):
+        md.profile = None
+        profiler = _Profiler(md, _to_list(self.getConfig("callback")))
+        md.convert = profiler.convert
+        # Before and after every other processor.
+        md.preprocessors.register(
+            _StartPreprocessor(md, profiler), "gfm-profiling-start", 1000
+        )
+        md.postprocessors.register(
+            _FinishPostprocessor(md, profiler), "gfm-profiling-finish", -1000
+        )
@@ -3,34 +3,22 @@
 # BSD-style license that can be found in the LICENSE file.
 
 import markdown
+from markdown.extensions.fenced_code import FencedCodeExtension
 
-from markdown.extensions.fenced_code import FencedCodeExtension, FencedBlockPreprocessor
+from gfm import lazy_fenced_code
 
 
 class StandaloneFencedCodeExtension(FencedCodeExtension):
+    """
+    A :class:`~markdown.extensions.fenced_code.FencedCodeExtension` that
+    highlights code blocks with its own options rather than those of the
+    codehilite extension. Importing it imports Pygments; the GFM extensions
+    use :class:`gfm.LazyFencedCodeExtension`, which renders the same blocks
+    with the same options but does not.
+    """
+
     def __init__(self, **kwargs):
-        self.config = {
-            "linenums": [False, "Use lines numbers. True=yes, False=no, None=auto"],
-            "guess_lang": [False, "Automatic language detection - Default: True"],
-            "css_class": [
-                "highlight",
-                "Set class name for wrapper <div> - " "Default: codehilite",
-            ],
-            "pygments_style": [
-                "default",
-                "Pygments HTML Formatter Style " "(Colorscheme) - Default: default",
-            ],
-            "noclasses": [
-                False,
-                "Use inline styles instead of CSS classes - " "Default false",
-            ],
-            "use_pygments": [
-                True,
-                "Use Pygments to Highlight code blocks. "
-                "Disable if using a JavaScript library. "
-                "Default: True",
-            ],
-        }
+        self.config = lazy_fenced_code._config()
         # Markdown 3.3 introduced a breaking change.
         if markdown.__version_info__ >= (3, 3):
             super().setConfigs(kwargs)
@@ -39,13 +27,13 @@ class StandaloneFencedCodeExtension(FencedCodeExtension):
 
     def extendMarkdown(self, md):
         """Add FencedBlockPreprocessor to the Markdown instance."""
-        md.registerExtension(self)
-        # Markdown 3.3 introduced a breaking change.
-        if markdown.__version_info__ >= (3, 3):
-            processor = FencedBlockPreprocessor(md, self.config)
-            processor.codehilite_conf = self.getConfigs()
-        else:
-            processor = FencedBlockPreprocessor(md)
-            processor.checked_for_codehilite = True
-            processor.codehilite_conf = self.config
-        md.preprocessors.register(processor, "fenced_code_block", 25)
+        lazy_fenced_code.extend(self, md)
+
+
+def __getattr__(name):
+    # StandaloneFencedBlockPreprocessor used to be defined here.
+    if name == "StandaloneFencedBlockPreprocessor":
+        from gfm import fenced_block
+
+        return fenced_block.StandaloneFencedBlockPreprocessor
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
@@ -29,9 +29,22 @@ Typical usage
 
 import markdown.inlinepatterns
 
+from gfm import prefilter
+
 STRIKE_RE = r"(~{2})(.+?)(~{2})"  # ~~strike~~
 
 
+class StrikethroughInlineProcessor(
+    prefilter.PrefilteredInlineProcessor,
+    markdown.inlinepatterns.SimpleTagInlineProcessor,
+):
+    def __init__(self, pattern=STRIKE_RE, tag="del"):
+        super().__init__(pattern, tag)
+
+    def may_match(self, text):
+        return "~~" in text
+
+
 class StrikethroughExtension(markdown.Extension):
     """
     An extension that adds support for strike-through text between two ``~~``.
@@ -39,7 +52,7 @@ class StrikethroughExtension(markdown.Extension):
 
     def extendMarkdown(self, md):
         md.inlinePatterns.register(
-            markdown.inlinepatterns.SimpleTagPattern(STRIKE_RE, "del"),
+            StrikethroughInlineProcessor(),
             "gfm-strikethrough",
             100,
         )
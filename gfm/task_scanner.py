@@ -0,0 +1,464 @@
+# Copyright (c) 2016, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+"""
+:mod:`gfm.task_scanner` -- Task items without rendering
+=======================================================
+
+The :mod:`gfm.task_scanner` module provides the scanner behind
+:func:`gfm.tasklist.extract_tasks` and the ``source_offsets`` option of
+:class:`gfm.tasklist.TaskListExtension`. It builds an outline of a document
+with the rules of Python-Markdown's whitespace and fenced code preprocessors
+and of its block parser, using the patterns of its block processors, and
+keeps the line each block comes from.
+
+Those rules change between Python-Markdown versions, so the tests check the
+scanner against renders of the test documents with every version the
+package is tested with.
+"""
+
+import collections
+import re
+
+import markdown
+from markdown.blockprocessors import (
+    BlockQuoteProcessor,
+    HashHeaderProcessor,
+    HRProcessor,
+    ReferenceProcessor,
+    SetextHeaderProcessor,
+)
+
+from gfm import tasklist
+
+
+_TAB = " " * 4
+_LIST_TAGS = ("ul", "ol")
+# The patterns of OListProcessor and UListProcessor, which compile them with
+# the tab length of the parser.
+_OL_RE = re.compile(r"[ ]{0,3}\d+\.[ ]+(.*)")
+_UL_RE = re.compile(r"[ ]{0,3}[*+-][ ]+(.*)")
+_CHILD_RE = re.compile(r"[ ]{0,3}((\d+\.)|[*+-])[ ]+(.*)")
+_INDENT_CHILD_RE = re.compile(r"[ ]{4,7}((\d+\.)|[*+-])[ ]+.*")
+_INDENT_RE = re.compile(r"(?:[ ]{4})+")
+# Python-Markdown 3.6 detabs the lines that follow a header in a loose item.
+_DETAB_AFTER_HEADER = markdown.__version_info__ >= (3, 6)
+
+
+class _Node:
+    # An element of the outline of a document built by a TaskScanner, with
+    # the lines it starts and ends at.
+
+    __slots__ = ("tag", "children", "text", "tail", "line", "text_line", "end")
+
+    def __init__(self, tag, line, parent=None):
+        self.tag = tag
+        self.children = []
+        self.text = ""
+        self.tail = ""
+        self.line = line
+        self.text_line = line
+        self.end = line
+        if parent is not None:
+            parent.children.append(self)
+
+    def last(self):
+        return self.children[-1] if self.children else None
+
+    def wrap_text(self):
+        # Moves the text of the element to a paragraph, as loose items do.
+        p = _Node("p", self.text_line)
+        p.text = self.text
+        self.text = ""
+        self.children.insert(0, p)
+
+
+def _raw_index(line, column):
+    # Returns the index in line of the character at column once tabs are
+    # expanded to 4 spaces.
+    if "\t" not in line:
+        return column
+    position = 0
+    for index, char in enumerate(line):
+        if position >= column:
+            return index
+        position = position // 4 * 4 + 4 if char == "\t" else position + 1
+    return len(line)
+
+
+def _detab(block, level=1):
+    # Returns the leading lines of block indented by level tabs, detabbed,
+    # and the other lines, as BlockProcessor.detab.
+    lines = block.split("\n")
+    indent = _TAB * level
+    code = []
+    for line in lines:
+        if line.startswith(indent):
+            code.append(line[len(indent) :])
+        elif not line.strip():
+            code.append("")
+        else:
+            break
+    return "\n".join(code), "\n".join(lines[len(code) :])
+
+
+def _loose_detab(block, level=1):
+    indent = _TAB * level
+    return "\n".join(
+        line[len(indent) :] if line.startswith(indent) else line
+        for line in block.split("\n")
+    )
+
+
+class TaskScanner:
+    """
+    Finds the task items of a document as a render does, by building an
+    outline of it, then walking it as
+    :class:`gfm.tasklist.TaskListProcessor` walks the element tree. Blocks
+    are kept with the index of their first line, which block processors
+    never reorder.
+
+    :param options: the options of a
+                    :class:`gfm.tasklist.TaskListExtension`, as read by its
+                    processor.
+    """
+
+    def __init__(self, options):
+        self.options = options
+        # The states of the block parser.
+        self.state = []
+
+    def scan(self, text):
+        """
+        Returns the task items of ``text`` as a list of
+        :class:`gfm.tasklist.Task`.
+        """
+        if not text.strip():
+            return []
+        text, lines, sources = self.preprocess(text)
+        root = _Node("div", 0)
+        self.parse_chunk(root, text, 0)
+        return self.tasks(root, lines, sources)
+
+    def preprocess(self, text):
+        # Returns text as NormalizeWhitespace and FencedBlockPreprocessor
+        # leave it, the fenced_code extension being imported only if there is
+        # a fence, its lines and, for each of them, the line of the source
+        # it comes from, its index and its offset.
+        sources = []
+        lines = []
+        offset = 0
+        for index, raw in enumerate(text.split("\n")):
+            end = offset + len(raw) + 1
+            for part in (raw[:-1] if raw.endswith("\r") else raw).split("\r"):
+                line = part.replace("\x02", "").replace("\x03", "").expandtabs(4)
+                if lines and not line.strip(" "):
+                    line = ""
+                lines.append(line)
+                sources.append((part, index, offset))
+                offset += len(part) + 1
+            offset = end
+        # NormalizeWhitespace adds two newlines.
+        lines += ["", ""]
+        sources += [sources[-1]] * 2
+        text = "\n".join(lines)
+        if "```" not in text and "~~~" not in text:
+            return text, lines, sources
+
+        from markdown.extensions import fenced_code
+
+        pattern = fenced_code.FencedBlockPreprocessor.FENCED_BLOCK_RE
+        remainder = getattr(fenced_code, "get_attrs_and_remainder", None)
+        # Each fenced block becomes a placeholder between two blank lines, as
+        # it would if the text was replaced after each of them.
+        placeholder = markdown.util.HTML_PLACEHOLDER % 0
+        pieces = []
+        replaced = []
+        index = start = line = previous = 0
+        while True:
+            m = pattern.search(text, index)
+            if m is None:
+                break
+            if m.group("attrs") and remainder and remainder(m.group("attrs"))[1]:
+                index = m.end("attrs")
+                continue
+            first = line + text.count("\n", start, m.start())
+            line = first + text.count("\n", m.start(), m.end())
+            pieces += [text[start : m.start()], "\n", placeholder, "\n"]
+            # The placeholder ends where the block does.
+            replaced += sources[previous:first]
+            replaced += [sources[first], sources[line], sources[line]]
+            index = start = m.end()
+            previous = line + 1
+        pieces.append(text[start:])
+        text = "".join(pieces)
+        sources = replaced + sources[previous:]
+        return text, text.split("\n"), sources
+
+    def tasks(self, root, lines, sources):
+        options = self.options
+        markers = options.markers
+        enabled = {"ul": options.unordered, "ol": options.ordered}
+        tasks = []
+        stack = [(root, None, 0)]
+        while stack:
+            el, parent, depth = stack.pop()
+            if parent is not None and el.tag == "li" and enabled.get(parent.tag):
+                depth += 1
+                text = el.text.lstrip()
+                match = markers.match(text[: options.prefix_length].lower())
+                if match:
+                    tasks.append(
+                        tasklist.Task(
+                            match.lastgroup == "checked",
+                            tasklist._task_text(text[match.end() :]),
+                            depth,
+                            parent.tag == "ol",
+                            sources[el.line][1],
+                            self.end(el, sources),
+                            self.offset(el, text, lines, sources),
+                        )
+                    )
+            if depth < options.max_depth:
+                for child in reversed(el.children):
+                    if child.tag not in tasklist._LEAF_TAGS:
+                        stack.append((child, el, depth))
+
+        return tasks
+
+    @staticmethod
+    def end(el, sources):
+        # The end of an item is the last end of the elements it holds.
+        end = el.end
+        nodes = [el]
+        while nodes:
+            node = nodes.pop()
+            end = max(end, node.end)
+            nodes.extend(node.children)
+        return sources[end - 1][1] + 1
+
+    @staticmethod
+    def offset(el, text, lines, sources):
+        # The text of an item ends the line it starts on, unless the line was
+        # changed by the preprocessors.
+        line = lines[el.text_line]
+        first = text.split("\n", 1)[0]
+        raw, _, offset = sources[el.text_line]
+        if not line.endswith(first) or raw.expandtabs(4) != line:
+            return None
+        return offset + _raw_index(raw, len(line) - len(first))
+
+    def parse_chunk(self, parent, text, line):
+        blocks = []
+        for block in text.split("\n\n"):
+            blocks.append((block, line))
+            line += block.count("\n") + 2
+        self.parse_blocks(parent, blocks)
+
+    def parse_blocks(self, parent, blocks):
+        # Runs the first block processor of Python-Markdown that accepts each
+        # block, in the order of their priorities.
+        blocks = collections.deque(blocks)
+        while blocks:
+            block, line = blocks[0]
+            if block.strip():
+                parent.end = max(parent.end, line + block.rstrip().count("\n") + 1)
+            if not block or block.startswith("\n"):
+                blocks.popleft()
+                if block[1:]:
+                    blocks.appendleft((block[1:], line + 1))
+            elif block.startswith(_TAB) and self.nested(parent):
+                self.indent(parent, blocks)
+            elif block.startswith(_TAB):
+                self.code(parent, blocks)
+            elif HashHeaderProcessor.RE.search(block):
+                self.hash_header(parent, blocks)
+            elif SetextHeaderProcessor.RE.match(block):
+                blocks.popleft()
+                _Node("h", line, parent)
+                if block.count("\n") > 1:
+                    blocks.appendleft((block.split("\n", 2)[2], line + 2))
+            elif HRProcessor.SEARCH_RE.search(block):
+                self.hr(parent, blocks)
+            elif _OL_RE.match(block):
+                self.list(parent, blocks, "ol")
+            elif _UL_RE.match(block):
+                self.list(parent, blocks, "ul")
+            elif (
+                BlockQuoteProcessor.RE.search(block)
+                and not markdown.util.nearing_recursion_limit()
+            ):
+                self.quote(parent, blocks)
+            elif not self.reference(blocks):
+                self.paragraph(parent, blocks)
+
+    def nested(self, parent):
+        # Whether ListIndentProcessor takes an indented block.
+        last = parent.last()
+        return (self.state[-1:] != ["detabbed"]) and (
+            parent.tag == "li" or last is not None and last.tag in _LIST_TAGS
+        )
+
+    def indent(self, parent, blocks):
+        block, line = blocks.popleft()
+        m = _INDENT_RE.match(block)
+        indent = len(m.group()) // 4 if m else 0
+        level = 1 if self.state[-1:] == ["list"] else 0
+        sibling = parent
+        while indent > level:
+            child = sibling.last()
+            if child is None or child.tag not in ("ul", "ol", "li"):
+                break
+            if child.tag in _LIST_TAGS:
+                level += 1
+            sibling = child
+        block = _loose_detab(block, level)
+
+        self.state.append("detabbed")
+        if parent.tag == "li":
+            last = parent.last()
+            if last is not None and last.tag in _LIST_TAGS:
+                self.parse_blocks(last, [(block, line)])
+            else:
+                self.parse_blocks(parent, [(block, line)])
+        elif sibling.tag == "li":
+            self.parse_blocks(sibling, [(block, line)])
+        elif sibling.last() is not None and sibling.last().tag == "li":
+            item = sibling.last()
+            if item.text:
+                item.wrap_text()
+            self.parse_chunk(item, block, line)
+        else:
+            self.parse_blocks(_Node("li", line, sibling), [(block, line)])
+        self.state.pop()
+
+    def code(self, parent, blocks):
+        block, line = blocks.popleft()
+        last = parent.last()
+        if last is None or last.tag != "pre":
+            _Node("pre", line, parent)
+        code, rest = _detab(block)
+        if rest:
+            blocks.appendleft((rest, line + code.count("\n") + 1))
+
+    def hash_header(self, parent, blocks):
+        block, line = blocks.popleft()
+        m = HashHeaderProcessor.RE.search(block)
+        before = block[: m.start()]
+        after = block[m.end() :]
+        if before:
+            self.parse_blocks(parent, [(before, line)])
+        _Node("h", line + before.count("\n"), parent)
+        if after:
+            if _DETAB_AFTER_HEADER and self.state[-1:] == ["looselist"]:
+                after = _loose_detab(after)
+            blocks.appendleft((after, line + block.count("\n", 0, m.end())))
+
+    def hr(self, parent, blocks):
+        block, line = blocks.popleft()
+        m = HRProcessor.SEARCH_RE.search(block)
+        before = block[: m.start()].rstrip("\n")
+        if before:
+            self.parse_blocks(parent, [(before, line)])
+        _Node("hr", line, parent)
+        after = block[m.end() :].lstrip("\n")
+        if after:
+            blocks.appendleft(
+                (after, line + block.count("\n", 0, len(block) - len(after)))
+            )
+
+    def list(self, parent, blocks, tag):
+        block, line = blocks.popleft()
+        items = []
+        for i, text in enumerate(block.split("\n")):
+            m = _CHILD_RE.match(text)
+            if m:
+                items.append(([m.group(3)], line + i))
+            elif _INDENT_CHILD_RE.match(text) and not items[-1][0][0].startswith(_TAB):
+                items.append(([text], line + i))
+            else:
+                items[-1][0].append(text)
+        items = [("\n".join(text), start) for text, start in items]
+
+        sibling = parent.last()
+        if sibling is not None and sibling.tag in _LIST_TAGS:
+            lst = sibling
+            last = lst.last()
+            if last is not None:
+                if last.text:
+                    last.wrap_text()
+                child = last.last()
+                if child is not None and child.tail:
+                    _Node("p", child.end, last)
+                    child.tail = ""
+            first = items.pop(0)
+            self.state.append("looselist")
+            self.parse_blocks(_Node("li", first[1], lst), [first])
+            self.state.pop()
+        elif parent.tag in _LIST_TAGS:
+            lst = parent
+        else:
+            lst = _Node(tag, line, parent)
+
+        self.state.append("list")
+        for item in items:
+            if item[0].startswith(_TAB) and lst.children:
+                self.parse_blocks(lst.children[-1], [item])
+            else:
+                self.parse_blocks(_Node("li", item[1], lst), [item])
+        self.state.pop()
+
+    def quote(self, parent, blocks):
+        block, line = blocks.popleft()
+        m = BlockQuoteProcessor.RE.search(block)
+        self.parse_blocks(parent, [(block[: m.start()], line)])
+        text = "\n".join(self.clean(text) for text in block[m.start() :].split("\n"))
+        quote = parent.last()
+        if quote is None or quote.tag != "blockquote":
+            quote = _Node("blockquote", line, parent)
+        self.state.append("blockquote")
+        self.parse_chunk(quote, text, line + block.count("\n", 0, m.start()))
+        self.state.pop()
+
+    @staticmethod
+    def clean(line):
+        # Removes the blockquote marker of line.
+        m = BlockQuoteProcessor.RE.match(line)
+        if line.strip() == ">":
+            return ""
+        return m.group(2) if m else line
+
+    def reference(self, blocks):
+        block, line = blocks[0]
+        m = ReferenceProcessor.RE.search(block)
+        if m is None:
+            return False
+        blocks.popleft()
+        after = block[m.end() :]
+        if after.strip():
+            after = after.lstrip("\n")
+            blocks.appendleft(
+                (after, line + block.count("\n", 0, len(block) - len(after)))
+            )
+        if block[: m.start()].strip():
+            blocks.appendleft((block[: m.start()].rstrip("\n"), line))
+        return True
+
+    def paragraph(self, parent, blocks):
+        block, line = blocks.popleft()
+        if not block.strip():
+            return
+        if self.state[-1:] != ["list"]:
+            _Node("p", line, parent)
+            return
+        last = parent.last()
+        if last is not None:
+            last.tail = "%s\n%s" % (last.tail, block)
+        elif parent.text:
+            parent.text = "%s\n%s" % (parent.text, block)
+        else:
+            parent.text = block.lstrip()
+            parent.text_line = line + block.count(
+                "\n", 0, len(block) - len(parent.text)
+            )
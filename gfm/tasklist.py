@@ -21,26 +21,29 @@ Example syntax::
 
 .. NOTE::
    GitHub has support for updating the Markdown source text by toggling the
-   checkbox (by clicking on it). This is not supported by this extension, as it
-   requires server-side processing that is out of scope of a Markdown parser.
+   checkbox (by clicking on it). This extension does not do it by itself, but
+   can give each checkbox the offset of its marker in the source, which
+   :func:`toggle_task` takes to update the source. See `Toggling tasks`_.
 
 Available configuration options
 -------------------------------
 
-================== ============== ======== ===========
-Name               Type           Default  Description
-================== ============== ======== ===========
-``unordered``      bool           ``True`` Set to ``False`` to disable parsing of unordered lists.
-``ordered``        bool           ``True`` Set to ``False`` to disable parsing of ordered lists.
-``max_depth``      integer        ∞        Set to a positive integer to stop parsing nested task
-                                           lists that are deeper than this limit.
-``list_attrs``     dict, callable ``{}``   Attributes to be added to the ``<ul>`` or ``<ol>`` element
-                                           containing the items.
-``item_attrs``     dict, callable ``{}``   Attributes to be added to the ``<li>`` element containing
-                                           the checkbox. See `Item attributes`_.
-``checkbox_attrs`` dict, callable ``{}``   Attributes to be added to the checkbox element.
-                                           See `Checkbox attributes`_.
-================== ============== ======== ===========
+================== ============== ========= ===========
+Name               Type           Default   Description
+================== ============== ========= ===========
+``unordered``      bool           ``True``  Set to ``False`` to disable parsing of unordered lists.
+``ordered``        bool           ``True``  Set to ``False`` to disable parsing of ordered lists.
+``max_depth``      integer        ∞         Set to a positive integer to stop parsing nested task
+                                            lists that are deeper than this limit.
+``list_attrs``     dict, callable ``{}``    Attributes to be added to the ``<ul>`` or ``<ol>`` element
+                                            containing the items.
+``item_attrs``     dict, callable ``{}``    Attributes to be added to the ``<li>`` element containing
+                                            the checkbox. See `Item attributes`_.
+``checkbox_attrs`` dict, callable ``{}``    Attributes to be added to the checkbox element.
+                                            See `Checkbox attributes`_.
+``source_offsets`` bool           ``False`` Set to ``True`` to add the offset of the marker of each
+                                            item in the source to its checkbox. See `Toggling tasks`_.
+================== ============== ========= ===========
 
 List attributes
 ***************
@@ -68,7 +71,8 @@ where:
   a depth of 1).
 
 The returned *dict* items will be applied as HTML attributes to the list
-element.
+element. The function is called once for each list that holds a task item,
+in document order, after all the items were processed.
 
 .. note::
 
@@ -151,6 +155,81 @@ where:
 The returned *dict* items will be applied as HTML attributes to the checkbox
 element.
 
+Memoized attributes
+*******************
+
+Attribute callbacks are called for every list, item or checkbox. When they
+are costly, and their result only depends on part of their arguments, wrap
+them in a :class:`MemoizedAttrs` with a function of the same arguments that
+returns a cache key. The callback is then called once per key, for each
+document with the default ``"render"`` scope, or once and for all with the
+``"global"`` scope::
+
+   def item_attrs(parent, element, checkbox):
+       return {'class': theme.item_class(parent.tag, 'checked' in checkbox.attrib)}
+
+   TaskListExtension(item_attrs=MemoizedAttrs(
+       item_attrs,
+       key=lambda parent, element, checkbox: (parent.tag, 'checked' in checkbox.attrib),
+   ))
+
+The same attributes dict is returned for every element with the same key, so
+it must not be modified.
+
+Extracting tasks
+----------------
+
+:func:`extract_tasks` returns the task items of a document without rendering
+it, as :class:`Task` tuples. It takes the same options as
+:class:`TaskListExtension`, and builds an outline of the document with the
+rules of Python-Markdown's block parser (see :mod:`gfm.task_scanner`) rather
+than building and serializing an element tree, which makes it three to seven
+times faster than rendering the document and looking for checkboxes in the
+HTML:
+
+.. testcode::
+
+   from gfm.tasklist import extract_tasks
+
+   for task in extract_tasks(\"""
+   - [x] milk
+   - [ ] if possible:
+       1. [ ] solve world peace
+   \"""):
+       print(task)
+
+.. testoutput::
+
+   Task(checked=True, text='milk', depth=1, ordered=False, start=1, end=2, offset=3)
+   Task(checked=False, text='if possible:', depth=1, ordered=False, start=2, end=4, offset=14)
+   Task(checked=False, text='solve world peace', depth=2, ordered=True, start=3, end=4, offset=38)
+
+Toggling tasks
+--------------
+
+With the ``source_offsets`` option, the checkbox of each item has a
+``data-offset`` attribute set to the offset of its marker in the text given to
+:meth:`markdown.Markdown.convert`. :func:`toggle_task` takes this offset, or
+the :attr:`Task.offset` of an item, and returns the text with only this
+marker replaced, without parsing or rendering it:
+
+.. testcode::
+
+   from gfm.tasklist import toggle_task
+
+   print(toggle_task("- [x] milk\\n- [ ] eggs", 13))
+
+.. testoutput::
+
+   - [x] milk
+   - [x] eggs
+
+The offsets are found by the same scanner as :func:`extract_tasks`, and are
+left out if it does not find the items of the render, with the same state
+and text in the same order, as in raw HTML blocks. Given the index of a
+checkbox, :func:`toggle_task` renders the text and takes the offset of this
+checkbox, so that items are never told apart by their text.
+
 Typical usage
 -------------
 
@@ -177,46 +256,173 @@ Typical usage
 
 """
 
+import collections
+import re
+
 import markdown
-from functools import reduce
+from markdown.preprocessors import Preprocessor
 from markdown.treeprocessors import Treeprocessor
 import xml.etree.ElementTree as etree
 
 
+# Elements that Python-Markdown's block parser never puts a list in. Task
+# lists are found before inline patterns run, so there are no inline elements
+# yet.
+_LEAF_TAGS = frozenset(("p", "h1", "h2", "h3", "h4", "h5", "h6", "hr", "pre", "table"))
+
+
 def _to_list(obj):
     if isinstance(obj, str):
         return [obj]
     return list(obj)
 
 
+# The options of a TaskListExtension, as used by TaskListProcessor.
+_Options = collections.namedtuple(
+    "_Options",
+    "ordered unordered checked unchecked markers prefix_length max_depth "
+    "list_attrs item_attrs checkbox_attrs source_offsets",
+)
+
+
+def _compile_markers(checked, unchecked):
+    # Returns a regex that matches the lowercase beginning of an item that
+    # starts with one of the checked or unchecked patterns, with the pattern
+    # in its "checked" or "unchecked" group, or None if there are no
+    # patterns. Like the alternatives of a regex, patterns are tried in
+    # order, checked ones first.
+    groups = [
+        "(?P<%s>%s)" % (name, "|".join(re.escape(pattern) for pattern in patterns))
+        for name, patterns in (("checked", checked), ("unchecked", unchecked))
+        if patterns
+    ]
+    if not groups:
+        return None
+    return re.compile("|".join(groups))
+
+
+def _options(ext):
+    checked = _to_list(ext.getConfig("checked"))
+    unchecked = _to_list(ext.getConfig("unchecked"))
+    return _Options(
+        ordered=ext.getConfig("ordered"),
+        unordered=ext.getConfig("unordered"),
+        checked=checked,
+        unchecked=unchecked,
+        markers=_compile_markers(checked, unchecked),
+        prefix_length=max(map(len, checked + unchecked), default=0),
+        max_depth=ext.getConfig("max_depth") or float("inf"),
+        list_attrs=ext.getConfig("list_attrs"),
+        item_attrs=ext.getConfig("item_attrs"),
+        checkbox_attrs=ext.getConfig("checkbox_attrs"),
+        source_offsets=ext.getConfig("source_offsets"),
+    )
+
+
+class MemoizedAttrs:
+    """
+    Wraps an attribute callback, for the ``list_attrs``, ``item_attrs`` and
+    ``checkbox_attrs`` options, so that it is called once per cache key
+    rather than once per element.
+
+    :param callback: the attribute callback.
+    :param key: a function called with the same arguments as ``callback``,
+                that returns a hashable key. Elements with the same key get
+                the same attributes.
+    :param scope: ``"render"`` to keep the attributes for the rendering of a
+                  document, or ``"global"`` to keep them for the lifetime of
+                  this object.
+    """
+
+    def __init__(self, callback, key, scope="render"):
+        if scope not in ("render", "global"):
+            raise ValueError("Unknown scope %r" % scope)
+        self.callback = callback
+        self.key = key
+        self.scope = scope
+        #: The attributes by key, for the global scope.
+        self.cache = {}
+
+    def __call__(self, *args):
+        return self.lookup(self.cache, args)
+
+    def lookup(self, cache, args):
+        """
+        Returns the attributes for ``args``, from ``cache`` if they are in it.
+        """
+        key = self.key(*args)
+        try:
+            return cache[key]
+        except KeyError:
+            attrs = cache[key] = self.callback(*args)
+            return attrs
+
+    def clear(self):
+        """
+        Empties the global cache.
+        """
+        self.cache.clear()
+
+
+def _attrs_function(attrs):
+    # Returns a function that returns the attributes of an element, given the
+    # value of an attribute option, with a new cache if it is memoized for
+    # the rendering of a document.
+    if isinstance(attrs, MemoizedAttrs) and attrs.scope == "render":
+        cache = {}
+        return lambda *args: attrs.lookup(cache, args)
+    if callable(attrs):
+        return attrs
+    return lambda *args: attrs
+
+
 class TaskListProcessor(Treeprocessor):
+    """
+    Turns the items of the lists of a document that start with a task marker
+    into task items. The options of the extension are read once, when the
+    processor is created.
+    """
+
     def __init__(self, ext):
         super(TaskListProcessor, self).__init__()
         self.ext = ext
+        self.options = _options(ext)
+        #: The source of the document being rendered, when the
+        #: ``source_offsets`` option is set.
+        self.source = None
+        #: The offsets of the markers of the task items of the last rendered
+        #: document, in document order, when the ``source_offsets`` option is
+        #: set. Items without an offset have ``None``.
+        self.offsets = []
 
     def run(self, root):
-        ordered = self.ext.getConfig("ordered")
-        unordered = self.ext.getConfig("unordered")
-        if not ordered and not unordered:
-            return root
-
-        checked_pattern = _to_list(self.ext.getConfig("checked"))
-        unchecked_pattern = _to_list(self.ext.getConfig("unchecked"))
-        if not checked_pattern and not unchecked_pattern:
+        self.offsets = []
+        options = self.options
+        ordered = options.ordered
+        unordered = options.unordered
+        markers = options.markers
+        if not ordered and not unordered or markers is None:
             return root
 
-        prefix_length = reduce(
-            max, (len(e) for e in checked_pattern + unchecked_pattern)
-        )
+        prefix_length = options.prefix_length
+        max_depth = options.max_depth
+        item_attrs = _attrs_function(options.item_attrs)
+        list_attrs = _attrs_function(options.list_attrs)
+        base_cb_attrs = _attrs_function(options.checkbox_attrs)
+        source_offsets = options.source_offsets
 
-        item_attrs = self.ext.getConfig("item_attrs")
-        list_attrs = self.ext.getConfig("list_attrs")
-        base_cb_attrs = self.ext.getConfig("checkbox_attrs")
-        max_depth = self.ext.getConfig("max_depth")
-        if not max_depth:
-            max_depth = float("inf")
+        # Most documents have no list at all, and iter() is implemented in C.
+        tags = [tag for tag, enabled in (("ul", unordered), ("ol", ordered)) if enabled]
+        if all(next(root.iter(tag), None) is None for tag in tags):
+            return root
 
-        lists = set()
+        # The lists that hold a task item with their depth, in document
+        # order, and the last one found at each depth. Items are found in
+        # document order, so a list is never found again once an item of
+        # another list at the same depth was.
+        lists = []
+        last_lists = {}
+        checkboxes = []
         stack = [(root, None, 0)]
 
         while stack:
@@ -229,63 +435,82 @@ class TaskListProcessor(Treeprocessor):
             ):
                 depth += 1
                 text = (el.text or "").lstrip()
-                lower_text = text[:prefix_length].lower()
-                found = False
-                checked = False
-
-                for p in checked_pattern:
-                    if lower_text.startswith(p):
-                        found = True
-                        checked = True
-                        text = text[len(p) :]
-                        break
-                else:
-                    for p in unchecked_pattern:
-                        if lower_text.startswith(p):
-                            found = True
-                            text = text[len(p) :]
-                            break
-
-                if found:
-                    # Add root <ol> or <ul> element to the list set
-                    if list_attrs:
-                        lists.add((parent, depth))
+                match = markers.match(text[:prefix_length].lower())
+
+                if match:
+                    checked = match.lastgroup == "checked"
+                    text = text[match.end() :]
+                    if options.list_attrs and last_lists.get(depth) is not parent:
+                        last_lists[depth] = parent
+                        lists.append((parent, depth))
 
                     # Checkbox attributes
                     attrs = {"type": "checkbox", "disabled": "disabled"}
                     if checked:
                         attrs["checked"] = "checked"
                     # Give user a chance to update checkbox attributes
-                    attrs.update(
-                        base_cb_attrs(parent, el)
-                        if callable(base_cb_attrs)
-                        else base_cb_attrs
-                    )
+                    attrs.update(base_cb_attrs(parent, el))
                     checkbox = etree.Element("input", attrs)
                     checkbox.tail = text
+                    if source_offsets:
+                        checkboxes.append(checkbox)
                     # Prepend checkbox to <li>
                     el.text = ""
                     el.insert(0, checkbox)
                     # Give user a chance to update <li> attributes
-                    for k, v in (
-                        item_attrs(parent, el, checkbox)
-                        if callable(item_attrs)
-                        else item_attrs
-                    ).items():
+                    for k, v in item_attrs(parent, el, checkbox).items():
                         el.set(k, v)
 
             if depth < max_depth:
-                for child in el:
-                    stack.append((child, el, depth))
+                # In reverse, so that items are found in document order.
+                for child in reversed(el):
+                    if child.tag not in _LEAF_TAGS:
+                        stack.append((child, el, depth))
 
         for list, depth in lists:
-            for k, v in (
-                list_attrs(list, depth) if callable(list_attrs) else list_attrs
-            ).items():
+            for k, v in list_attrs(list, depth).items():
                 list.set(k, v)
 
+        if checkboxes:
+            self.annotate(checkboxes)
+
         return root
 
+    def annotate(self, checkboxes):
+        """
+        Sets the ``data-offset`` attribute of ``checkboxes``, in document
+        order, to the offset of the marker of their item in the source, if
+        the task items found in the source have the state and text of those
+        of the document. No offset is set otherwise.
+        """
+        from gfm import task_scanner
+
+        tasks = task_scanner.TaskScanner(self.options).scan(self.source)
+        self.offsets = [None] * len(checkboxes)
+        if len(tasks) != len(checkboxes) or any(
+            task.checked != (checkbox.get("checked") is not None)
+            or task.text != _task_text(checkbox.tail)
+            for checkbox, task in zip(checkboxes, tasks)
+        ):
+            return
+        self.offsets = [task.offset for task in tasks]
+        for checkbox, task in zip(checkboxes, tasks):
+            if task.offset is not None:
+                checkbox.set("data-offset", str(task.offset))
+
+
+class _SourcePreprocessor(Preprocessor):
+    # Keeps the source of each document for a TaskListProcessor, before other
+    # preprocessors change it.
+
+    def __init__(self, md, processor):
+        super().__init__(md)
+        self.processor = processor
+
+    def run(self, lines):
+        self.processor.source = "\n".join(lines)
+        return lines
+
 
 class TaskListExtension(markdown.Extension):
     """
@@ -324,8 +549,99 @@ class TaskListExtension(markdown.Extension):
                 "Additional attribute dict (or callable) "
                 "to add to the checkbox <input> element",
             ],
+            "source_offsets": [
+                False,
+                "Set the data-offset attribute of checkboxes to the offset "
+                "of their marker in the source",
+            ],
         }
         super().__init__(**kwargs)
 
     def extendMarkdown(self, md):
-        md.treeprocessors.register(TaskListProcessor(self), "gfm-tasklist", 100)
+        processor = TaskListProcessor(self)
+        md.treeprocessors.register(processor, "gfm-tasklist", 100)
+        if self.getConfig("source_offsets"):
+            # Before any other preprocessor, but profiling.
+            md.preprocessors.register(
+                _SourcePreprocessor(md, processor), "gfm-tasklist-source", 500
+            )
+
+
+#: A task item found by :func:`extract_tasks`: whether it is checked, its
+#: text without the marker, its depth (1 for the items of root lists), whether
+#: its list is ordered, the indexes of its first line and of the line after
+#: its last one, nested lists included, and the offset of its marker in the
+#: source.
+Task = collections.namedtuple("Task", "checked text depth ordered start end offset")
+
+
+def _task_text(text):
+    return "\n".join(line.strip() for line in text.split("\n")).strip()
+
+
+def extract_tasks(text, **config):
+    """
+    Returns the task items of ``text`` as a list of :class:`Task`, in
+    document order, without rendering it. ``config`` holds the options of
+    :class:`TaskListExtension`; only ``ordered``, ``unordered``, ``checked``,
+    ``unchecked`` and ``max_depth`` matter.
+
+    The items are found by following the rules of Python-Markdown's block
+    parser and of the ``fenced_code`` extension on an outline of the
+    document, so they are those of a render with ``fenced_code``, except in
+    raw HTML blocks, which are not recognized. :attr:`Task.offset` is
+    ``None`` for items whose line holds the ``\\x02`` or ``\\x03``
+    characters, which Python-Markdown removes.
+    """
+    options = _options(TaskListExtension(**config))
+    if not options.ordered and not options.unordered or options.markers is None:
+        return []
+    from gfm import task_scanner
+
+    return task_scanner.TaskScanner(options).scan(text)
+
+
+def toggle_task(text, offset=None, index=None, **config):
+    """
+    Returns ``text`` with the marker of a task item replaced by the first
+    unchecked pattern if it is checked, and by the first checked one
+    otherwise. The item is given by the ``offset`` of its marker, as set in
+    the ``data-offset`` attribute of its checkbox with the ``source_offsets``
+    option or in :attr:`Task.offset`, or by the ``index`` of its checkbox in
+    a render with ``fenced_code``. ``config`` holds the options of
+    :class:`TaskListExtension`.
+
+    Only the marker is looked at when the offset is given. The text is
+    rendered when the index is given, and the offset is the one the render
+    sets on the checkbox. Offsets of the markers that follow it change if the
+    patterns have different lengths.
+
+    :raises IndexError: if there are not more than ``index`` checkboxes.
+    :raises ValueError: if there is no marker at ``offset``, the checkbox at
+       ``index`` has no offset, or there is no pattern to replace the marker
+       with.
+    """
+    if index is not None:
+        md = markdown.Markdown(
+            extensions=[
+                "fenced_code",
+                TaskListExtension(**dict(config, source_offsets=True)),
+            ]
+        )
+        md.convert(text)
+        offset = md.treeprocessors["gfm-tasklist"].offsets[index]
+    options = _options(TaskListExtension(**config))
+    match = (
+        options.markers.match(text[offset : offset + options.prefix_length].lower())
+        if options.markers is not None and offset is not None and offset >= 0
+        else None
+    )
+    if match is None:
+        raise ValueError("No task marker at offset %r" % offset)
+    if match.lastgroup == "checked":
+        replacements = options.unchecked
+    else:
+        replacements = options.checked
+    if not replacements:
+        raise ValueError("No pattern to replace %r with" % match.group())
+    return text[:offset] + replacements[0] + text[offset + match.end() :]
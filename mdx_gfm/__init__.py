@@ -28,6 +28,25 @@ use a slightly different variant of GFM. For that, use
 from markdown.extensions.nl2br import Nl2BrExtension
 
 from mdx_partial_gfm import PartialGithubFlavoredMarkdownExtension
+from mdx_partial_gfm import batch
+from mdx_partial_gfm import compiled
+from mdx_partial_gfm import incremental
+from mdx_partial_gfm import pool
+from mdx_partial_gfm import stream
+from mdx_partial_gfm.batch import RenderError
+from mdx_partial_gfm.cache import RenderCache
+
+__all__ = [
+    "CompiledProfile",
+    "GithubFlavoredMarkdownExtension",
+    "IncrementalRenderer",
+    "RenderCache",
+    "RenderError",
+    "RendererPool",
+    "makeExtension",
+    "render_many",
+    "render_stream",
+]
 
 
 def makeExtension(**kwargs):
@@ -54,3 +73,57 @@ class GithubFlavoredMarkdownExtension(PartialGithubFlavoredMarkdownExtension):
     def extendMarkdown(self, md):
         PartialGithubFlavoredMarkdownExtension.extendMarkdown(self, md)
         Nl2BrExtension().extendMarkdown(md)
+
+
+class RendererPool(pool.RendererPool):
+    """
+    A pool of :class:`markdown.Markdown` instances configured with
+    :class:`GithubFlavoredMarkdownExtension`. See
+    :class:`mdx_partial_gfm.pool.RendererPool`.
+    """
+
+    extension_class = GithubFlavoredMarkdownExtension
+
+
+class CompiledProfile(compiled.CompiledProfile):
+    """
+    Builds :class:`markdown.Markdown` instances configured with
+    :class:`GithubFlavoredMarkdownExtension` by copying a template
+    instance. See :class:`mdx_partial_gfm.compiled.CompiledProfile`.
+    """
+
+    extension_class = GithubFlavoredMarkdownExtension
+
+
+class IncrementalRenderer(incremental.IncrementalRenderer):
+    """
+    Renders successive versions of a document with
+    :class:`GithubFlavoredMarkdownExtension`, re-rendering only the blocks that
+    changed. See :class:`mdx_partial_gfm.incremental.IncrementalRenderer`.
+    """
+
+    extension_class = GithubFlavoredMarkdownExtension
+
+
+def render_many(documents, workers=None, chunksize=64, **config):
+    """
+    Renders ``documents`` with :class:`GithubFlavoredMarkdownExtension`
+    over ``workers`` processes, and yields their HTML in order, or a
+    :class:`~mdx_partial_gfm.batch.RenderError` for documents that failed.
+    See :func:`mdx_partial_gfm.batch.render_many`.
+    """
+    return batch.render_many(
+        documents, GithubFlavoredMarkdownExtension, workers, chunksize, **config
+    )
+
+
+def render_stream(file_like, buffer_size=16384, **config):
+    """
+    Renders the document read from ``file_like`` with
+    :class:`GithubFlavoredMarkdownExtension`, and yields the HTML of its
+    top-level blocks as they are complete. See
+    :func:`mdx_partial_gfm.stream.render_stream`.
+    """
+    return stream.render_stream(
+        file_like, GithubFlavoredMarkdownExtension, buffer_size, **config
+    )
@@ -0,0 +1,148 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+"""
+:mod:`mdx_gfm.aio` -- Rendering from asyncio
+============================================
+
+Rendering a large document takes long enough to stall an event loop. The
+:mod:`mdx_gfm.aio` module renders documents in an executor instead, so that
+other coroutines keep running.
+
+:class:`AsyncRenderer` renders in a pool of threads, each with its own
+pooled Markdown instance, or in a pool of processes, each with its own
+Markdown instance. At most ``max_pending`` documents are queued or being
+rendered at a time: further calls wait for a slot, which slows producers
+down instead of letting the queue grow without bounds.
+
+Typical usage
+-------------
+
+.. testcode::
+
+   import asyncio
+   from mdx_gfm import aio
+
+   async def main():
+       print(await aio.render("Some ~~good~~ text", timeout=5))
+       print(await aio.render("Some ~~good~~ text", profile="partial"))
+
+   asyncio.run(main())
+
+.. testoutput::
+
+   <p>Some <del>good</del> text</p>
+   <p>Some <del>good</del> text</p>
+
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+import weakref
+
+import mdx_gfm
+import mdx_partial_gfm
+from mdx_partial_gfm import batch
+
+#: Renderer pools by profile name.
+PROFILES = {
+    "gfm": mdx_gfm.RendererPool,
+    "partial": mdx_partial_gfm.RendererPool,
+}
+
+
+class AsyncRenderer:
+    """
+    Renders documents with the ``profile`` extension in an executor.
+
+    :param profile: ``"gfm"`` for :class:`mdx_gfm.GithubFlavoredMarkdownExtension`
+                    or ``"partial"`` for
+                    :class:`mdx_partial_gfm.PartialGithubFlavoredMarkdownExtension`.
+    :param workers: the number of threads or processes.
+    :param max_pending: the maximum number of documents queued or being
+                        rendered at once, per event loop.
+    :param processes: render in processes rather than threads.
+    :param config: configuration of the extension.
+    """
+
+    def __init__(
+        self, profile="gfm", workers=4, max_pending=64, processes=False, **config
+    ):
+        try:
+            pool_class = PROFILES[profile]
+        except KeyError:
+            raise ValueError("Unknown profile: %r" % profile) from None
+        self.max_pending = max_pending
+        if processes:
+            self._pool = None
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                workers,
+                initializer=batch._init_worker,
+                initargs=(pool_class.extension_class, config),
+            )
+        else:
+            self._pool = pool_class(size=workers, prebuild=False, **config)
+            self._executor = concurrent.futures.ThreadPoolExecutor(workers)
+        self._slots = weakref.WeakKeyDictionary()
+
+    def _submit(self, text):
+        if self._pool is None:
+            return self._executor.submit(batch._render_worker, text)
+        return self._executor.submit(self._pool.render, text)
+
+    async def _render(self, text):
+        loop = asyncio.get_running_loop()
+        slots = self._slots.get(loop)
+        if slots is None:
+            slots = self._slots[loop] = asyncio.Semaphore(self.max_pending)
+        await slots.acquire()
+        try:
+            future = self._submit(text)
+        except BaseException:
+            slots.release()
+            raise
+        # The slot is only free once the executor is done with the document,
+        # even if the caller was cancelled or timed out in the meantime.
+        future.add_done_callback(lambda _: _release(loop, slots))
+        # Cancelling the wrapper cancels the document if it has not started.
+        return await asyncio.wrap_future(future)
+
+    async def render(self, text, timeout=None):
+        """
+        Returns the HTML for ``text``. Raises :class:`asyncio.TimeoutError`
+        if waiting for a slot and rendering take more than ``timeout``
+        seconds.
+        """
+        return await asyncio.wait_for(self._render(text), timeout)
+
+    def close(self):
+        """
+        Shuts the executor down, without waiting for pending documents.
+        """
+        self._executor.shutdown(wait=False)
+
+
+def _release(loop, slots):
+    try:
+        loop.call_soon_threadsafe(slots.release)
+    except RuntimeError:
+        # The event loop was closed.
+        pass
+
+
+_renderers = {}
+_renderers_lock = threading.Lock()
+
+
+async def render(text, profile="gfm", timeout=None):
+    """
+    Returns the HTML for ``text`` with a default :class:`AsyncRenderer` for
+    ``profile``, created on first use.
+    """
+    with _renderers_lock:
+        renderer = _renderers.get(profile)
+        if renderer is None:
+            renderer = _renderers[profile] = AsyncRenderer(profile)
+    return await renderer.render(text, timeout)
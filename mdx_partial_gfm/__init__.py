@@ -25,9 +25,27 @@ please use :class:`mdx_gfm.GithubFlavoredMarkdownExtension`.
 """
 
 from markdown.extensions import Extension
-from markdown.extensions.tables import TableExtension
 
 import gfm
+from mdx_partial_gfm import batch
+from mdx_partial_gfm import compiled
+from mdx_partial_gfm import incremental
+from mdx_partial_gfm import pool
+from mdx_partial_gfm import stream
+from mdx_partial_gfm.batch import RenderError
+from mdx_partial_gfm.cache import RenderCache
+
+__all__ = [
+    "CompiledProfile",
+    "IncrementalRenderer",
+    "PartialGithubFlavoredMarkdownExtension",
+    "RenderCache",
+    "RenderError",
+    "RendererPool",
+    "makeExtension",
+    "render_many",
+    "render_stream",
+]
 
 
 def makeExtension(**kwargs):
@@ -54,14 +72,97 @@ class PartialGithubFlavoredMarkdownExtension(Extension):
     .. _GFM documentation: https://guides.github.com/features/mastering-markdown/
     """
 
+    def __init__(self, **kwargs):
+        self.config = {
+            "fused_inline": [
+                False,
+                "Find URLs, email addresses and strike-through text in a "
+                "single inline pass - Default: False",
+            ],
+            "profile": [
+                False,
+                "Record the time spent in each stage of the rendering of each "
+                "document in md.profile - Default: False",
+            ],
+            "profile_callback": [
+                [],
+                "A callable, or list of callables, called with md.profile "
+                "after each document; implies profile - Default: []",
+            ],
+        }
+        super().__init__(**kwargs)
+
     def extendMarkdown(self, md):
         # Built-in extensions
+        from markdown.extensions.tables import TableExtension
+
         TableExtension().extendMarkdown(md)
 
         # Custom extensions
-        gfm.AutolinkExtension().extendMarkdown(md)
-        gfm.AutomailExtension().extendMarkdown(md)
+        if self.getConfig("fused_inline"):
+            gfm.FusedInlineExtension().extendMarkdown(md)
+        else:
+            gfm.AutolinkExtension().extendMarkdown(md)
+            gfm.AutomailExtension().extendMarkdown(md)
+            gfm.StrikethroughExtension().extendMarkdown(md)
         gfm.SemiSaneListExtension().extendMarkdown(md)
-        gfm.StandaloneFencedCodeExtension().extendMarkdown(md)
-        gfm.StrikethroughExtension().extendMarkdown(md)
+        gfm.LazyFencedCodeExtension().extendMarkdown(md)
         gfm.TaskListExtension().extendMarkdown(md)
+
+        callback = self.getConfig("profile_callback")
+        if self.getConfig("profile") or callback:
+            gfm.ProfilingExtension(callback=callback).extendMarkdown(md)
+
+
+class RendererPool(pool.RendererPool):
+    """
+    A pool of :class:`markdown.Markdown` instances configured with
+    :class:`PartialGithubFlavoredMarkdownExtension`. See
+    :class:`mdx_partial_gfm.pool.RendererPool`.
+    """
+
+    extension_class = PartialGithubFlavoredMarkdownExtension
+
+
+class CompiledProfile(compiled.CompiledProfile):
+    """
+    Builds :class:`markdown.Markdown` instances configured with
+    :class:`PartialGithubFlavoredMarkdownExtension` by copying a template
+    instance. See :class:`mdx_partial_gfm.compiled.CompiledProfile`.
+    """
+
+    extension_class = PartialGithubFlavoredMarkdownExtension
+
+
+class IncrementalRenderer(incremental.IncrementalRenderer):
+    """
+    Renders successive versions of a document with
+    :class:`PartialGithubFlavoredMarkdownExtension`, re-rendering only the blocks that
+    changed. See :class:`mdx_partial_gfm.incremental.IncrementalRenderer`.
+    """
+
+    extension_class = PartialGithubFlavoredMarkdownExtension
+
+
+def render_many(documents, workers=None, chunksize=64, **config):
+    """
+    Renders ``documents`` with :class:`PartialGithubFlavoredMarkdownExtension`
+    over ``workers`` processes, and yields their HTML in order, or a
+    :class:`~mdx_partial_gfm.batch.RenderError` for documents that failed.
+    See :func:`mdx_partial_gfm.batch.render_many`.
+    """
+    return batch.render_many(
+        documents, PartialGithubFlavoredMarkdownExtension, workers, chunksize, **config
+    )
+
+
+def render_stream(file_like, buffer_size=16384, **config):
+    """
+    Renders the document read from ``file_like`` with
+    :class:`PartialGithubFlavoredMarkdownExtension`, and yields the HTML of its
+    top-level blocks as they are complete. See
+    :func:`mdx_partial_gfm.stream.render_stream`.
+    """
+    return stream.render_stream(
+        file_like, PartialGithubFlavoredMarkdownExtension, buffer_size, **config
+    )
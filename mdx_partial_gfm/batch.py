@@ -0,0 +1,143 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+"""
+:mod:`mdx_partial_gfm.batch` -- Batch rendering in a process pool
+=================================================================
+
+:func:`render_many` renders a possibly very long iterable of documents over a
+pool of worker processes. Each worker builds its Markdown instance once, and
+documents are sent to the workers in chunks, with a bounded number of chunks
+in flight, so that the iterable is consumed lazily.
+
+Use :func:`mdx_gfm.render_many` or :func:`mdx_partial_gfm.render_many`
+rather than this module.
+
+Typical usage
+-------------
+
+.. testcode::
+
+   from mdx_gfm import render_many
+
+   for html in render_many(["~~foo~~", "http://bar.com"], workers=2):
+       print(html)
+
+.. testoutput::
+
+   <p><del>foo</del></p>
+   <p><a href="http://bar.com">http://bar.com</a></p>
+
+"""
+
+import collections
+import concurrent.futures
+import itertools
+import os
+import traceback
+
+import markdown
+
+
+class RenderError(Exception):
+    """
+    Stands for a document that failed to render in :func:`render_many`.
+
+    :param index: the position of the document in the batch.
+    :param error: the ``repr`` of the original exception.
+    :param details: its formatted traceback.
+    """
+
+    def __init__(self, index, error, details):
+        super().__init__(index, error, details)
+        self.index = index
+        self.error = error
+        self.details = details
+
+    def __str__(self):
+        return "Document %d failed to render: %s" % (self.index, self.error)
+
+
+def _build(extension_class, config):
+    return markdown.Markdown(extensions=[extension_class(**config)])
+
+
+def _render_chunk(md, start, documents):
+    results = []
+    for index, text in enumerate(documents, start):
+        try:
+            results.append(md.convert(text))
+        except Exception as e:
+            results.append(RenderError(index, repr(e), traceback.format_exc()))
+        finally:
+            md.reset()
+    return results
+
+
+# The Markdown instance of a worker process.
+_worker_md = None
+
+
+def _init_worker(extension_class, config):
+    global _worker_md
+    _worker_md = _build(extension_class, config)
+
+
+def _render_worker_chunk(start, documents):
+    return _render_chunk(_worker_md, start, documents)
+
+
+def _render_worker(text):
+    try:
+        return _worker_md.convert(text)
+    finally:
+        _worker_md.reset()
+
+
+def _chunks(documents, chunksize):
+    iterator = iter(documents)
+    start = 0
+    while True:
+        chunk = list(itertools.islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+def render_many(documents, extension_class, workers=None, chunksize=64, **config):
+    """
+    Renders ``documents`` with ``extension_class(**config)`` and yields their
+    HTML in order. A document that fails to render yields a
+    :class:`RenderError` instead of stopping the batch.
+
+    :param workers: the number of worker processes, ``os.cpu_count()`` if
+                    ``None``. With a single worker, documents are rendered in
+                    the current process.
+    :param chunksize: the number of documents sent to a worker at once.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        md = _build(extension_class, config)
+        for start, chunk in _chunks(documents, chunksize):
+            yield from _render_chunk(md, start, chunk)
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(
+        workers, initializer=_init_worker, initargs=(extension_class, config)
+    ) as executor:
+        pending = collections.deque()
+        try:
+            for start, chunk in _chunks(documents, chunksize):
+                pending.append(executor.submit(_render_worker_chunk, start, chunk))
+                # Keep every worker busy, but do not read the whole iterable.
+                if len(pending) >= 2 * workers:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            # Do not render the rest if the caller stopped early.
+            for future in pending:
+                future.cancel()
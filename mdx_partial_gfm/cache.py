@@ -0,0 +1,197 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+"""
+:mod:`mdx_partial_gfm.cache` -- Content-addressed render cache
+==============================================================
+
+A :class:`RenderCache` renders documents with a
+:class:`~mdx_partial_gfm.pool.RendererPool` and remembers the HTML. Entries
+are keyed by a hash of the source and of a fingerprint of the configuration
+of every extension in use, so that pools configured differently never share
+entries, even through the same on-disk directory.
+
+The in-memory tier is a least-recently-used cache bounded both by entry count
+and by the total size of the HTML it holds. An optional on-disk tier keeps
+one file per entry and survives restarts.
+
+Extension configurations that hold a callable, such as
+``TaskListExtension(item_attrs=function)``, cannot be fingerprinted: caching
+is then disabled, unless an explicit ``cache_key`` identifying the
+configuration is passed.
+
+Typical usage
+-------------
+
+.. testcode::
+
+   from mdx_gfm import RenderCache, RendererPool
+
+   cache = RenderCache(RendererPool(size=2), max_entries=100)
+
+   for _ in range(3):
+       html = cache.render("Some ~~good~~ *marvelous* text")
+
+   print(html)
+   print(cache.stats())
+
+.. testoutput::
+
+   <p>Some <del>good</del> <em>marvelous</em> text</p>
+   {'hits': 2, 'misses': 1, 'disk_hits': 0, 'evictions': 0, 'entries': 1, 'bytes': 51}
+
+"""
+
+import hashlib
+import json
+
+import markdown
+
+from gfm import lru
+
+
+class UncacheableConfig(Exception):
+    """
+    Raised by :func:`config_fingerprint` for configurations that have no
+    stable representation.
+    """
+
+
+def _stable(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_stable(v) for v in value]
+    if isinstance(value, dict):
+        return sorted([str(k), _stable(v)] for k, v in value.items())
+    raise UncacheableConfig("Cannot fingerprint %r" % (value,))
+
+
+def _describe(extension):
+    if isinstance(extension, str):
+        return extension
+    cls = type(extension)
+    return [cls.__module__ + "." + cls.__qualname__, _stable(extension.getConfigs())]
+
+
+def _version():
+    # The version of py-gfm, or None if it was not installed, as when it is
+    # used from a checkout.
+    import importlib.metadata
+
+    try:
+        return importlib.metadata.version("py-gfm")
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def config_fingerprint(pool):
+    """
+    Returns a hex digest identifying the output of the instances of ``pool``
+    for a given source: the versions of py-gfm, Markdown and Pygments, the
+    configuration of the pool's GFM extension, its additional extensions and
+    every extension the instances registered.
+
+    Raises :class:`UncacheableConfig` if a configuration value is neither a
+    string, a number, ``None``, nor a list, tuple or dict thereof.
+    """
+    try:
+        import pygments
+
+        pygments_version = pygments.__version__
+    except ImportError:
+        pygments_version = None
+
+    extension_class = pool.extension_class
+    with pool.acquire() as md:
+        registered = [_describe(e) for e in md.registeredExtensions]
+        output_format = md.output_format
+    description = [
+        _version(),
+        markdown.__version__,
+        pygments_version,
+        extension_class.__module__ + "." + extension_class.__qualname__,
+        _stable(pool.config),
+        [_describe(e) for e in pool.extensions],
+        registered,
+        output_format,
+    ]
+    return hashlib.sha256(json.dumps(description).encode("utf-8")).hexdigest()
+
+
+class RenderCache:
+    """
+    Renders documents with ``pool`` and caches the resulting HTML in a
+    :class:`gfm.lru.BoundedCache`.
+
+    :param pool: a :class:`mdx_gfm.RendererPool` or
+                 :class:`mdx_partial_gfm.RendererPool`.
+    :param max_entries: the maximum number of entries kept in memory.
+    :param max_bytes: the maximum total size, in bytes of UTF-8, of the HTML
+                      kept in memory.
+    :param directory: a directory for the on-disk tier, or ``None``.
+    :param cache_key: a string identifying the configuration of ``pool``,
+                      used instead of :func:`config_fingerprint`.
+    """
+
+    def __init__(
+        self,
+        pool,
+        max_entries=1024,
+        max_bytes=32 * 1024 * 1024,
+        directory=None,
+        cache_key=None,
+    ):
+        self.pool = pool
+        self.store = lru.BoundedCache(max_entries, max_bytes, directory)
+        if cache_key is None:
+            try:
+                cache_key = config_fingerprint(pool)
+            except UncacheableConfig:
+                pass
+        #: The configuration fingerprint, or ``None`` if caching is disabled.
+        self.fingerprint = cache_key
+
+    @property
+    def enabled(self):
+        """
+        Whether documents are cached at all.
+        """
+        return self.fingerprint is not None
+
+    def key(self, text):
+        """
+        Returns the cache key of ``text``.
+        """
+        digest = hashlib.sha256(self.fingerprint.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def render(self, text):
+        """
+        Returns the HTML for ``text``, from the cache if possible.
+        """
+        if not self.enabled:
+            return self.pool.render(text)
+
+        key = self.key(text)
+        html = self.store.get(key)
+        if html is None:
+            html = self.pool.render(text)
+            self.store.put(key, html)
+        return html
+
+    def clear(self):
+        """
+        Empties the in-memory tier. The on-disk tier is left untouched.
+        """
+        self.store.clear()
+
+    def stats(self):
+        """
+        Returns the statistics of the underlying store, see
+        :meth:`gfm.lru.BoundedCache.stats`.
+        """
+        return self.store.stats()
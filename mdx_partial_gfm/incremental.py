@@ -0,0 +1,268 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+"""
+:mod:`mdx_partial_gfm.incremental` -- Incremental rendering
+===========================================================
+
+An :class:`IncrementalRenderer` renders successive versions of a document,
+as typed in an editor, and only re-renders the top-level blocks that changed
+since the previous version.
+
+The source is split into blocks at blank lines, the way the block parser
+does, but conservatively: a chunk is merged with the previous one whenever
+the block parser could attach it to it, that is when it is indented or
+starts with a reference definition, when it starts a list item and the
+previous chunk has list items, or when it starts a quote and the previous
+chunk has quotes. Fenced code blocks are never
+split, and raw HTML, or a fenced code block with ``{attributes}``, makes
+everything from that point on a single block. Rendering each block on its
+own then gives the same HTML as rendering the whole document.
+
+Reference-style links are the only whole-document state of the GFM
+extensions: the definitions of the whole document are collected first, and
+the blocks that may use them are re-rendered when they change.
+
+Use :class:`mdx_gfm.IncrementalRenderer` or
+:class:`mdx_partial_gfm.IncrementalRenderer` rather than this base class.
+
+Typical usage
+-------------
+
+.. testcode::
+
+   from mdx_gfm import IncrementalRenderer
+
+   renderer = IncrementalRenderer()
+   renderer.render("# Title\\n\\nSome text.\\n\\n- [ ] todo")
+   print(renderer.render("# Title\\n\\nSome ~~good~~ text.\\n\\n- [ ] todo"))
+   print(renderer.rendered, renderer.reused)
+
+.. testoutput::
+
+   <h1>Title</h1>
+   <p>Some <del>good</del> text.</p>
+   <ul>
+   <li><input disabled="disabled" type="checkbox" /> todo</li>
+   </ul>
+   1 2
+
+"""
+
+import bisect
+import hashlib
+import re
+
+import markdown
+
+_LIST_ITEM_RE = re.compile(r"^[ ]{0,3}(?:[*+-]|\d+[.)])(?:[ ]|$)", re.MULTILINE)
+_QUOTE_RE = re.compile(r"^[ ]{0,3}>", re.MULTILINE)
+_HTML_RE = re.compile(r"^[ ]*<", re.MULTILINE)
+_REFERENCE_RE = re.compile(r"^[ ]{0,3}\[")
+_FENCE_RE = re.compile(r"^(?:~{3,}|`{3,})", re.MULTILINE)
+
+# Appended to each block, see _convert_block.
+_SENTINEL = "GfmIncrementalEnd"
+_SENTINEL_HTML = "<p>%s</p>" % _SENTINEL
+
+
+def normalize(source, tab_length=4):
+    """
+    Normalizes ``source`` the way Markdown does before parsing it.
+    """
+    source = source.replace(markdown.util.STX, "").replace(markdown.util.ETX, "")
+    source = source.replace("\r\n", "\n").replace("\r", "\n")
+    source = source.expandtabs(tab_length)
+    return re.sub(r"(?<=\n) +\n", "\n", source)
+
+
+def _attaches(previous, chunk):
+    # Whether the block parser could attach chunk to the previous one.
+    # Reference definitions are removed from the document, and the previous
+    # block may go on after them.
+    if chunk.startswith(" ") or _REFERENCE_RE.match(chunk):
+        return True
+    if _LIST_ITEM_RE.match(chunk):
+        return _LIST_ITEM_RE.search(previous) is not None
+    if _QUOTE_RE.match(chunk):
+        return _QUOTE_RE.search(previous) is not None
+    return False
+
+
+def split_blocks(text):
+    """
+    Splits normalized ``text`` into chunks that render independently, as
+    described above.
+    """
+    return [chunk for _, chunk in _blocks(text)[0]]
+
+
+def _blocks(text):
+    # Returns the chunks of text with the index of their first line, whether
+    # the last chunk is the tail of the document, and the index of the first
+    # line that would open a fenced code block if a closing fence followed.
+    lines = text.split("\n")
+    offsets = [0]
+    for line in lines:
+        offsets.append(offsets[-1] + len(line) + 1)
+
+    def line_of(pos):
+        return bisect.bisect_right(offsets, pos) - 1
+
+    # Fenced code blocks are extracted before anything else, so their lines
+    # are never split, and raw HTML inside them does not count. The fenced_code
+    # extension imports Pygments, so it is only imported for documents that
+    # may have fences.
+    fenced = set()
+    tail = len(lines)
+    if _FENCE_RE.search(text):
+        from markdown.extensions.fenced_code import FencedBlockPreprocessor
+
+        index = 0
+        while True:
+            m = FencedBlockPreprocessor.FENCED_BLOCK_RE.search(text, index)
+            if not m:
+                break
+            if m.group("attrs"):
+                tail = line_of(m.start())
+                break
+            fenced.update(range(line_of(m.start()), line_of(m.end()) + 1))
+            index = m.end()
+    for m in _HTML_RE.finditer(text):
+        line = line_of(m.start())
+        if line not in fenced:
+            tail = min(tail, line)
+            break
+    open_fence = None
+    for m in _FENCE_RE.finditer(
+        text, 0, offsets[tail] if tail < len(lines) else len(text)
+    ):
+        line = line_of(m.start())
+        if line not in fenced:
+            open_fence = line
+            break
+
+    ranges = []
+    start = None
+    for i in range(tail):
+        if lines[i]:
+            if start is None:
+                start = i
+        elif start is not None and i not in fenced:
+            ranges.append((start, i))
+            start = None
+    if start is not None or tail < len(lines):
+        ranges.append((tail if start is None else start, len(lines)))
+
+    chunks = []
+    for start, end in ranges:
+        chunk = "\n".join(lines[start:end])
+        if chunks and _attaches(chunks[-1][1], chunk):
+            start = chunks.pop()[0]
+            chunk = "\n".join(lines[start:end])
+        chunks.append((start, chunk))
+    return chunks, tail < len(lines), open_fence
+
+
+def _convert(md, chunk, references=None):
+    md.reset()
+    if references:
+        md.references.update(references)
+    return md.convert(chunk)
+
+
+def _convert_block(md, chunk, references=None):
+    # Keeps the whitespace that follows the block in a full render.
+    html = _convert(md, chunk + "\n\n" + _SENTINEL, references)
+    if html.endswith(_SENTINEL_HTML):
+        return html[: -len(_SENTINEL_HTML)]
+    # Only the last block can have raw HTML that swallows the sentinel,
+    # and trailing whitespace does not matter there.
+    return _convert(md, chunk, references)
+
+
+def _digest(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class IncrementalRenderer:
+    """
+    Renders successive versions of a document with :attr:`extension_class`,
+    re-rendering only the blocks that changed. Not thread-safe.
+
+    :param config: configuration of :attr:`extension_class`.
+    """
+
+    #: The GFM extension class documents are rendered with.
+    extension_class = None
+
+    def __init__(self, **config):
+        self.md = markdown.Markdown(extensions=[self.extension_class(**config)])
+        #: The number of blocks rendered by the last :meth:`render`.
+        self.rendered = 0
+        #: The number of blocks reused by the last :meth:`render`.
+        self.reused = 0
+        self._html = {}
+        self._references = {}
+
+    def _chunk_references(self, chunk, digest, cache):
+        references = self._references.get(digest)
+        if references is None:
+            _convert(self.md, chunk)
+            references = dict(self.md.references)
+        cache[digest] = references
+        return references
+
+    def render(self, text):
+        """
+        Returns the HTML for ``text``, the same as a full render.
+        """
+        if not text.strip():
+            self.rendered = self.reused = 0
+            return ""
+        chunks = split_blocks(normalize(text, self.md.tab_length))
+        digests = [_digest(chunk) for chunk in chunks]
+
+        references = {}
+        reference_cache = {}
+        for chunk, digest in zip(chunks, digests):
+            if "]:" not in chunk:
+                continue
+            for id, reference in self._chunk_references(
+                chunk, digest, reference_cache
+            ).items():
+                if references.setdefault(id, reference) != reference:
+                    # The definition in effect would differ from block to
+                    # block.
+                    return self._render_all(text)
+        self._references = reference_cache
+        fingerprint = _digest(*(repr(item) for item in sorted(references.items())))
+
+        html_cache = {}
+        parts = []
+        self.rendered = self.reused = 0
+        for chunk, digest in zip(chunks, digests):
+            # Only blocks with brackets can use reference definitions.
+            key = _digest(digest, fingerprint) if "[" in chunk else digest
+            html = self._html.get(key)
+            if html is None:
+                html = _convert_block(self.md, chunk, references)
+                self.rendered += 1
+            else:
+                self.reused += 1
+            html_cache[key] = html
+            parts.append(html)
+        self._html = html_cache
+        return "".join(parts).strip()
+
+    def _render_all(self, text):
+        self._html = {}
+        self._references = {}
+        self.rendered = 1
+        self.reused = 0
+        return _convert(self.md, text)
@@ -0,0 +1,138 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+"""
+:mod:`mdx_partial_gfm.pool` -- Pool of ready-to-use Markdown instances
+======================================================================
+
+Building a :class:`markdown.Markdown` instance with the GFM extensions
+registers tables, all the gfm extensions and their processors, which is a
+noticeable cost when done for every document. A renderer pool builds a few
+configured instances up front and hands them out one at a time.
+
+Use :class:`mdx_gfm.RendererPool` or :class:`mdx_partial_gfm.RendererPool`
+rather than this base class.
+
+Typical usage
+-------------
+
+.. testcode::
+
+   from mdx_gfm import RendererPool
+
+   pool = RendererPool(size=2)
+
+   print(pool.render("Some ~~good~~ *marvelous* text"))
+
+   with pool.acquire() as md:
+       print(md.convert("- [x] done"))
+
+.. testoutput::
+
+   <p>Some <del>good</del> <em>marvelous</em> text</p>
+   <ul>
+   <li><input checked="checked" disabled="disabled" type="checkbox" /> done</li>
+   </ul>
+
+"""
+
+import contextlib
+import threading
+
+import markdown
+
+
+class RendererPool:
+    """
+    A bounded pool of :class:`markdown.Markdown` instances configured with
+    :attr:`extension_class`.
+
+    An instance is only ever used by one thread or task at a time: it is
+    checked out by :meth:`acquire`, and :meth:`~markdown.Markdown.reset` is
+    called on it before it goes back to the pool, so no state leaks from one
+    document to the next. An instance whose reset raises is dropped instead.
+    The most recently released instance is handed out first.
+
+    :param size: the maximum number of instances.
+    :param prebuild: build all instances up front rather than on demand.
+    :param extensions: additional extensions for every instance.
+    :param config: configuration of :attr:`extension_class`.
+    """
+
+    #: The GFM extension class instances are configured with.
+    extension_class = None
+
+    def __init__(self, size=4, prebuild=True, extensions=(), **config):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.size = size
+        self.extensions = list(extensions)
+        self.config = config
+        self._free = []
+        self._created = 0
+        self._cond = threading.Condition()
+        if prebuild:
+            for _ in range(size):
+                self._free.append(self.build())
+            self._created = size
+
+    def build(self):
+        """
+        Returns a new configured :class:`markdown.Markdown` instance.
+        """
+        return markdown.Markdown(
+            extensions=[self.extension_class(**self.config)] + self.extensions
+        )
+
+    def _checkout(self, timeout):
+        with self._cond:
+            if not self._cond.wait_for(
+                lambda: self._free or self._created < self.size, timeout
+            ):
+                raise TimeoutError("No Markdown instance available")
+            if self._free:
+                return self._free.pop()
+            self._created += 1
+        try:
+            return self.build()
+        except BaseException:
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            raise
+
+    def _checkin(self, md):
+        reset = False
+        try:
+            md.reset()
+            reset = True
+        finally:
+            with self._cond:
+                if reset:
+                    self._free.append(md)
+                else:
+                    # The instance may be half reset: it is dropped, and a
+                    # new one is built when needed.
+                    self._created -= 1
+                self._cond.notify()
+
+    @contextlib.contextmanager
+    def acquire(self, timeout=None):
+        """
+        Context manager that checks out an instance for the duration of the
+        ``with`` block. Blocks until one is available, or raises
+        :class:`TimeoutError` after ``timeout`` seconds.
+        """
+        md = self._checkout(timeout)
+        try:
+            yield md
+        finally:
+            self._checkin(md)
+
+    def render(self, text, timeout=None):
+        """
+        Converts ``text`` to HTML with a pooled instance.
+        """
+        with self.acquire(timeout) as md:
+            return md.convert(text)
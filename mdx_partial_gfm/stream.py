@@ -0,0 +1,182 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+"""
+:mod:`mdx_partial_gfm.stream` -- Streaming rendering
+====================================================
+
+:func:`render_stream` renders a document read from a file, and yields the
+HTML of its top-level blocks as soon as they are complete, so that very
+large documents never need to be held in memory in full, as source, element
+tree or HTML.
+
+The document is split into blocks the same way as in
+:mod:`mdx_partial_gfm.incremental`, and only the lines of the blocks that
+are not complete yet, or not rendered yet, are kept in memory, so that memory
+use is bounded by the largest block or by ``buffer_size``. Note that raw HTML, or a fenced code block with
+``{attributes}``, makes everything from that point on a single block.
+
+Reference-style links may be used before they are defined: if the file is
+seekable, it is read twice, and the definitions of the whole document are
+collected in the first pass. Otherwise, links may not see the definitions
+that come after them.
+
+Use :func:`mdx_gfm.render_stream` or :func:`mdx_partial_gfm.render_stream`
+rather than this module.
+
+Typical usage
+-------------
+
+.. testcode::
+
+   import io
+   from mdx_gfm import render_stream
+
+   source = io.StringIO("# Title\\n\\nSome ~~good~~ [text].\\n\\n[text]: http://foo.com")
+   for html in render_stream(source):
+       print(html)
+
+.. testoutput::
+
+   <h1>Title</h1>
+   <p>Some <del>good</del> <a href="http://foo.com">text</a>.</p>
+
+"""
+
+import markdown
+
+from mdx_partial_gfm import incremental
+
+
+class _Definitions(dict):
+    # The reference definitions of the whole document, which its blocks do
+    # not override when they are rendered.
+
+    def __setitem__(self, key, value):
+        self.setdefault(key, value)
+
+
+def _lines(file_like, tab_length):
+    # Markdown renders nothing for a blank document, so the leading blank
+    # lines are only yielded with the first line that is not.
+    leading = []
+    first = True
+    for data in file_like:
+        lines = incremental.normalize(data, tab_length).split("\n")
+        if not lines[-1]:
+            lines.pop()
+        for line in lines:
+            # Lines with nothing but spaces are blank, except the first one.
+            if not first and not line.strip(" "):
+                line = ""
+            first = False
+            if leading is None:
+                yield line
+            elif line.strip():
+                yield from leading
+                yield line
+                leading = None
+            else:
+                leading.append(line)
+
+
+def _may_attach(line):
+    return (
+        line.startswith(" ")
+        or incremental._REFERENCE_RE.match(line)
+        or incremental._LIST_ITEM_RE.match(line)
+        or incremental._QUOTE_RE.match(line)
+    ) is not None
+
+
+def _stream_blocks(file_like, tab_length):
+    # Yields the chunks of incremental.split_blocks as soon as they are
+    # complete, that is once the first line of the next chunk is known and
+    # does not attach to them, and they do not have the opening line of a
+    # fenced code block that could still be closed.
+    lines = []
+    tail = False
+    open_fence = False
+    for line in _lines(file_like, tab_length):
+        if tail or not line:
+            lines.append(line)
+            continue
+        if open_fence:
+            check = incremental._FENCE_RE.match(line) is not None
+        else:
+            # Lines that may attach to the previous chunk cannot complete
+            # it, and would only make long lists quadratic.
+            check = bool(lines) and not lines[-1] and not _may_attach(line)
+        lines.append(line)
+        if not check:
+            continue
+        chunks, tail, fence = incremental._blocks("\n".join(lines))
+        done = len(chunks) - 1
+        if fence is not None:
+            while done and chunks[done][0] > fence:
+                done -= 1
+        for _, chunk in chunks[:done]:
+            yield chunk
+        if done:
+            del lines[: chunks[done][0]]
+        tail = tail and len(chunks) - done == 1
+        open_fence = fence is not None
+    for _, chunk in incremental._blocks("\n".join(lines))[0]:
+        yield chunk
+
+
+def _batches(chunks, buffer_size):
+    batch = []
+    size = 0
+    for chunk in chunks:
+        batch.append(chunk)
+        size += len(chunk)
+        if size >= buffer_size:
+            yield "\n\n".join(batch)
+            batch = []
+            size = 0
+    if batch:
+        yield "\n\n".join(batch)
+
+
+def render_stream(file_like, extension_class, buffer_size=16384, **config):
+    """
+    Renders the document read from ``file_like`` with
+    ``extension_class(**config)``, and yields the HTML of its top-level
+    blocks, which join into the HTML of the whole document.
+
+    :param file_like: a text file or any iterable of lines. If it is a
+                      seekable file, it is read twice, from its current
+                      position.
+    :param buffer_size: complete blocks are rendered together until they
+                        total this many characters, which saves the cost of
+                        a conversion per block.
+    """
+    md = markdown.Markdown(extensions=[extension_class(**config)])
+    seekable = getattr(file_like, "seekable", None)
+    if seekable is not None and seekable():
+        start = file_like.tell()
+        references = _Definitions()
+        for chunk in _stream_blocks(file_like, md.tab_length):
+            if "]:" in chunk:
+                incremental._convert(md, chunk)
+                references.update(md.references)
+        file_like.seek(start)
+        md.references = _Definitions()
+    else:
+        references = {}
+
+    separator = None
+    for chunk in _batches(_stream_blocks(file_like, md.tab_length), buffer_size):
+        html = incremental._convert_block(md, chunk, references)
+        if "]:" in chunk and not isinstance(references, _Definitions):
+            references.update(md.references)
+        if separator is None:
+            html = html.lstrip()
+        stripped = html.rstrip()
+        if stripped:
+            yield (separator or "") + stripped
+            separator = html[len(stripped) :]
+        elif separator is not None:
+            separator += html
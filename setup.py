@@ -13,7 +13,7 @@ setup(
     author="Dart Team, Alexandre Macabies",
     author_email="web+oss@zopieux.com",
     url="https://github.com/zopieux/py-gfm",
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
     include_package_data=True,
     install_requires=["markdown>=3.3,<4"],
     python_requires=">=3.8",
@@ -0,0 +1,113 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+import asyncio
+import concurrent.futures
+
+import markdown
+
+from mdx_gfm import aio
+from test_case import TestCase
+
+SOURCE = "Some ~~good~~ text\nwith http://foo.com in it."
+
+
+class StalledRenderer(aio.AsyncRenderer):
+    """Hands documents to futures that the test completes by hand."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.futures = []
+
+    def _submit(self, text):
+        future = concurrent.futures.Future()
+        self.futures.append(future)
+        return future
+
+
+class TestAsyncRender(TestCase):
+    def test_profiles(self):
+        async def main():
+            return (
+                await aio.render(SOURCE),
+                await aio.render(SOURCE, profile="partial"),
+            )
+
+        self.assertEqual(
+            (
+                markdown.markdown(SOURCE, extensions=["mdx_gfm"]),
+                markdown.markdown(SOURCE, extensions=["mdx_partial_gfm"]),
+            ),
+            asyncio.run(main()),
+        )
+
+    def test_unknown_profile(self):
+        with self.assertRaises(ValueError):
+            aio.AsyncRenderer(profile="foo")
+
+    def test_config(self):
+        renderer = aio.AsyncRenderer(workers=2, fused_inline=True)
+        try:
+            html = asyncio.run(renderer.render(SOURCE))
+        finally:
+            renderer.close()
+        self.assertEqual(markdown.markdown(SOURCE, extensions=["mdx_gfm"]), html)
+
+    def test_processes(self):
+        renderer = aio.AsyncRenderer(profile="partial", workers=1, processes=True)
+        try:
+            html = asyncio.run(renderer.render(SOURCE, timeout=30))
+        finally:
+            renderer.close()
+        self.assertEqual(
+            markdown.markdown(SOURCE, extensions=["mdx_partial_gfm"]), html
+        )
+
+    def test_timeout(self):
+        renderer = StalledRenderer()
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(renderer.render(SOURCE, timeout=0.01))
+        # The document was not started, so it was cancelled.
+        self.assertTrue(renderer.futures[0].cancelled())
+
+    def test_backpressure(self):
+        renderer = StalledRenderer(max_pending=1)
+
+        async def main():
+            first = asyncio.ensure_future(renderer.render("first"))
+            await asyncio.sleep(0)
+            second = asyncio.ensure_future(renderer.render("second"))
+            await asyncio.sleep(0.01)
+            # The second document waits for the first one.
+            self.assertEqual(1, len(renderer.futures))
+            renderer.futures[0].set_result("<p>first</p>")
+            self.assertEqual("<p>first</p>", await first)
+            while len(renderer.futures) < 2:
+                await asyncio.sleep(0)
+            renderer.futures[1].set_result("<p>second</p>")
+            return await second
+
+        self.assertEqual("<p>second</p>", asyncio.run(main()))
+
+    def test_slot_held_until_done(self):
+        renderer = StalledRenderer(max_pending=1)
+
+        async def main():
+            task = asyncio.ensure_future(renderer.render("first"))
+            await asyncio.sleep(0)
+            # Already running documents cannot be cancelled, and keep their
+            # slot until they are done.
+            renderer.futures[0].set_running_or_notify_cancel()
+            task.cancel()
+            with self.assertRaises(asyncio.TimeoutError):
+                await renderer.render("second", timeout=0.01)
+            renderer.futures[0].set_result("<p>first</p>")
+            await asyncio.sleep(0)
+            second = asyncio.ensure_future(renderer.render("second"))
+            while len(renderer.futures) < 2:
+                await asyncio.sleep(0)
+            renderer.futures[1].set_result("<p>second</p>")
+            return await second
+
+        self.assertEqual("<p>second</p>", asyncio.run(main()))
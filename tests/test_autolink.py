@@ -2,7 +2,12 @@
 # for details. All rights reserved. Use of this source code is governed by a
 # BSD-style license that can be found in the LICENSE file.
 
+import re
+
+import markdown
+
 import gfm
+from gfm import autolink
 from test_case import TestCase
 
 
@@ -64,3 +69,81 @@ class TestAutolink(TestCase):
         """,
             [self.autolink],
         )
+
+    def test_autolinks_balanced_parens(self):
+        self.assert_renders(
+            """
+        <p>(see <a href="http://foo.com/bar_(baz)">http://foo.com/bar_(baz)</a>)</p>
+        """,
+            """
+        (see http://foo.com/bar_(baz))
+        """,
+            [self.autolink],
+        )
+
+    def test_doesnt_autolink_trailing_punctuation(self):
+        self.assert_renders(
+            """
+        <p>Go to <a href="http://www.foo.com">www.foo.com</a>, now.</p>
+        """,
+            """
+        Go to www.foo.com, now.
+        """,
+            [self.autolink],
+        )
+
+    def test_doesnt_autolink_punctuation_only(self):
+        self.assert_renders(
+            """
+        <p>http://,.,.,.,.,.,.,.,.,.,.,.,.,.,.,.,.,.,.,.,.,.,.,.,.,.,.,.,.,.,.,.</p>
+        """,
+            """
+        http://,.,.,.,.,.,.,.,.,.,.,.,.,.,.,.,.,.,.,.,.,.,.,.,.,.,.,.,.,.,.,.
+        """,
+            [self.autolink],
+        )
+
+
+class TestAutolinkRegex(TestAutolink):
+    def setUp(self):
+        self.autolink = gfm.AutolinkExtension(engine="regex")
+
+    def test_doesnt_autolink_punctuation_only(self):
+        self.skipTest("Gruber's regex backtracks exponentially on this input")
+
+
+class TestAutolinkScanner(TestCase):
+    def test_scanner_matches_regex(self):
+        url_re = re.compile(autolink.URL_RE)
+        start_re = re.compile(autolink.URL_START_RE)
+        for text in [
+            "http://a",
+            "http://ab",
+            "www.a",
+            "www.ab",
+            "http://(a)",
+            "http://(a)(b)",
+            "http://a.",
+            "http://a(b(c",
+            "http://a((b))c",
+            "http://a(((b)))c",
+            "http://a(b()c)d",
+            "http://a()",
+            "www.x.com).",
+            "ftp://x.com/«foo»",
+            "xhttp://foo.com www2.bar.com",
+            "<http://foo.com>",
+        ]:
+            m = url_re.search(text)
+            expected = m.span(1) if m else None
+            found = None
+            for m in start_re.finditer(text):
+                end = autolink.scan_url(text, m.end())
+                if end is not None:
+                    found = (m.start(), end)
+                    break
+            self.assertEqual(expected, found, text)
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            markdown.markdown("foo", extensions=[gfm.AutolinkExtension(engine="foo")])
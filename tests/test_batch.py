@@ -0,0 +1,57 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+import itertools
+
+import markdown
+
+import mdx_gfm
+import mdx_partial_gfm
+from test_case import TestCase
+
+DOCUMENTS = ["Item %d: ~~x~~\nwww.foo%d.com" % (i, i) for i in range(50)]
+
+
+class TestRenderMany(TestCase):
+    def expected(self, extension):
+        return [markdown.markdown(text, extensions=[extension]) for text in DOCUMENTS]
+
+    def test_in_process(self):
+        self.assertEqual(
+            self.expected("mdx_gfm"),
+            list(mdx_gfm.render_many(DOCUMENTS, workers=1, chunksize=7)),
+        )
+
+    def test_workers(self):
+        self.assertEqual(
+            self.expected("mdx_gfm"),
+            list(mdx_gfm.render_many(iter(DOCUMENTS), workers=2, chunksize=3)),
+        )
+
+    def test_partial_gfm(self):
+        self.assertEqual(
+            self.expected("mdx_partial_gfm"),
+            list(mdx_partial_gfm.render_many(DOCUMENTS, workers=2, chunksize=16)),
+        )
+
+    def test_config(self):
+        self.assertEqual(
+            self.expected("mdx_gfm"),
+            list(mdx_gfm.render_many(DOCUMENTS, workers=2, fused_inline=True)),
+        )
+
+    def test_failures(self):
+        for workers in (1, 2):
+            results = list(mdx_gfm.render_many(["foo", None, "bar"], workers=workers))
+            self.assertEqual("<p>foo</p>", results[0])
+            self.assertIsInstance(results[1], mdx_gfm.RenderError)
+            self.assertEqual(1, results[1].index)
+            self.assertIn("AttributeError", results[1].details)
+            self.assertEqual("<p>bar</p>", results[2])
+
+    def test_lazy(self):
+        documents = itertools.count()
+        results = mdx_gfm.render_many(map(str, documents), workers=1, chunksize=4)
+        self.assertEqual("<p>0</p>", next(results))
+        self.assertEqual(4, next(documents))
@@ -0,0 +1,121 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+import tempfile
+from unittest import mock
+
+import gfm
+import mdx_gfm
+import mdx_partial_gfm
+from mdx_partial_gfm import cache
+from test_case import TestCase
+
+SOURCE = "Some ~~good~~ text\nwith http://foo.com in it."
+
+
+class TestRenderCache(TestCase):
+    def test_hits(self):
+        pool = mdx_gfm.RendererPool(size=1)
+        cache = mdx_gfm.RenderCache(pool)
+        self.assertEqual(pool.render(SOURCE), cache.render(SOURCE))
+        self.assertEqual(pool.render(SOURCE), cache.render(SOURCE))
+        stats = cache.stats()
+        self.assertEqual((1, 1), (stats["hits"], stats["misses"]))
+
+    def test_fingerprint_depends_on_config(self):
+        fingerprints = {
+            mdx_gfm.RenderCache(mdx_gfm.RendererPool(size=1)).fingerprint,
+            mdx_gfm.RenderCache(mdx_partial_gfm.RendererPool(size=1)).fingerprint,
+            mdx_gfm.RenderCache(
+                mdx_gfm.RendererPool(size=1, fused_inline=True)
+            ).fingerprint,
+            mdx_gfm.RenderCache(
+                mdx_gfm.RendererPool(
+                    size=1, extensions=[gfm.TaskListExtension(max_depth=1)]
+                )
+            ).fingerprint,
+        }
+        self.assertEqual(4, len(fingerprints))
+
+    def test_fingerprint_is_stable(self):
+        self.assertEqual(
+            mdx_gfm.RenderCache(mdx_gfm.RendererPool(size=1)).fingerprint,
+            mdx_gfm.RenderCache(mdx_gfm.RendererPool(size=1)).fingerprint,
+        )
+
+    def test_fingerprint_depends_on_version(self):
+        pool = mdx_gfm.RendererPool(size=1)
+        fingerprints = set()
+        for version in ("2.0.0", "2.1.0", None):
+            with mock.patch.object(cache, "_version", return_value=version):
+                fingerprints.add(cache.config_fingerprint(pool))
+        self.assertEqual(3, len(fingerprints))
+
+    def test_callable_config_disables_caching(self):
+        pool = mdx_gfm.RendererPool(
+            size=1,
+            extensions=[gfm.TaskListExtension(item_attrs=lambda item, checked: {})],
+        )
+        cache = mdx_gfm.RenderCache(pool)
+        self.assertFalse(cache.enabled)
+        cache.render(SOURCE)
+        cache.render(SOURCE)
+        self.assertEqual(0, cache.stats()["entries"])
+
+    def test_explicit_cache_key(self):
+        pool = mdx_gfm.RendererPool(
+            size=1,
+            extensions=[gfm.TaskListExtension(item_attrs=lambda item, checked: {})],
+        )
+        cache = mdx_gfm.RenderCache(pool, cache_key="tasks-v1")
+        self.assertTrue(cache.enabled)
+        cache.render(SOURCE)
+        cache.render(SOURCE)
+        self.assertEqual(1, cache.stats()["hits"])
+
+    def test_max_entries(self):
+        cache = mdx_gfm.RenderCache(mdx_gfm.RendererPool(size=1), max_entries=2)
+        for source in ("a", "b", "a", "c"):
+            cache.render(source)
+        stats = cache.stats()
+        self.assertEqual((2, 1), (stats["entries"], stats["evictions"]))
+        # "b" was the least recently used entry.
+        cache.render("a")
+        cache.render("b")
+        stats = cache.stats()
+        self.assertEqual((2, 4), (stats["hits"], stats["misses"]))
+
+    def test_max_bytes(self):
+        cache = mdx_gfm.RenderCache(mdx_gfm.RendererPool(size=1), max_bytes=20)
+        cache.render("a")
+        cache.render("b")
+        self.assertEqual({"entries": 2, "bytes": 16}, self._sizes(cache))
+        cache.render("c")
+        self.assertEqual({"entries": 2, "bytes": 16}, self._sizes(cache))
+        cache.render("long enough to never fit")
+        self.assertEqual({"entries": 2, "bytes": 16}, self._sizes(cache))
+
+    def _sizes(self, cache):
+        stats = cache.stats()
+        return {"entries": stats["entries"], "bytes": stats["bytes"]}
+
+    def test_disk(self):
+        with tempfile.TemporaryDirectory() as directory:
+            pool = mdx_gfm.RendererPool(size=1)
+            cache = mdx_gfm.RenderCache(pool, directory=directory)
+            html = cache.render(SOURCE)
+            cache = mdx_gfm.RenderCache(pool, directory=directory)
+            self.assertEqual(html, cache.render(SOURCE))
+            self.assertEqual(html, cache.render(SOURCE))
+            stats = cache.stats()
+            self.assertEqual(
+                (1, 1, 0), (stats["disk_hits"], stats["hits"], stats["misses"])
+            )
+
+    def test_clear(self):
+        cache = mdx_gfm.RenderCache(mdx_gfm.RendererPool(size=1))
+        cache.render(SOURCE)
+        cache.clear()
+        cache.render(SOURCE)
+        self.assertEqual(2, cache.stats()["misses"])
@@ -0,0 +1,155 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+import collections
+import threading
+
+import markdown
+from markdown.extensions.footnotes import FootnoteExtension
+
+import mdx_gfm
+import mdx_partial_gfm
+from mdx_partial_gfm import compiled
+from test_case import TestCase
+
+SOURCE = """\
+# Title
+
+Some ~~good~~ text
+with http://foo.com and foo@bar.com in it, and a [link][ref].
+
+- [ ] one
+- [x] two
+
+| a | b |
+|---|---|
+| 1 | 2 |
+
+```python
+x = 1
+```
+
+[ref]: http://bar.com
+"""
+
+
+class TestCompiledProfile(TestCase):
+    def test_render_gfm(self):
+        md = mdx_gfm.CompiledProfile().build()
+        self.assertEqual(
+            markdown.markdown(SOURCE, extensions=["mdx_gfm"]), md.convert(SOURCE)
+        )
+
+    def test_render_partial_gfm(self):
+        md = mdx_partial_gfm.CompiledProfile().build()
+        self.assertEqual(
+            markdown.markdown(SOURCE, extensions=["mdx_partial_gfm"]),
+            md.convert(SOURCE),
+        )
+
+    def test_config(self):
+        md = mdx_gfm.CompiledProfile(fused_inline=True).build()
+        self.assertIn("gfm-inline", md.inlinePatterns)
+        self.assertEqual(
+            markdown.markdown(
+                SOURCE,
+                extensions=[mdx_gfm.GithubFlavoredMarkdownExtension(fused_inline=True)],
+            ),
+            md.convert(SOURCE),
+        )
+
+    def test_extensions(self):
+        md = mdx_gfm.CompiledProfile(extensions=["toc"]).build()
+        source = "[TOC]\n\n" + SOURCE
+        self.assertEqual(
+            markdown.markdown(source, extensions=["mdx_gfm", "toc"]), md.convert(source)
+        )
+
+    def test_independent_instances(self):
+        profile = mdx_gfm.CompiledProfile()
+        first = profile.build()
+        second = profile.build()
+        self.assertIsNot(first, second)
+        for md in (first, second):
+            self.assertIs(md, md.parser.md)
+            self.assertIs(md, md.inlinePatterns["gfm-autolink"].md)
+            self.assertIs(md, md.preprocessors["fenced_code_block"].md)
+            self.assertIs(md.inlinePatterns, md.treeprocessors["inline"].inlinePatterns)
+        self.assertIsNot(first.parser, second.parser)
+        self.assertIsNot(first.references, second.references)
+        self.assertIsNot(first.htmlStash, second.htmlStash)
+
+        first.convert("[foo]\n\n[foo]: http://foo.com")
+        self.assertEqual("<p>[foo]</p>", second.convert("[foo]"))
+        self.assertEqual("<p>[foo]</p>", profile.build().convert("[foo]"))
+
+    def test_independent_extension_state(self):
+        # Footnotes are kept in an OrderedDict, abbreviations in a dict
+        # subclass on recent Markdown versions.
+        profile = mdx_gfm.CompiledProfile(extensions=["footnotes", "abbr"])
+        first = profile.build()
+        second = profile.build()
+        footnotes = [
+            ext
+            for md in (first, second)
+            for ext in md.registeredExtensions
+            if isinstance(ext, FootnoteExtension)
+        ]
+        self.assertIsNot(footnotes[0].footnotes, footnotes[1].footnotes)
+        self.assertIs(type(footnotes[0].footnotes), type(footnotes[1].footnotes))
+
+        first.convert("A[^1] HTML\n\n[^1]: Note.\n\n*[HTML]: Markup")
+        expected = markdown.markdown(
+            "B HTML", extensions=["mdx_gfm", "footnotes", "abbr"]
+        )
+        self.assertEqual(expected, second.convert("B HTML"))
+        self.assertEqual(expected, profile.build().convert("B HTML"))
+
+    def test_container_subclasses(self):
+        class Store(dict):
+            pass
+
+        template = markdown.Markdown()
+        template.counts = collections.defaultdict(list)
+        template.store = Store()
+        template.store.owner = template
+        plan = compiled._Plan(template)
+        first = plan.instantiate()
+        second = plan.instantiate()
+        first.counts["a"].append(1)
+        first.store["a"] = 1
+        for md in (second, template):
+            self.assertIs(list, md.counts.default_factory)
+            self.assertEqual({}, md.counts)
+            self.assertIs(Store, type(md.store))
+            self.assertEqual({}, md.store)
+
+    def test_profiling(self):
+        profile = mdx_gfm.CompiledProfile(profile=True)
+        first = profile.build()
+        second = profile.build()
+        first.convert("http://foo.com")
+        second.convert("Some text")
+        self.assertEqual(1, first.profile.stages["inlinepatterns.gfm-autolink"].calls)
+        self.assertEqual(0, second.profile.stages["inlinepatterns.gfm-autolink"].calls)
+
+    def test_threads(self):
+        profile = mdx_gfm.CompiledProfile()
+        sources = [
+            "Item %d: ~~x~~ www.foo%d.com\n\n- [x] %d" % (i, i, i) for i in range(40)
+        ]
+        expected = [markdown.markdown(s, extensions=["mdx_gfm"]) for s in sources]
+        results = [None] * len(sources)
+
+        def work(offset):
+            md = profile.build()
+            for i in range(offset, len(sources), 4):
+                results[i] = md.reset().convert(sources[i])
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(expected, results)
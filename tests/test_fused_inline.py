@@ -0,0 +1,89 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+from unittest import mock
+
+import markdown
+
+import gfm
+from gfm import fused_inline
+import mdx_gfm
+from test_case import TestCase
+
+
+class TestFusedInline(TestCase):
+    def setUp(self):
+        self.fused = gfm.FusedInlineExtension()
+
+    def assert_same_as_separate(self, source):
+        separate = markdown.markdown(
+            source,
+            extensions=[
+                gfm.AutolinkExtension(),
+                gfm.AutomailExtension(),
+                gfm.StrikethroughExtension(),
+            ],
+        )
+        self.assertEqual(
+            separate, markdown.markdown(source, extensions=[self.fused]), source
+        )
+
+    def test_fused_inline(self):
+        self.assert_renders(
+            """
+        <p>See <a href="http://www.foo.com">www.foo.com</a>, <del>mail</del> <a href="mailto:foo@bar.com">foo@bar.com</a>.</p>
+        """,
+            """
+        See www.foo.com, ~~mail~~ foo@bar.com.
+        """,
+            [self.fused],
+        )
+
+    def test_no_trigger(self):
+        self.assert_renders(
+            """
+        <p>Nothing <em>to</em> see here.</p>
+        """,
+            """
+        Nothing *to* see here.
+        """,
+            [self.fused],
+        )
+
+    def test_links_win_over_mails(self):
+        self.assert_same_as_separate("foo@www.bar.com")
+        self.assert_same_as_separate("foo@bar.com.www.x.com")
+        self.assert_same_as_separate("a@b.www.(x)(y)")
+        self.assert_same_as_separate("http://a@b.com")
+
+    def test_strikethrough_around_links(self):
+        self.assert_same_as_separate("~~see http://foo.com and foo@bar.com~~")
+        self.assert_same_as_separate("~~*a http://foo.com b*~~")
+        self.assert_same_as_separate("~~a http://x/~~b and ~~c~~")
+        self.assert_same_as_separate("~~a@b.co-a@b.co~~")
+        self.assert_same_as_separate("~~~foo~~~, ~~~bar~~, ~~~~baz~~~~")
+        self.assert_same_as_separate("~~ http://foo.com www.bar.com")
+
+    def test_mixed_case_www(self):
+        self.assert_same_as_separate("WwW.foo.com")
+
+    def test_unsupported_version(self):
+        source = "~~*a http://foo.com b*~~ foo@bar.com"
+        with mock.patch.object(fused_inline, "SUPPORTED", False):
+            md = markdown.Markdown(extensions=[self.fused])
+        self.assertNotIn("gfm-inline", md.inlinePatterns)
+        self.assertIn("gfm-autolink", md.inlinePatterns)
+        self.assertEqual(
+            markdown.markdown(source, extensions=[self.fused]), md.convert(source)
+        )
+
+    def test_gfm_option(self):
+        source = "- [ ] ~~http://foo.com~~ foo@bar.com\n\n`www.foo.com` www.bar.com"
+        self.assertEqual(
+            markdown.markdown(source, extensions=["mdx_gfm"]),
+            markdown.markdown(
+                source,
+                extensions=[mdx_gfm.GithubFlavoredMarkdownExtension(fused_inline=True)],
+            ),
+        )
@@ -0,0 +1,346 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+import asyncio
+import concurrent.futures
+import re
+import tempfile
+
+import markdown
+from markdown.extensions.codehilite import CodeHilite, CodeHiliteExtension
+
+import gfm
+from gfm import fenced_block, highlight
+from test_case import TestCase
+
+SOURCE = """
+```python
+def foo():
+    pass
+```
+
+Some text.
+
+```
+plain
+```
+
+```{.python hl_lines="1"}
+def foo():
+    pass
+```
+"""
+
+PLAIN_SOURCE = SOURCE[: SOURCE.index("```{")]
+
+
+class TestHighlightCache(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.shared_cache = highlight.shared_cache
+        highlight.shared_cache = highlight.HighlightCache()
+
+    def tearDown(self):
+        highlight.shared_cache = self.shared_cache
+
+    def render(self, source, **config):
+        return markdown.markdown(
+            source, extensions=[gfm.StandaloneFencedCodeExtension(**config)]
+        )
+
+    def test_same_output(self):
+        for config in ({}, {"linenums": True}, {"noclasses": True}):
+            self.assertEqual(
+                self.render(SOURCE, **config),
+                self.render(SOURCE, highlight_cache=True, **config),
+            )
+
+    def test_hits(self):
+        self.render(SOURCE, highlight_cache=True)
+        self.render(SOURCE, highlight_cache=True)
+        stats = highlight.shared_cache.stats()
+        # The block with attributes is highlighted by Markdown itself.
+        self.assertEqual((2, 2), (stats["hits"], stats["misses"]))
+
+    def test_disabled(self):
+        self.render(SOURCE)
+        self.assertEqual(0, highlight.shared_cache.stats()["misses"])
+
+    def test_keyed_on_options(self):
+        self.render(SOURCE, highlight_cache=True)
+        self.render(SOURCE, highlight_cache=True, noclasses=True)
+        self.render(SOURCE, highlight_cache=True, css_class="code")
+        self.assertEqual(6, highlight.shared_cache.stats()["misses"])
+
+    def test_unserializable_options(self):
+        if not self.has_pygments or markdown.__version_info__ < (3, 4):
+            self.skipTest("requires Pygments and Markdown 3.4")
+        import pygments.formatters
+
+        class Formatter(pygments.formatters.HtmlFormatter):
+            pass
+
+        extensions = [CodeHiliteExtension(pygments_formatter=Formatter)]
+        self.assertEqual(
+            markdown.markdown(
+                SOURCE, extensions=extensions + [gfm.StandaloneFencedCodeExtension()]
+            ),
+            markdown.markdown(
+                SOURCE,
+                extensions=extensions
+                + [gfm.StandaloneFencedCodeExtension(highlight_cache=True)],
+            ),
+        )
+        self.assertEqual(0, highlight.shared_cache.stats()["misses"])
+
+    def test_keyed_on_markdown_version(self):
+        key = highlight.shared_cache.key("x", "python", {})
+        version = markdown.__version__
+        markdown.__version__ = version + ".post1"
+        try:
+            self.assertNotEqual(key, highlight.shared_cache.key("x", "python", {}))
+        finally:
+            markdown.__version__ = version
+
+    def test_disk(self):
+        with tempfile.TemporaryDirectory() as directory:
+            highlight.shared_cache = highlight.HighlightCache(directory=directory)
+            html = self.render(SOURCE, highlight_cache=True)
+            highlight.shared_cache = highlight.HighlightCache(directory=directory)
+            self.assertEqual(html, self.render(SOURCE, highlight_cache=True))
+            self.assertEqual(2, highlight.shared_cache.stats()["disk_hits"])
+
+
+class TestLexerCache(TestCase):
+    def setUp(self):
+        super().setUp()
+        if not self.has_pygments:
+            self.skipTest("Pygments is not installed")
+        highlight._lexer.cache_clear()
+        highlight._formatter.cache_clear()
+
+    def test_same_output(self):
+        for lang, code in (("nosuchlang", "x = 1"), (None, "def foo(): pass")):
+            for config in (
+                {"css_class": "highlight"},
+                {"guess_lang": True},
+                {"pygments_style": "monokai", "noclasses": True},
+                {"linenums": True, "hl_lines": [1]},
+            ):
+                style = config.get("pygments_style", "default")
+                options = {k: v for k, v in config.items() if k != "pygments_style"}
+                expected = CodeHilite(code, lang=lang, style=style, **options)
+                self.assertEqual(
+                    expected.hilite(shebang=False),
+                    highlight.hilite(code, lang, config),
+                )
+
+    def test_lookups_are_shared(self):
+        self.assertEqual(
+            markdown.markdown(SOURCE, extensions=["mdx_gfm"]),
+            markdown.markdown(SOURCE, extensions=["mdx_gfm"]),
+        )
+        self.assertEqual(1, highlight._formatter.cache_info().currsize)
+        # The "python" and "text" lexers, the latter for the block without
+        # a language.
+        info = highlight._lexer.cache_info()
+        self.assertEqual((2, 2), (info.misses, info.hits))
+
+    def test_unknown_language(self):
+        source = "```nosuchlang\nfoo\n```"
+        markdown.markdown(source, extensions=["mdx_gfm"])
+        markdown.markdown(source, extensions=["mdx_gfm"])
+        # "text" is looked up as well.
+        self.assertEqual(2, highlight._lexer.cache_info().misses)
+
+    def test_preload(self):
+        markdown.Markdown(
+            extensions=[
+                gfm.StandaloneFencedCodeExtension(preload_languages=["python", "go"])
+            ]
+        )
+        self.assertEqual(2, highlight._lexer.cache_info().currsize)
+        markdown.markdown(SOURCE, extensions=["mdx_gfm"])
+        # Only "text" was not preloaded.
+        info = highlight._lexer.cache_info()
+        self.assertEqual((3, 1), (info.misses, info.hits))
+
+
+class CountingExecutor(concurrent.futures.ThreadPoolExecutor):
+    submitted = 0
+
+    def submit(self, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(*args, **kwargs)
+
+
+class TestParallelHighlight(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.executor = highlight.executor
+        self.shared_cache = highlight.shared_cache
+        highlight.shared_cache = highlight.HighlightCache()
+
+    def tearDown(self):
+        if highlight.executor is not self.executor:
+            highlight.executor.shutdown()
+        highlight.executor = self.executor
+        highlight.shared_cache = self.shared_cache
+
+    def render(self, source, **config):
+        return markdown.markdown(
+            source, extensions=[gfm.StandaloneFencedCodeExtension(**config)]
+        )
+
+    def test_same_output_with_processes(self):
+        highlight.executor = concurrent.futures.ProcessPoolExecutor(2)
+        source = SOURCE + SOURCE.replace("foo", "bar")
+        self.assertEqual(
+            self.render(source),
+            self.render(source, parallel_highlight=True, parallel_threshold=0),
+        )
+
+    def test_threshold(self):
+        highlight.executor = CountingExecutor(2)
+        self.render(SOURCE, parallel_highlight=True)
+        self.assertEqual(0, highlight.executor.submitted)
+        self.render(SOURCE, parallel_highlight=True, parallel_threshold=10)
+        self.assertEqual(2, highlight.executor.submitted)
+
+    def test_cache(self):
+        highlight.executor = CountingExecutor(2)
+        source = "```python\nfoo\n```\n\n```python\nbar\n```"
+        self.render(source, highlight_cache=True)
+        html = self.render(
+            source + "\n\n```\nbaz\n```",
+            highlight_cache=True,
+            parallel_highlight=True,
+            parallel_threshold=0,
+        )
+        self.assertEqual(1, highlight.executor.submitted)
+        self.assertEqual(
+            html,
+            self.render(
+                source + "\n\n```\nbaz\n```",
+                highlight_cache=True,
+                parallel_highlight=True,
+                parallel_threshold=0,
+            ),
+        )
+        self.assertEqual(1, highlight.executor.submitted)
+
+
+class TestDeferredHighlight(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.shared_cache = highlight.shared_cache
+        highlight.shared_cache = highlight.HighlightCache()
+        self.source = PLAIN_SOURCE + "\n" + PLAIN_SOURCE
+
+    def tearDown(self):
+        highlight.shared_cache = self.shared_cache
+
+    def convert(self, **config):
+        extension = gfm.StandaloneFencedCodeExtension(deferred_highlight=True, **config)
+        md = markdown.Markdown(extensions=[extension])
+        return md.convert(self.source), md.highlight_jobs
+
+    def patch(self, html, highlighted):
+        # Markdown strips the trailing newline of the last highlighted block.
+        return re.sub(
+            r'<pre id="([^"]+)">.*?</pre>',
+            lambda m: highlighted[m.group(1)],
+            html,
+            flags=re.DOTALL,
+        ).rstrip("\n")
+
+    def test_placeholders(self):
+        html, jobs = self.convert()
+        self.assertEqual(4, len(jobs))
+        self.assertEqual(jobs[0].id + "-1", jobs[2].id)
+        self.assertIn(
+            '<pre id="%s"><code class="language-python">def foo():\n'
+            "    pass\n</code></pre>" % jobs[0].id,
+            html,
+        )
+        self.assertIn('<pre id="%s"><code>plain\n</code></pre>' % jobs[1].id, html)
+
+    def test_stable_ids(self):
+        _, jobs = self.convert()
+        self.source = "Other text.\n\n" + self.source
+        self.assertEqual(
+            [job.id for job in jobs], [job.id for job in self.convert()[1]]
+        )
+
+    def test_run_jobs(self):
+        expected = markdown.markdown(
+            self.source, extensions=[gfm.StandaloneFencedCodeExtension()]
+        )
+        html, jobs = self.convert()
+        self.assertEqual(expected, self.patch(html, highlight.run_jobs(jobs)))
+
+        with concurrent.futures.ThreadPoolExecutor(2) as executor:
+            self.assertEqual(
+                expected,
+                self.patch(html, asyncio.run(highlight.run_jobs_async(jobs))),
+            )
+            highlight_executor = highlight.executor
+            highlight.executor = executor
+            try:
+                highlighted = highlight.run_jobs_parallel(jobs)
+            finally:
+                highlight.executor = highlight_executor
+            self.assertEqual(expected, self.patch(html, highlighted))
+
+    def test_cache(self):
+        _, jobs = self.convert(highlight_cache=True)
+        asyncio.run(highlight.run_jobs_async(jobs, cache=True))
+        html, jobs = self.convert(highlight_cache=True)
+        self.assertEqual([], jobs)
+        self.assertNotIn("<pre id=", html)
+
+    def test_lang_prefix(self):
+        # Deferred blocks have the class the base class gives blocks when
+        # Pygments is disabled.
+        md = markdown.Markdown()
+        for config in ({}, {"lang_prefix": "lang-"}):
+            processor = fenced_block.StandaloneFencedBlockPreprocessor(md, config)
+            processor.checked_for_deps = True
+            for use_pygments in (False, True):
+                processor.codehilite_conf = {"use_pygments": use_pygments}
+                processor.deferred_highlight = use_pygments
+                processor.run(["```python", "x", "```"])
+                self.assertIn(
+                    '<code class="%spython">' % config.get("lang_prefix", "language-"),
+                    md.htmlStash.rawHtmlBlocks[-1],
+                )
+
+    def test_unserializable_options(self):
+        if not self.has_pygments or markdown.__version_info__ < (3, 4):
+            self.skipTest("requires Pygments and Markdown 3.4")
+        import pygments.formatters
+
+        class Formatter(pygments.formatters.HtmlFormatter):
+            pass
+
+        extensions = [CodeHiliteExtension(pygments_formatter=Formatter)]
+        md = markdown.Markdown(
+            extensions=extensions
+            + [gfm.StandaloneFencedCodeExtension(deferred_highlight=True)]
+        )
+        self.assertEqual(
+            markdown.markdown(
+                self.source,
+                extensions=extensions + [gfm.StandaloneFencedCodeExtension()],
+            ),
+            md.convert(self.source),
+        )
+        self.assertEqual([], md.highlight_jobs)
+
+    def test_jobs_are_per_document(self):
+        extension = gfm.StandaloneFencedCodeExtension(deferred_highlight=True)
+        md = markdown.Markdown(extensions=[extension])
+        md.convert(self.source)
+        md.convert("No code.")
+        self.assertEqual([], md.highlight_jobs)
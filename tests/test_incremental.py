@@ -0,0 +1,113 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+import markdown
+
+import mdx_gfm
+import mdx_partial_gfm
+from mdx_partial_gfm import incremental
+from test_case import TestCase
+
+SOURCE = """\
+# Title
+
+Some ~~good~~ text with a [link][ref].
+
+- [ ] one
+- [x] two
+
+- three
+
+[ref]: http://example.com
+
+> quote
+
+> more
+
+    indented
+
+```python
+x = 1
+
+y = 2
+```
+
+Final paragraph.
+"""
+
+
+class TestSplitBlocks(TestCase):
+    def test_blank_lines(self):
+        self.assertEqual(["a", "b\nc"], incremental.split_blocks("a\n\nb\nc"))
+
+    def test_attached(self):
+        self.assertEqual(
+            ["- a\n\n- b\n\n    c\n\n[x]: http://foo.com", "d"],
+            incremental.split_blocks("- a\n\n- b\n\n    c\n\n[x]: http://foo.com\n\nd"),
+        )
+
+    def test_fenced_code(self):
+        self.assertEqual(
+            ["a", "```\nb\n\n<div>\n```", "c"],
+            incremental.split_blocks("a\n\n```\nb\n\n<div>\n```\n\nc"),
+        )
+
+    def test_tail(self):
+        self.assertEqual(
+            ["a", "<div>\n\nb\n\nc"], incremental.split_blocks("a\n\n<div>\n\nb\n\nc")
+        )
+        self.assertEqual(
+            ["a", "```{.python}\nb\n```\n\nc"],
+            incremental.split_blocks("a\n\n```{.python}\nb\n```\n\nc"),
+        )
+
+
+class TestIncrementalRenderer(TestCase):
+    def assert_renders(self, renderer, extension, text):
+        self.assertEqual(
+            markdown.markdown(text, extensions=[extension]), renderer.render(text)
+        )
+
+    def test_full_render(self):
+        self.assert_renders(mdx_gfm.IncrementalRenderer(), "mdx_gfm", SOURCE)
+        self.assert_renders(
+            mdx_partial_gfm.IncrementalRenderer(), "mdx_partial_gfm", SOURCE
+        )
+
+    def test_edits(self):
+        renderer = mdx_gfm.IncrementalRenderer()
+        edits = [
+            SOURCE,
+            SOURCE.replace("good", "bad"),
+            SOURCE.replace("- three", "- three\n- four"),
+            SOURCE.replace("Final", "<div>Raw</div>\n\nFinal"),
+            SOURCE.replace("> more", "more"),
+            SOURCE.replace("x = 1", "x = 2"),
+            "",
+            SOURCE,
+        ]
+        for text in edits:
+            self.assert_renders(renderer, "mdx_gfm", text)
+
+    def test_reuse(self):
+        renderer = mdx_gfm.IncrementalRenderer()
+        renderer.render(SOURCE)
+        self.assertEqual(0, renderer.reused)
+        blocks = renderer.rendered
+        self.assert_renders(renderer, "mdx_gfm", SOURCE.replace("Final", "Last"))
+        self.assertEqual(1, renderer.rendered)
+        self.assertEqual(blocks - 1, renderer.reused)
+
+    def test_references(self):
+        renderer = mdx_gfm.IncrementalRenderer()
+        renderer.render(SOURCE)
+        # Only the block with the link depends on the definition.
+        text = SOURCE.replace("http://example.com", "http://other.com")
+        self.assert_renders(renderer, "mdx_gfm", text)
+        self.assertEqual(2, renderer.rendered)
+
+    def test_redefined_reference(self):
+        renderer = mdx_gfm.IncrementalRenderer()
+        text = "[a][ref]\n\n[ref]: http://foo.com\n\nb\n\n[ref]: http://bar.com"
+        self.assert_renders(renderer, "mdx_gfm", text)
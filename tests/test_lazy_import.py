@@ -0,0 +1,97 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+import os
+import subprocess
+import sys
+
+import markdown
+
+import gfm
+from test_case import TestCase
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LAZY_MODULES = (
+    "asyncio",
+    "markdown.extensions.codehilite",
+    "markdown.extensions.fenced_code",
+    "markdown.extensions.tables",
+    "pygments",
+)
+
+
+def imported(code):
+    # Returns the modules of LAZY_MODULES that running code in a fresh
+    # interpreter imports.
+    script = "import sys\n%s\nprint(' '.join(m for m in %r if m in sys.modules))"
+    process = subprocess.run(
+        [sys.executable, "-c", script % (code, LAZY_MODULES)],
+        cwd=ROOT,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    return process.stdout.split()
+
+
+class TestLazyImport(TestCase):
+    def test_import(self):
+        for module in (
+            "gfm",
+            "gfm.highlight",
+            "gfm.lazy_fenced_code",
+            "mdx_partial_gfm",
+            "mdx_gfm",
+        ):
+            with self.subTest(module=module):
+                self.assertEqual([], imported("import " + module))
+
+    def test_render_without_fences(self):
+        self.assertEqual(
+            ["markdown.extensions.tables"],
+            imported(
+                "import markdown\n"
+                "markdown.markdown('~~foo~~ http://foo.com', extensions=['mdx_gfm'])"
+            ),
+        )
+
+    def test_render_with_fences(self):
+        self.assertIn(
+            "markdown.extensions.fenced_code",
+            imported(
+                "import markdown\n"
+                "markdown.markdown('```\\nfoo\\n```', extensions=['mdx_gfm'])"
+            ),
+        )
+
+    def test_attributes(self):
+        self.assertIs(gfm.autolink.AutolinkExtension, gfm.AutolinkExtension)
+        self.assertIs(
+            gfm.fenced_block.StandaloneFencedBlockPreprocessor,
+            gfm.standalone_fenced_code.StandaloneFencedBlockPreprocessor,
+        )
+        for name in gfm.__all__ + ["highlight", "tasklist"]:
+            self.assertIn(name, dir(gfm))
+        with self.assertRaises(AttributeError):
+            gfm.NoSuchExtension
+
+    def test_fenced_code_extensions(self):
+        from markdown.extensions.fenced_code import FencedCodeExtension
+
+        self.assertTrue(
+            issubclass(gfm.StandaloneFencedCodeExtension, FencedCodeExtension)
+        )
+        source = "```python\nx = 1\n```\n\n~~~\ny\n~~~"
+        for config in ({}, {"use_pygments": False}, {"deferred_highlight": True}):
+            with self.subTest(config=config):
+                self.assertEqual(
+                    markdown.markdown(
+                        source,
+                        extensions=[gfm.StandaloneFencedCodeExtension(**config)],
+                    ),
+                    markdown.markdown(
+                        source, extensions=[gfm.LazyFencedCodeExtension(**config)]
+                    ),
+                )
@@ -0,0 +1,126 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+import gc
+import time
+import unittest
+import xml.etree.ElementTree as etree
+
+import markdown
+
+import gfm
+import mdx_gfm
+from test_case import TestCase
+
+SIZES = (1000, 10000, 100000)
+
+# How much more than the size the rendering time may grow from one size to
+# the next. A regex that backtracks quadratically grows 10 times more.
+SLACK = 3
+
+# Python-Markdown rebuilds the paragraph after every inline match, so inputs
+# with a match every few characters grow faster than their size even when
+# the regexes do not.
+DENSE_SLACK = 6
+
+EXTENSIONS = {
+    "autolink": gfm.AutolinkExtension,
+    "automail": gfm.AutomailExtension,
+    "strikethrough": gfm.StrikethroughExtension,
+    "tasklist": gfm.TaskListExtension,
+    "mdx_gfm": mdx_gfm.GithubFlavoredMarkdownExtension,
+}
+
+
+def best_time(function, repeat):
+    # Like timeit, without the garbage collector, whose passes get slower as
+    # the test process grows.
+    gc.collect()
+    gc.disable()
+    try:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            best = min(best, time.perf_counter() - start)
+        return best
+    finally:
+        gc.enable()
+
+
+def nested_tasks(size, depth=20):
+    lines = []
+    length = 0
+    while length < size:
+        lines.append("    " * (len(lines) % depth) + "- [x] task")
+        length += len(lines[-1]) + 1
+    return "\n".join(lines)
+
+
+def wide_table(size):
+    columns = size // 6
+    return "\n".join(("|" + "a|" * columns, "|" + "-|" * columns, "|" + "b|" * columns))
+
+
+# Python-Markdown before 3.11 grows quadratically on the tildes and
+# nested_tasks inputs, whatever the extensions do.
+@unittest.skipUnless(
+    markdown.__version_info__ >= (3, 11), "requires Python-Markdown 3.11"
+)
+class TestLinearTime(TestCase):
+    def assert_linear(self, make_input, slack=SLACK):
+        for name, extension in EXTENSIONS.items():
+            md = markdown.Markdown(extensions=[extension()])
+            times = []
+            for size in SIZES:
+                text = make_input(size)
+                times.append(
+                    best_time(
+                        lambda: md.reset().convert(text), 3 if size < SIZES[-1] else 1
+                    )
+                )
+            for i in range(1, len(SIZES)):
+                growth = SIZES[i] / SIZES[i - 1]
+                with self.subTest(extension=name, size=SIZES[i]):
+                    self.assertLess(
+                        times[i],
+                        times[i - 1] * growth * slack,
+                        "%s: %.4fs for %d characters, %.4fs for %d"
+                        % (name, times[i], SIZES[i], times[i - 1], SIZES[i - 1]),
+                    )
+
+    def test_unbalanced_parens(self):
+        self.assert_linear(lambda size: "see http://example.com/" + "(" * size + " now")
+
+    def test_tildes(self):
+        self.assert_linear(lambda size: "~" * size, slack=DENSE_SLACK)
+
+    def test_email_fragments(self):
+        self.assert_linear(lambda size: "a@b " * (size // 4))
+
+    def test_nested_tasks(self):
+        self.assert_linear(nested_tasks)
+
+    def test_wide_table(self):
+        self.assert_linear(wide_table)
+
+    def test_deep_task_tree(self):
+        # Python-Markdown's block parser recurses once per nesting level, so
+        # deep lists are built directly.
+        def tree(depth):
+            root = parent = etree.Element("div")
+            for _ in range(depth):
+                parent = etree.SubElement(etree.SubElement(parent, "ul"), "li")
+                parent.text = "[ ] task"
+            return root
+
+        processor = gfm.tasklist.TaskListProcessor(gfm.TaskListExtension())
+        depths = (500, 5000, 50000)
+        times = []
+        for depth in depths:
+            root = tree(depth)
+            times.append(best_time(lambda: processor.run(root), 1))
+            self.assertEqual(depth, len(root.findall(".//input")))
+        for i in range(1, len(depths)):
+            self.assertLess(times[i], times[i - 1] * 10 * SLACK)
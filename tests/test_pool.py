@@ -0,0 +1,117 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+import threading
+
+import markdown
+
+import mdx_gfm
+import mdx_partial_gfm
+from test_case import TestCase
+
+SOURCE = """
+Some ~~good~~ text
+with http://foo.com in it.
+"""
+
+
+class TestRendererPool(TestCase):
+    def test_render_gfm(self):
+        pool = mdx_gfm.RendererPool(size=1)
+        self.assertEqual(
+            markdown.markdown(SOURCE, extensions=["mdx_gfm"]), pool.render(SOURCE)
+        )
+
+    def test_render_partial_gfm(self):
+        pool = mdx_partial_gfm.RendererPool(size=1)
+        self.assertEqual(
+            markdown.markdown(SOURCE, extensions=["mdx_partial_gfm"]),
+            pool.render(SOURCE),
+        )
+
+    def test_config(self):
+        pool = mdx_gfm.RendererPool(size=1, fused_inline=True)
+        with pool.acquire() as md:
+            self.assertIn("gfm-inline", md.inlinePatterns)
+
+    def test_extensions(self):
+        pool = mdx_gfm.RendererPool(size=1, extensions=["toc"])
+        with pool.acquire() as md:
+            self.assertIn("toc", md.treeprocessors)
+
+    def test_reset_between_documents(self):
+        pool = mdx_gfm.RendererPool(size=1)
+        pool.render("[foo]\n\n[foo]: http://foo.com")
+        self.assertEqual("<p>[foo]</p>", pool.render("[foo]"))
+
+    def test_reuses_instances(self):
+        pool = mdx_gfm.RendererPool(size=2)
+        with pool.acquire() as first:
+            pass
+        with pool.acquire() as second:
+            pass
+        self.assertIs(first, second)
+
+    def test_exclusive(self):
+        pool = mdx_gfm.RendererPool(size=2)
+        with pool.acquire() as first, pool.acquire() as second:
+            self.assertIsNot(first, second)
+
+    def test_lazy_build(self):
+        pool = mdx_gfm.RendererPool(size=2, prebuild=False)
+        self.assertEqual(0, pool._created)
+        pool.render(SOURCE)
+        self.assertEqual(1, pool._created)
+
+    def test_size_cap(self):
+        pool = mdx_gfm.RendererPool(size=1)
+        with pool.acquire():
+            with self.assertRaises(TimeoutError):
+                with pool.acquire(timeout=0.01):
+                    pass
+
+    def test_failed_reset(self):
+        class FailingReset(markdown.Extension):
+            fail = False
+
+            def extendMarkdown(self, md):
+                md.registerExtension(self)
+
+            def reset(self):
+                if self.fail:
+                    self.fail = False
+                    raise RuntimeError("reset")
+
+        extension = FailingReset()
+        pool = mdx_gfm.RendererPool(size=1, extensions=[extension])
+        extension.fail = True
+        with self.assertRaises(RuntimeError):
+            with pool.acquire(timeout=0.01) as dropped:
+                pass
+        self.assertEqual(0, pool._created)
+        with pool.acquire(timeout=0.01) as md:
+            self.assertIsNot(dropped, md)
+        self.assertEqual(1, pool._created)
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            mdx_gfm.RendererPool(size=0)
+
+    def test_threads(self):
+        pool = mdx_gfm.RendererPool(size=2, prebuild=False)
+        sources = ["Item %d: ~~x~~ www.foo%d.com" % (i, i) for i in range(40)]
+        expected = [markdown.markdown(s, extensions=["mdx_gfm"]) for s in sources]
+        results = [None] * len(sources)
+
+        def work(offset):
+            for i in range(offset, len(sources), 4):
+                results[i] = pool.render(sources[i])
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(expected, results)
+        self.assertLessEqual(pool._created, 2)
@@ -0,0 +1,80 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+import markdown
+
+import gfm
+from test_case import TestCase
+
+SOURCE = """
+Some text with http://foo.com in it.
+
+Some *text* with ~~strikes~~ and foo@bar.com.
+
+Plain text.
+"""
+
+# Whether Python-Markdown scans a text node again from its start after each
+# match, instead of resuming past it.
+RESCAN = markdown.__version_info__ < (3, 11)
+
+
+class TestPrefilter(TestCase):
+    def test_counters(self):
+        md = markdown.Markdown(
+            extensions=[
+                gfm.AutolinkExtension(),
+                gfm.AutomailExtension(),
+                gfm.StrikethroughExtension(),
+            ]
+        )
+        md.convert(SOURCE)
+        counts = {
+            name: (
+                md.inlinePatterns[name].prefilter_checked,
+                md.inlinePatterns[name].prefilter_skipped,
+            )
+            for name in ("gfm-autolink", "gfm-automail", "gfm-strikethrough")
+        }
+        # One paragraph per pattern has a match, the two others are skipped,
+        # and so is the scan again of the one with the match.
+        expected = (4, 3) if RESCAN else (3, 2)
+        self.assertEqual(
+            {
+                "gfm-autolink": expected,
+                "gfm-automail": expected,
+                "gfm-strikethrough": expected,
+            },
+            counts,
+        )
+
+    def test_counters_several_matches(self):
+        # Only the last scan again, after the third link, is skipped.
+        md = markdown.Markdown(extensions=[gfm.AutolinkExtension()])
+        md.convert("http://a.com, http://b.com and http://c.com\n\nPlain text.")
+        autolink = md.inlinePatterns["gfm-autolink"]
+        self.assertEqual(
+            (5, 2) if RESCAN else (2, 1),
+            (autolink.prefilter_checked, autolink.prefilter_skipped),
+        )
+
+    def test_fused_counters(self):
+        md = markdown.Markdown(extensions=[gfm.FusedInlineExtension()])
+        md.convert(SOURCE)
+        fused = md.inlinePatterns["gfm-inline"]
+        self.assertEqual(
+            (6, 3) if RESCAN else (3, 1),
+            (fused.prefilter_checked, fused.prefilter_skipped),
+        )
+
+    def test_autolink_prefilter_ignores_case(self):
+        self.assert_renders(
+            """
+        <p><a href="http://WWW.FOO.COM">WWW.FOO.COM</a></p>
+        """,
+            """
+        WWW.FOO.COM
+        """,
+            [gfm.AutolinkExtension()],
+        )
@@ -0,0 +1,143 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+import markdown
+from markdown.postprocessors import Postprocessor
+
+import gfm
+import mdx_gfm
+import mdx_partial_gfm
+from test_case import TestCase
+
+SOURCE = """\
+# Title
+
+Some ~~good~~ text with http://foo.com and www.bar.com.
+
+- [ ] one
+- [x] two
+
+| a | b |
+|---|---|
+| 1 | 2 |
+
+```python
+x = 1
+```
+
+> quote
+> - list
+"""
+
+
+class TestProfiling(TestCase):
+    def test_output(self):
+        md = markdown.Markdown(extensions=["mdx_gfm", gfm.ProfilingExtension()])
+        self.assertIsNone(md.profile)
+        self.assertEqual(
+            markdown.markdown(SOURCE, extensions=["mdx_gfm"]), md.convert(SOURCE)
+        )
+
+    def test_stages(self):
+        md = markdown.Markdown(
+            extensions=[mdx_gfm.GithubFlavoredMarkdownExtension(profile=True)]
+        )
+        md.convert(SOURCE)
+        stages = md.profile.stages
+        for name in (
+            "preprocessors.fenced_code_block",
+            "blockprocessors.table",
+            "treeprocessors.inline",
+            "treeprocessors.gfm-tasklist",
+            "postprocessors.raw_html",
+            "serializer",
+        ):
+            self.assertEqual(1, stages[name].calls, name)
+        self.assertEqual(2, stages["inlinepatterns.gfm-autolink"].calls)
+        self.assertEqual(1, stages["inlinepatterns.gfm-strikethrough"].calls)
+        self.assertEqual(0, stages["inlinepatterns.gfm-automail"].calls)
+        # Nl2Br is registered after the partial extension.
+        self.assertIn("inlinepatterns.nl", stages)
+        # Stages do not include the stages they call.
+        self.assertLessEqual(
+            sum(stage.time for stage in stages.values()), md.profile.total
+        )
+
+    def test_recursive_stage(self):
+        # Like RawHtmlPostprocessor before Markdown 3.8.
+        class Recursive(Postprocessor):
+            def run(self, text):
+                if "!" in text:
+                    return self.run(text.replace("!", "", 1))
+                return text
+
+        md = markdown.Markdown(extensions=[gfm.ProfilingExtension()])
+        md.postprocessors.register(Recursive(md), "recursive", 5)
+        self.assertEqual("<p>Hi</p>", md.convert("Hi!!!"))
+        self.assertEqual(1, md.profile.stages["postprocessors.recursive"].calls)
+
+    def test_blank_document(self):
+        profiles = []
+        md = markdown.Markdown(
+            extensions=[gfm.ProfilingExtension(callback=profiles.append)]
+        )
+        md.convert("Some text")
+        self.assertIsNotNone(md.profile)
+        self.assertEqual("", md.convert(" \n"))
+        self.assertIsNone(md.profile)
+        self.assertEqual(1, len(profiles))
+
+    def test_rejected_matches(self):
+        # "http://" matches the regex of the autolink pattern, which rejects
+        # it for lack of a domain.
+        md = markdown.Markdown(extensions=["mdx_gfm", gfm.ProfilingExtension()])
+        self.assertEqual(1, md.convert("www.foo.com and http://").count("<a "))
+        self.assertEqual(2, md.profile.stages["inlinepatterns.gfm-autolink"].calls)
+
+    def test_compiled(self):
+        profile = mdx_gfm.CompiledProfile(profile=True)
+        first = profile.build()
+        second = profile.build()
+        first.convert("http://foo.com")
+        self.assertIsNone(second.profile)
+        second.convert("Some text")
+        self.assertEqual(1, first.profile.stages["inlinepatterns.gfm-autolink"].calls)
+        self.assertEqual(0, second.profile.stages["inlinepatterns.gfm-autolink"].calls)
+        second.convert("")
+        self.assertIsNone(second.profile)
+        self.assertIsNotNone(first.profile)
+
+    def test_callback(self):
+        profiles = []
+        md = markdown.Markdown(
+            extensions=[
+                mdx_partial_gfm.PartialGithubFlavoredMarkdownExtension(
+                    profile_callback=profiles.append
+                )
+            ]
+        )
+        md.convert("http://foo.com")
+        md.reset()
+        md.convert("Some text")
+        self.assertEqual(2, len(profiles))
+        self.assertIs(profiles[1], md.profile)
+        self.assertEqual(1, profiles[0].stages["inlinepatterns.gfm-autolink"].calls)
+        self.assertEqual(0, profiles[1].stages["inlinepatterns.gfm-autolink"].calls)
+
+    def test_as_dict(self):
+        md = markdown.Markdown(
+            extensions=["mdx_partial_gfm", gfm.ProfilingExtension(callback=[])]
+        )
+        md.convert("~~foo~~")
+        data = md.profile.as_dict()
+        self.assertEqual(md.profile.total, data["total"])
+        self.assertEqual(
+            {"calls": 1, "time": md.profile.stages["serializer"].time},
+            data["stages"]["serializer"],
+        )
+
+    def test_disabled(self):
+        md = markdown.Markdown(extensions=["mdx_gfm"])
+        md.convert(SOURCE)
+        self.assertFalse(hasattr(md, "profile"))
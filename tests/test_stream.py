@@ -0,0 +1,104 @@
+# Copyright (c) 2012, the Dart project authors.  Please see the AUTHORS file
+# for details. All rights reserved. Use of this source code is governed by a
+# BSD-style license that can be found in the LICENSE file.
+
+import io
+
+import markdown
+
+import mdx_gfm
+import mdx_partial_gfm
+from test_case import TestCase
+
+SOURCE = """\
+# Title
+
+Some ~~good~~ text with a [link][ref].
+
+- [ ] one
+- [x] two
+
+- three
+
+> quote
+
+    indented
+
+```python
+x = 1
+
+y = 2
+```
+
+Final paragraph.
+
+[ref]: http://example.com
+"""
+
+
+class Lines:
+    """An iterable of lines that is not seekable, and counts reads."""
+
+    def __init__(self, text):
+        self.lines = io.StringIO(text).readlines()
+        self.read = 0
+
+    def __iter__(self):
+        for line in self.lines:
+            self.read += 1
+            yield line
+
+
+class TestRenderStream(TestCase):
+    def test_full_render(self):
+        for text in (SOURCE, SOURCE.replace("\n", "\r\n"), "", "   \n\n"):
+            self.assertEqual(
+                markdown.markdown(text, extensions=["mdx_gfm"]),
+                "".join(mdx_gfm.render_stream(io.StringIO(text, newline=""))),
+            )
+
+    def test_partial_gfm(self):
+        self.assertEqual(
+            markdown.markdown(SOURCE, extensions=["mdx_partial_gfm"]),
+            "".join(mdx_partial_gfm.render_stream(io.StringIO(SOURCE))),
+        )
+
+    def test_blocks(self):
+        html = list(mdx_gfm.render_stream(io.StringIO(SOURCE), buffer_size=0))
+        self.assertEqual(6, len(html))
+        self.assertEqual("<h1>Title</h1>", html[0])
+        self.assertEqual(
+            "".join(html), "".join(mdx_gfm.render_stream(SOURCE.splitlines(True)))
+        )
+
+    def test_raw_html(self):
+        text = "a\n\n<div>\n\nb\n\n</div>\n\nc"
+        self.assertEqual(
+            markdown.markdown(text, extensions=["mdx_gfm"]),
+            "".join(mdx_gfm.render_stream(io.StringIO(text))),
+        )
+
+    def test_lazy(self):
+        lines = Lines("# Title\n\n" + "para\n\n" * 100)
+        html = mdx_gfm.render_stream(lines, buffer_size=0)
+        self.assertEqual("<h1>Title</h1>", next(html))
+        self.assertEqual(3, lines.read)
+
+    def test_not_seekable(self):
+        # Links do not see the definitions that come after them.
+        text = "[a][ref]\n\nb\n\n[ref]: http://foo.com\n\n[c][ref]"
+        self.assertEqual(
+            '<p>[a][ref]</p>\n<p>b</p>\n<p><a href="http://foo.com">c</a></p>',
+            "".join(mdx_gfm.render_stream(Lines(text), buffer_size=0)),
+        )
+        self.assertEqual(
+            markdown.markdown(text, extensions=["mdx_gfm"]),
+            "".join(mdx_gfm.render_stream(io.StringIO(text))),
+        )
+
+    def test_redefined_reference(self):
+        text = "[a][ref]\n\n[ref]: http://foo.com\n\nb\n\n[ref]: http://bar.com"
+        self.assertEqual(
+            markdown.markdown(text, extensions=["mdx_gfm"]),
+            "".join(mdx_gfm.render_stream(io.StringIO(text), buffer_size=0)),
+        )
@@ -2,7 +2,15 @@
 # for details. All rights reserved. Use of this source code is governed by a
 # BSD-style license that can be found in the LICENSE file.
 
+import random
+import re
+
+import markdown
+from markdown.preprocessors import Preprocessor
+
+from benchmarks import corpus
 import gfm
+from gfm.tasklist import Task, extract_tasks, toggle_task
 from test_case import TestCase
 
 
@@ -243,6 +251,69 @@ class TestTaskList(TestCase):
             [self.tasklist_max_depth],
         )
 
+    def test_tasklist_containers(self):
+        self.assert_renders(
+            """
+        <h1>Title</h1>
+        <table>
+        <thead>
+        <tr>
+        <th>a</th>
+        <th>b</th>
+        </tr>
+        </thead>
+        <tbody>
+        <tr>
+        <td>- [ ] c</td>
+        <td>d</td>
+        </tr>
+        </tbody>
+        </table>
+        <blockquote>
+        <ul>
+        <li>
+        <p>[x] quoted</p>
+        <blockquote>
+        <ul>
+        <li><input disabled="disabled" type="checkbox" /> deeper</li>
+        </ul>
+        </blockquote>
+        </li>
+        </ul>
+        </blockquote>
+        <ul>
+        <li>
+        <p>[ ] item</p>
+        <blockquote>
+        <ul>
+        <li><input disabled="disabled" type="checkbox" /> quoted in item<ul>
+        <li>[x] nested</li>
+        </ul>
+        </li>
+        </ul>
+        </blockquote>
+        </li>
+        </ul>
+        """,
+            """
+        # Title
+
+        | a | b |
+        |---|---|
+        | - [ ] c | d |
+
+        > - [x] quoted
+        >
+        >     > - [ ] deeper
+
+        - [ ] item
+
+            > - [ ] quoted in item
+            >     - [x] nested
+        """,
+            ["tables", self.tasklist_max_depth],
+        )
+
     def test_tasklist_item_attrs(self):
         self.assert_renders(
             """
@@ -366,3 +437,400 @@ class TestTaskList(TestCase):
         """,
             [self.tasklist_list_attrs_cb],
         )
+
+    def test_tasklist_localized_patterns(self):
+        self.assert_renders(
+            """
+        <ul>
+        <li><input checked="checked" disabled="disabled" type="checkbox" /> fait</li>
+        <li><input checked="checked" disabled="disabled" type="checkbox" /> fait</li>
+        <li><input disabled="disabled" type="checkbox" /> à faire</li>
+        <li><input disabled="disabled" type="checkbox" /> à faire</li>
+        <li>[x] rien</li>
+        </ul>
+        """,
+            """
+        - [V] fait
+        - [✓] fait
+        - [-] à faire
+        - [ ] à faire
+        - [x] rien
+        """,
+            [gfm.TaskListExtension(checked=["[v]", "[✓]"], unchecked=["[-]", "[ ]"])],
+        )
+
+    def test_tasklist_pattern_order(self):
+        # The first pattern that matches wins, checked ones first, even if a
+        # later one is longer.
+        self.assert_renders(
+            """
+        <ul>
+        <li><input checked="checked" disabled="disabled" type="checkbox" />] item</li>
+        </ul>
+        """,
+            """
+        - [x] item
+        """,
+            [gfm.TaskListExtension(checked=["[x"], unchecked=["[x]"])],
+        )
+
+    def test_tasklist_options_snapshot(self):
+        extension = gfm.TaskListExtension()
+        md = markdown.Markdown(extensions=[extension])
+        extension.setConfig("unordered", False)
+        self.assertEqual(
+            '<ul>\n<li><input disabled="disabled" type="checkbox" /> item</li>\n</ul>',
+            md.convert("- [ ] item"),
+        )
+
+    def test_tasklist_list_attrs_deep(self):
+        calls = []
+
+        def list_attrs(list, depth):
+            calls.append((list, depth))
+            return {"data-depth": str(depth)}
+
+        text = "\n".join(
+            "    " * level + "- [%s] item %d" % (box, level)
+            for level in range(30)
+            for box in " x"
+        )
+        md = markdown.Markdown(
+            extensions=[gfm.TaskListExtension(list_attrs=list_attrs)]
+        )
+        html = md.convert(text)
+        self.assertEqual(list(range(1, 31)), [depth for _, depth in calls])
+        self.assertEqual(30, len({id(list) for list, _ in calls}))
+        for depth in range(1, 31):
+            self.assertEqual(1, html.count('<ul data-depth="%d">' % depth))
+
+        del calls[:]
+        md = markdown.Markdown(
+            extensions=[gfm.TaskListExtension(list_attrs=list_attrs, max_depth=10)]
+        )
+        md.convert(text)
+        self.assertEqual(list(range(1, 11)), [depth for _, depth in calls])
+
+    def test_tasklist_list_attrs_wide(self):
+        calls = []
+
+        def list_attrs(list, depth):
+            calls.append((list[0][0].tail.strip(), depth))
+            return {"data-depth": str(depth)}
+
+        blocks = [
+            "\n".join(
+                "- [ ] a%d.%d\n    - [x] b%d.%d\n    - [ ] c%d.%d" % ((i, j) * 3)
+                for j in range(100)
+            )
+            for i in range(3)
+        ]
+        md = markdown.Markdown(
+            extensions=[gfm.TaskListExtension(list_attrs=list_attrs)]
+        )
+        html = md.convert("\n\ntext\n\n".join(blocks))
+        expected = []
+        for i in range(3):
+            expected.append(("a%d.0" % i, 1))
+            expected.extend(("b%d.%d" % (i, j), 2) for j in range(100))
+        self.assertEqual(expected, calls)
+        self.assertEqual(3, html.count('<ul data-depth="1">'))
+        self.assertEqual(300, html.count('<ul data-depth="2">'))
+
+    def test_tasklist_memoized_attrs(self):
+        calls = []
+
+        def item_attrs(parent, li, checkbox):
+            calls.append(li)
+            return {"data-state": str("checked" in checkbox.attrib)}
+
+        def key(parent, li, checkbox):
+            return "checked" in checkbox.attrib
+
+        text = "- [x] a\n- [ ] b\n- [x] c\n    1. [ ] d"
+        expected = markdown.markdown(
+            text, extensions=[gfm.TaskListExtension(item_attrs=item_attrs)]
+        )
+        self.assertEqual(4, len(calls))
+        md = markdown.Markdown(
+            extensions=[
+                gfm.TaskListExtension(
+                    item_attrs=gfm.tasklist.MemoizedAttrs(item_attrs, key)
+                )
+            ]
+        )
+        del calls[:]
+        self.assertEqual(expected, md.convert(text))
+        self.assertEqual(2, len(calls))
+        self.assertEqual(expected, md.convert(text))
+        self.assertEqual(4, len(calls))
+
+    def test_tasklist_memoized_attrs_global(self):
+        calls = []
+
+        def list_attrs(list, depth):
+            calls.append(list)
+            return {"class": "%s-%d" % (list.tag, depth)}
+
+        memoized = gfm.tasklist.MemoizedAttrs(
+            list_attrs, lambda list, depth: (list.tag, depth), scope="global"
+        )
+        md = markdown.Markdown(extensions=[gfm.TaskListExtension(list_attrs=memoized)])
+        text = "- [x] a\n    - [ ] b\n\ntext\n\n- [ ] c\n\ntext\n\n1. [ ] d"
+        html = md.convert(text)
+        self.assertEqual(3, html.count('class="ul-1"') + html.count('class="ol-1"'))
+        self.assertEqual(1, html.count('class="ul-2"'))
+        self.assertEqual(3, len(calls))
+        self.assertEqual(html, md.convert(text))
+        self.assertEqual(3, len(calls))
+        memoized.clear()
+        md.convert(text)
+        self.assertEqual(6, len(calls))
+
+    def test_tasklist_memoized_attrs_scope(self):
+        with self.assertRaises(ValueError):
+            gfm.tasklist.MemoizedAttrs(dict, hash, scope="document")
+
+
+class TestExtractTasks(TestCase):
+    LAYOUTS = [
+        "- [ ] a\n- [x] b\n\n- [ ] c",
+        "- [ ] a\n    - [x] b\n\n    - [ ] c\n- [ ] d",
+        "1. [ ] a\n\n- [ ] b\n- [x] c",
+        "- [ ] a\n\n    more\n- [x] b",
+        "- [ ] a\n\n        code\n- [x] b",
+        "para\n- [ ] a\n\n    - [ ] code",
+        "> - [ ] a\n>     - [x] b\n\n- [ ] c",
+        "```\n- [ ] no\n```\n\n- [x] yes",
+        "- [ ] a\n# head\n- [x] b",
+        "- [ ] a\n\n    1. [x] g\n# h\n   - [x] three",
+        "text\n    more\n- [ ] a",
+        "- [ ] a\n        - [x] lazy\n- [x] b\n\n        - [ ] code",
+        "\t- [ ] a\n-\t[x] b\r\n---\n- [ ] c\n===",
+        "~~~\n- [ ] no\n\n- [x] yes",
+        "1. [ ] d\n\n        - [x] f",
+    ]
+
+    # Lines the random documents of test_random are made of.
+    LINES = [
+        "- [ ] a",
+        "- [x] b",
+        "1. [ ] c",
+        "    - [x] d",
+        "        - [ ] e",
+        "    1. [X] f",
+        "   - [x] g",
+        "text",
+        "    more",
+        "",
+        "",
+        "# h",
+        "---",
+        "> - [ ] q",
+        ">     - [x] r",
+        "        code",
+        "* plain",
+        "```",
+        "\t- [ ] tab",
+        "[ref]: http://example.com",
+    ]
+
+    def test_fields(self):
+        self.assertEqual(
+            [
+                Task(False, "a\nlazy", 1, False, 0, 4, 2),
+                Task(True, "b\nlazy", 2, True, 2, 4, 20),
+                Task(True, "c", 1, False, 4, 5, 35),
+            ],
+            extract_tasks("- [ ] a\nlazy\n    1. [x] b\n  lazy\n* [X] c\n\ntext"),
+        )
+
+    def test_config(self):
+        text = "- [ ] a\n    1. [x] b\n        - [o] c\n- [x] d\n- [o] e"
+        self.assertEqual(["a", "b", "d"], [task.text for task in extract_tasks(text)])
+        self.assertEqual(
+            ["a", "d"], [task.text for task in extract_tasks(text, max_depth=1)]
+        )
+        self.assertEqual(
+            ["b"], [task.text for task in extract_tasks(text, unordered=False)]
+        )
+        self.assertEqual(
+            [("c", 2), ("e", 1)],
+            [
+                (task.text, task.depth)
+                for task in extract_tasks(
+                    text, ordered=False, checked=["[o]"], unchecked=[]
+                )
+            ],
+        )
+        self.assertEqual([], extract_tasks(text, ordered=False, unordered=False))
+        self.assertEqual([], extract_tasks(text, checked=[], unchecked=[]))
+
+    def test_render(self):
+        for text in self.LAYOUTS:
+            with self.subTest(text=text):
+                html = markdown.markdown(
+                    text, extensions=["fenced_code", gfm.TaskListExtension()]
+                )
+                self.assertEqual(
+                    [
+                        "checked" in attrs
+                        for attrs in re.findall("<input([^>]*)>", html)
+                    ],
+                    [task.checked for task in extract_tasks(text)],
+                )
+
+    def assertRendered(self, md, text):
+        # Checks the tasks of text against the checkboxes of its render.
+        html = md.reset().convert(text)
+        # Inline code spans change the text of the render.
+        self.assertEqual(
+            [
+                ("checked" in attrs, " ".join(text.split()), int(offset))
+                for attrs, offset, text in re.findall(
+                    '<input([^>]*)data-offset="(\\d+)"[^>]*>([^<`]*)', html
+                )
+            ],
+            [
+                (task.checked, " ".join(task.text.split("`")[0].split()), task.offset)
+                for task in extract_tasks(text)
+            ],
+        )
+
+    def test_random(self):
+        rand = random.Random(0)
+        md = markdown.Markdown(
+            extensions=["fenced_code", gfm.TaskListExtension(source_offsets=True)]
+        )
+        for _ in range(500):
+            text = "\n".join(
+                rand.choice(self.LINES) for _ in range(rand.randint(1, 12))
+            )
+            with self.subTest(text=text):
+                self.assertRendered(md, text)
+
+    def test_corpus(self):
+        # The scanner follows the rules of the installed Python-Markdown, so
+        # this runs with every version the package is tested with.
+        md = markdown.Markdown(
+            extensions=["fenced_code", gfm.TaskListExtension(source_offsets=True)]
+        )
+        for kind in sorted(corpus.KINDS):
+            for seed, text in enumerate(corpus.generate(kind, 5, 3)):
+                with self.subTest(kind=kind, seed=seed):
+                    self.assertRendered(md, text)
+        for text in self.LAYOUTS:
+            with self.subTest(text=text):
+                self.assertRendered(md, text)
+
+
+class TestToggleTask(TestCase):
+    TEXT = "Tasks:\n\n- [ ] a\n\t- [X]\tb\n\n> 1. [x] c\n\n    - [ ] code\n"
+
+    def test_source_offsets(self):
+        html = markdown.markdown(
+            self.TEXT, extensions=[gfm.TaskListExtension(source_offsets=True)]
+        )
+        offsets = [int(offset) for offset in re.findall('data-offset="(\\d+)"', html)]
+        self.assertEqual([task.offset for task in extract_tasks(self.TEXT)], offsets)
+        self.assertEqual(["[ ]", "[X]", "[x]"], [self.TEXT[i : i + 3] for i in offsets])
+
+    def test_source_offsets_mismatch(self):
+        # The render finds no item in a raw HTML block, the scanner does.
+        text = "<div>\n\n- [ ] a\n\n</div>\n\n- [ ] b"
+        html = markdown.markdown(
+            text, extensions=[gfm.TaskListExtension(source_offsets=True)]
+        )
+        self.assertIn("checkbox", html)
+        self.assertNotIn("data-offset", html)
+
+    def test_source_offsets_layouts(self):
+        for text in TestExtractTasks.LAYOUTS:
+            with self.subTest(text=text):
+                html = markdown.markdown(
+                    text,
+                    extensions=[
+                        "fenced_code",
+                        gfm.TaskListExtension(source_offsets=True),
+                    ],
+                )
+                self.assertEqual(
+                    [task.offset for task in extract_tasks(text)],
+                    [
+                        int(offset)
+                        for offset in re.findall('data-offset="(\\d+)"', html)
+                    ],
+                )
+
+    def test_source_offsets_other_items(self):
+        # A preprocessor adds an item, and the raw HTML block hides one, so
+        # the scanner finds as many items as the render, but not the same.
+        class TodoPreprocessor(Preprocessor):
+            def run(self, lines):
+                return ["- [ ] todo" if line == "TODO" else line for line in lines]
+
+        md = markdown.Markdown(extensions=[gfm.TaskListExtension(source_offsets=True)])
+        md.preprocessors.register(TodoPreprocessor(md), "todo", 100)
+        html = md.convert("TODO\n\n<div>\n\n- [ ] a\n\n</div>\n\n- [x] b")
+        self.assertEqual(2, html.count("checkbox"))
+        self.assertNotIn("data-offset", html)
+
+    def test_source_offsets_disabled(self):
+        md = markdown.Markdown(extensions=[gfm.TaskListExtension()])
+        self.assertNotIn("gfm-tasklist-source", md.preprocessors)
+        self.assertNotIn("data-offset", md.convert(self.TEXT))
+
+    def test_toggle_offset(self):
+        self.assertEqual(
+            self.TEXT.replace("[ ] a", "[x] a"), toggle_task(self.TEXT, 10)
+        )
+        self.assertEqual(self.TEXT.replace("[X]", "[ ]"), toggle_task(self.TEXT, 19))
+
+    def test_toggle_index(self):
+        self.assertEqual(
+            self.TEXT.replace("[x] c", "[ ] c"), toggle_task(self.TEXT, index=2)
+        )
+        with self.assertRaises(IndexError):
+            toggle_task(self.TEXT, index=3)
+
+    def test_toggle_index_same_text(self):
+        text = "```\n- [ ] a\n```\n\n- [ ] a\n- [ ] a\n    - [ ] a"
+        self.assertEqual(
+            "```\n- [ ] a\n```\n\n- [ ] a\n- [x] a\n    - [ ] a",
+            toggle_task(text, index=1),
+        )
+        self.assertEqual(
+            "```\n- [ ] a\n```\n\n- [ ] a\n- [ ] a\n    - [x] a",
+            toggle_task(text, index=2),
+        )
+        with self.assertRaises(IndexError):
+            toggle_task(text, index=3)
+
+    def test_toggle_index_without_offset(self):
+        # The render and the scanner disagree, so the render sets no offset.
+        with self.assertRaises(ValueError):
+            toggle_task("<div>\n\n- [ ] a\n\n</div>\n\n- [ ] b", index=0)
+
+    def test_processor_offsets(self):
+        md = markdown.Markdown(extensions=[gfm.TaskListExtension(source_offsets=True)])
+        processor = md.treeprocessors["gfm-tasklist"]
+        md.convert(self.TEXT)
+        self.assertEqual([10, 19, 31], processor.offsets)
+        md.convert("<div>\n\n- [ ] a\n\n</div>\n\n- [ ] b")
+        self.assertEqual([None], processor.offsets)
+        md.convert("- a")
+        self.assertEqual([], processor.offsets)
+
+    def test_toggle_patterns(self):
+        self.assertEqual(
+            "- [✓] a\n- [x] b",
+            toggle_task("- [-] a\n- [x] b", 2, checked=["[✓]"], unchecked=["[-]"]),
+        )
+        with self.assertRaises(ValueError):
+            toggle_task("- [ ] a", 2, checked=[])
+
+    def test_toggle_no_marker(self):
+        for offset in (0, 3, 100, -1, None):
+            with self.subTest(offset=offset):
+                with self.assertRaises(ValueError):
+                    toggle_task("- [ ] a", offset)